@@ -1,5 +1,15 @@
 from flask import Flask
-from .extensions import db, migrate, cors
+from sqlalchemy.orm import configure_mappers
+from .extensions import (
+    db,
+    cors,
+    jobs,
+    response_cache,
+    name_cache,
+    events,
+    pool_metrics,
+    request_metrics,
+)
 from .config import Config
 
 import pymysql
@@ -12,21 +22,43 @@ def create_app():
     app.config.from_object("app.config.Config")
 
     db.init_app(app)
-    migrate(app, db)
 
     from .models import Project, Task, User
 
+    # set up relationships and backrefs (e.g. Task.project) now - the loader
+    # options in app.utils.query_options reference them before any query runs
+    configure_mappers()
+
     with app.app_context():
-        db.create_all()
+        pool_metrics.init_app(app, db.engine)
+        request_metrics.init_app(app, db.engine)
     cors.init_app(app)
+    jobs.init_app(app)
+    response_cache.init_app(app)
+    name_cache.init_app(app)
+    events.init_app(app)
+
+    # the schema is created by "flask db upgrade" (or "flask init-db"), not
+    # on every boot
+    from app.cli import register_commands
+
+    register_commands(app)
 
     # register routes
     from app.routes.project_routes import project_bp
     from app.routes.task_routes import task_bp
     from app.routes.user_routes import user_bp
+    from app.routes.job_routes import job_bp
+    from app.routes.metrics_routes import metrics_bp
+    from app.routes.search_routes import search_bp
+    from app.routes.sync_routes import sync_bp
 
     app.register_blueprint(project_bp, url_prefix="/api/project")
     app.register_blueprint(task_bp, url_prefix="/api/project/<int:project_id>/task")
     app.register_blueprint(user_bp, url_prefix="/api/user")
+    app.register_blueprint(job_bp, url_prefix="/api/jobs")
+    app.register_blueprint(metrics_bp, url_prefix="/api/metrics")
+    app.register_blueprint(search_bp, url_prefix="/api/search")
+    app.register_blueprint(sync_bp, url_prefix="/api/sync")
 
     return app
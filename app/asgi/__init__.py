@@ -0,0 +1 @@
+from app.asgi.app import create_asgi_app
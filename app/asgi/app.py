@@ -0,0 +1,65 @@
+from contextlib import asynccontextmanager
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.routing import Mount
+from app import create_app
+from app.asgi.db import create_session_factory
+
+
+def create_asgi_app(flask_app=None):
+    """
+    Async (ASGI) serving mode.
+
+    The read endpoints in app.asgi.routes run as coroutines on an async engine
+    (aiomysql/asyncmy for MySQL, aiosqlite for SQLite), so a request waiting on
+    the database does not hold a worker thread. Every other route - writes,
+    uploads, exports, SSE, jobs, metrics - falls through to the Flask app,
+    mounted through a2wsgi's WSGI adapter, so the API surface is unchanged.
+    The adapter runs Flask requests on a pool of ASGI_WSGI_WORKERS threads;
+    an open SSE stream holds one of them for as long as it is connected.
+    (asgiref's WsgiToAsgi runs them all on one shared thread, so a single
+    stream would block every other Flask request.)
+
+    Needs starlette, a2wsgi, SQLAlchemy's asyncio extra and an async driver:
+
+        pip install starlette a2wsgi "sqlalchemy[asyncio]" aiomysql uvicorn
+        uvicorn asgi:app --workers 4
+    """
+
+    flask_app = flask_app or create_app()
+    engine, session_factory = create_session_factory(flask_app.config)
+
+    from app.asgi.routes import routes
+
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        await engine.dispose()
+
+    app = Starlette(
+        routes=[
+            *routes,
+            Mount(
+                "/",
+                app=WSGIMiddleware(
+                    flask_app, workers=flask_app.config["ASGI_WSGI_WORKERS"]
+                ),
+            ),
+        ],
+        # Flask-CORS only sees the requests that reach the Flask app; this
+        # mirrors its allow-all defaults for the async routes
+        middleware=[
+            Middleware(
+                CORSMiddleware,
+                allow_origins=["*"],
+                allow_methods=["*"],
+                allow_headers=["*"],
+            )
+        ],
+        lifespan=lifespan,
+    )
+    app.state.flask_app = flask_app
+    app.state.session_factory = session_factory
+    return app
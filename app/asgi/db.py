@@ -0,0 +1,62 @@
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.config import engine_options
+
+ASYNC_SQLITE_DRIVER = "aiosqlite"
+
+
+def async_database_uri(config):
+    """
+    URI of the async engine - ASYNC_DATABASE_URI when set, otherwise the sync
+    SQLALCHEMY_DATABASE_URI with its DBAPI swapped for an asyncio one.
+
+    :param config: Flask app config
+    :raises ValueError: for a database without a known async driver
+    :return: database URI string
+    """
+
+    if config.get("ASYNC_DATABASE_URI"):
+        return config["ASYNC_DATABASE_URI"]
+
+    url = make_url(config["SQLALCHEMY_DATABASE_URI"])
+    backend = url.get_backend_name()
+    if backend == "mysql":
+        driver = config.get("ASYNC_MYSQL_DRIVER", "aiomysql")
+    elif backend == "sqlite":
+        driver = ASYNC_SQLITE_DRIVER
+    else:
+        raise ValueError(f"No async driver configured for {backend}")
+
+    return url.set(drivername=f"{backend}+{driver}").render_as_string(
+        hide_password=False
+    )
+
+
+def async_engine_options(database_uri):
+    """
+    The sync engine's pool settings, minus what an async engine cannot take:
+    the instrumented QueuePool (async engines need AsyncAdaptedQueuePool) and
+    PyMySQL's read/write timeouts.
+    """
+
+    options = dict(engine_options(database_uri))
+    options.pop("poolclass", None)
+    if "connect_args" in options:
+        options["connect_args"] = {
+            "connect_timeout": options["connect_args"]["connect_timeout"]
+        }
+    return options
+
+
+def create_session_factory(config):
+    """
+    Build the async engine and a session factory bound to it.
+
+    :param config: Flask app config
+    :return: (AsyncEngine, async_sessionmaker)
+    """
+
+    database_uri = async_database_uri(config)
+    engine = create_async_engine(database_uri, **async_engine_options(database_uri))
+    # handlers only read, and serialize after the session is closed
+    return engine, async_sessionmaker(engine, expire_on_commit=False)
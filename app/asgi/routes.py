@@ -0,0 +1,293 @@
+from math import ceil
+from sqlalchemy import func, select
+from starlette.responses import Response
+from starlette.routing import Route
+from app.models import Project, Task, User
+from app.routes.project_routes import PROJECT_SORT_FIELDS
+from app.routes.task_routes import TASK_SORT_FIELDS
+from app.routes.user_routes import USER_SORT_FIELDS
+from app.serializers import serialize_project, serialize_task, serialize_user
+from app.utils.pagination import keyset_page, keyset_seek, parse_sort, sort_clauses
+from app.utils.task_filters import parse_task_filters
+from app.utils.query_options import (
+    get_query_options,
+    parse_fields,
+    sparse_query_options,
+)
+
+# async versions of the read endpoints - same URLs, query parameters, cursors
+# and response bodies as the blueprints in app.routes, on an AsyncSession.
+# Every relationship a serializer reads is eager loaded (lazy loads are not
+# allowed on an AsyncSession), which the query profiles already guarantee.
+
+
+def json_response(request, payload, status_code=200):
+    # encoded by the Flask app's JSON provider, so bodies match jsonify's
+    body = request.app.state.flask_app.json.dumps(payload) + "\n"
+    return Response(body, status_code=status_code, media_type="application/json")
+
+
+def error_response(request, message, status_code):
+    return json_response(request, {"error": message}, status_code)
+
+
+def int_arg(args, name, default):
+    # request.args.get(name, default, type=int)
+    try:
+        return int(args[name])
+    except (KeyError, ValueError):
+        return default
+
+
+async def count_rows(session, statement):
+    return await session.scalar(
+        select(func.count()).select_from(statement.order_by(None).subquery())
+    )
+
+
+async def paginate(session, statement, page, per_page):
+    """
+    Flask-SQLAlchemy's paginate(error_out=False) on an AsyncSession.
+
+    :param statement: Ordered select() to paginate
+    :return: (dict with total, pages and current_page, list of items)
+    """
+
+    page = page if page >= 1 else 1
+    per_page = per_page if per_page >= 1 else 20
+
+    total = await count_rows(session, statement)
+    items = await session.scalars(
+        statement.limit(per_page).offset((page - 1) * per_page)
+    )
+
+    return {
+        "total": total,
+        "pages": ceil(total / per_page) if total else 0,
+        "current_page": page,
+    }, items.unique().all()
+
+
+async def keyset_paginate(request, session, statement, model_class, sort_by, order):
+    """
+    app.utils.pagination.keyset_paginate on an AsyncSession.
+
+    :return: (page dict or None, error_response or None)
+    """
+
+    cursor = request.query_params.get("cursor", "")
+    per_page = int_arg(request.query_params, "per_page", 5)
+    if per_page < 1:
+        return None, error_response(request, "per_page must be positive", 400)
+
+    try:
+        seek_statement, direction = keyset_seek(
+            statement, model_class, sort_by, order, cursor, per_page
+        )
+    except ValueError as err:
+        return None, error_response(request, f"Invalid cursor: {err}", 400)
+
+    items = await session.scalars(seek_statement)
+    page = keyset_page(
+        items.unique().all(), sort_by, order, cursor, direction, per_page
+    )
+
+    include_total = request.query_params.get("include_total", "false")
+    if include_total.lower() == "true":
+        page["total"] = await count_rows(session, statement)
+
+    return page, None
+
+
+async def get_instance_or_404(
+    request, session, model_class, object_id, label=None, options=()
+):
+    """
+    app.utils.db_helpers.get_instance_or_404 on an AsyncSession.
+
+    :return: (instance or None, error_response or None)
+    """
+
+    instance = await session.scalar(
+        select(model_class).options(*options).filter(model_class.id == object_id)
+    )
+
+    if not instance:
+        model_name = label or model_class.__name__
+        return None, error_response(
+            request, f"{model_name} not found with id {object_id}", 404
+        )
+
+    return instance, None
+
+
+async def listing(request, model_class, sort_fields, key, serialize):
+    """
+    Shared body of the project and user listings: sort_by/order, a sparse
+    fieldset and either OFFSET or keyset pagination.
+    """
+
+    args = request.query_params
+    page = int_arg(args, "page", 1)
+    per_page = int_arg(args, "per_page", 5)
+    sort_by = args.get("sort_by", "updated_at")
+    order = args.get("order", "desc")
+
+    # validate sort_by argument value
+    if sort_by not in sort_fields:
+        return error_response(request, "Invalid sort_by field", 400)
+
+    try:
+        fields = parse_fields(args, model_class)
+    except ValueError as err:
+        return error_response(request, str(err), 400)
+
+    statement = select(model_class).options(
+        *sparse_query_options(model_class, fields, sort_by)
+    )
+
+    async with request.app.state.session_factory() as session:
+        if "cursor" in args:
+            result, error = await keyset_paginate(
+                request, session, statement, model_class, sort_by, order
+            )
+            if error:
+                return error
+            result[key] = [serialize(item, fields) for item in result.pop("items")]
+            return json_response(request, result)
+
+        sort_column = getattr(model_class, sort_by)
+        sort_column = sort_column.asc() if order == "asc" else sort_column.desc()
+        result, items = await paginate(
+            session, statement.order_by(sort_column), page, per_page
+        )
+
+    result[key] = [serialize(item, fields) for item in items]
+    return json_response(request, result)
+
+
+async def detail(request, model_class, object_id, label, serialize, options=None):
+    try:
+        fields = parse_fields(request.query_params, model_class)
+    except ValueError as err:
+        return error_response(request, str(err), 400)
+
+    if options is None or fields is not None:
+        options = sparse_query_options(model_class, fields)
+
+    async with request.app.state.session_factory() as session:
+        instance, error = await get_instance_or_404(
+            request, session, model_class, object_id, label=label, options=options
+        )
+    if error:
+        return error
+
+    return json_response(request, serialize(instance, fields))
+
+
+# get multiple projects - paginated and sorted
+async def get_projects(request):
+    return await listing(
+        request, Project, PROJECT_SORT_FIELDS, "projects", serialize_project
+    )
+
+
+# get a project by id
+async def get_project_by_id(request):
+    return await detail(
+        request,
+        Project,
+        request.path_params["project_id"],
+        "project",
+        serialize_project,
+    )
+
+
+# get all users - paginated and sorted
+async def get_users(request):
+    return await listing(request, User, USER_SORT_FIELDS, "users", serialize_user)
+
+
+# get a user by id
+async def get_user_by_id(request):
+    return await detail(
+        request, User, request.path_params["user_id"], "User", serialize_user
+    )
+
+
+# get all tasks by project id - paginated, sorted and filtered
+async def get_tasks(request):
+    args = request.query_params
+    project_id = request.path_params["project_id"]
+    page = int_arg(args, "page", 1)
+    per_page = int_arg(args, "per_page", 5)
+
+    try:
+        sort_keys = parse_sort(args, TASK_SORT_FIELDS)
+        filters = parse_task_filters(args)
+        fields = parse_fields(args, Task)
+    except ValueError as err:
+        return error_response(request, str(err), 400)
+
+    if fields is None:
+        options = get_query_options("task_list")
+    else:
+        options = sparse_query_options(Task, fields, *(field for field, _ in sort_keys))
+
+    statement = (
+        select(Task)
+        .options(*options)
+        .filter(Task.project_id == project_id)
+        .filter(*filters)
+    )
+
+    async with request.app.state.session_factory() as session:
+        if "cursor" in args:
+            if len(sort_keys) > 1:
+                return error_response(
+                    request, "cursor pagination supports a single sort field", 400
+                )
+
+            sort_by, order = sort_keys[0]
+            result, error = await keyset_paginate(
+                request, session, statement, Task, sort_by, order
+            )
+            if error:
+                return error
+            result["tasks"] = [
+                serialize_task(task, fields) for task in result.pop("items")
+            ]
+            return json_response(request, result)
+
+        result, tasks = await paginate(
+            session, statement.order_by(*sort_clauses(Task, sort_keys)), page, per_page
+        )
+
+    result["tasks"] = [serialize_task(task, fields) for task in tasks]
+    return json_response(request, result)
+
+
+# get a task by id
+async def get_task_by_id(request):
+    return await detail(
+        request,
+        Task,
+        request.path_params["task_id"],
+        "Task",
+        serialize_task,
+        options=get_query_options("task_detail"),
+    )
+
+
+routes = [
+    Route("/api/project/", get_projects, methods=["GET"]),
+    Route("/api/project/{project_id:int}", get_project_by_id, methods=["GET"]),
+    Route("/api/project/{project_id:int}/task/", get_tasks, methods=["GET"]),
+    Route(
+        "/api/project/{project_id:int}/task/{task_id:int}",
+        get_task_by_id,
+        methods=["GET"],
+    ),
+    Route("/api/user/", get_users, methods=["GET"]),
+    Route("/api/user/{user_id:int}", get_user_by_id, methods=["GET"]),
+]
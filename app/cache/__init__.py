@@ -0,0 +1,3 @@
+from app.cache.backends import CacheBackend, LRUCacheBackend
+from app.cache.name_cache import NameCache
+from app.cache.response_cache import ResponseCache
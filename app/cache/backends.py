@@ -0,0 +1,99 @@
+from collections import OrderedDict
+from threading import Lock
+import time
+
+
+class CacheBackend(object):
+    """
+    Storage interface for the response cache.
+
+    Values are opaque to the backend. Counters are used as tag versions and
+    must not be evicted together with the cached values. Subclass it to plug in
+    a shared store so every worker sees the same entries and invalidations.
+    """
+
+    def __init__(self, max_entries=1024, default_ttl=30):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+
+    def get(self, key):
+        """Return the stored value, or None if missing or expired."""
+        raise NotImplementedError
+
+    def set(self, key, value, ttl=None):
+        """Store a value for ttl seconds (default_ttl when None)."""
+        raise NotImplementedError
+
+    def delete(self, key):
+        """Drop a stored value, if present."""
+        raise NotImplementedError
+
+    def get_counter(self, key):
+        """Return the current value of a counter (0 if never incremented)."""
+        raise NotImplementedError
+
+    def incr(self, key):
+        """Increment a counter and return its new value."""
+        raise NotImplementedError
+
+    def clear(self):
+        """Drop every value and counter."""
+        raise NotImplementedError
+
+
+class LRUCacheBackend(CacheBackend):
+    """
+    In-process backend - a size bounded LRU with per-entry expiry.
+
+    Entries and counters are private to the worker process, so invalidations
+    made by other workers are not seen.
+    """
+
+    def __init__(self, max_entries=1024, default_ttl=30):
+        super().__init__(max_entries, default_ttl)
+        self._entries = OrderedDict()
+        self._counters = {}
+        self._lock = Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def get_counter(self, key):
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    def incr(self, key):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,79 @@
+from werkzeug.utils import import_string
+from threading import Lock
+
+
+class NameCache(object):
+    """
+    Flask extension caching name key -> id of projects and users, so imports
+    naming the same projects and users sheet after sheet skip the lookup.
+
+    Only existing rows are cached. The project and user update and delete
+    routes invalidate the names they change in the configured backend, which
+    is why the cache is off by default with the in-process one (see
+    NAME_CACHE_ENABLED): while disabled nothing is cached or read back.
+    """
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.enabled = False
+        self._stats = {"hits": 0, "misses": 0}
+        self._stats_lock = Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        backend_class = app.config["NAME_CACHE_BACKEND"]
+        if isinstance(backend_class, str):
+            backend_class = import_string(backend_class)
+
+        self.backend = backend_class(
+            max_entries=app.config["NAME_CACHE_MAX_ENTRIES"],
+            default_ttl=app.config["NAME_CACHE_TTL"],
+        )
+        self.enabled = app.config["NAME_CACHE_ENABLED"]
+        app.extensions["name_cache"] = self
+
+    @staticmethod
+    def _key(model_class, name_key):
+        return f"{model_class.__tablename__}:{name_key}"
+
+    def get_many(self, model_class, name_keys):
+        """
+        :param model_class: Project or User
+        :param name_keys: normalized names
+        :return: dict of name key -> id for the cached ones
+        """
+
+        if not self.enabled:
+            return {}
+
+        found = {}
+        for name_key in name_keys:
+            row_id = self.backend.get(self._key(model_class, name_key))
+            if row_id is not None:
+                found[name_key] = row_id
+
+        with self._stats_lock:
+            self._stats["hits"] += len(found)
+            self._stats["misses"] += len(name_keys) - len(found)
+        return found
+
+    def set_many(self, model_class, ids):
+        """Cache a dict of name key -> id - call it once they are committed."""
+        if not self.enabled:
+            return
+        for name_key, row_id in ids.items():
+            self.backend.set(self._key(model_class, name_key), row_id)
+
+    def invalidate(self, model_class, *name_keys):
+        if not self.enabled:
+            return
+        for name_key in name_keys:
+            self.backend.delete(self._key(model_class, name_key))
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else None
+        return stats
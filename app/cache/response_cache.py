@@ -0,0 +1,108 @@
+from flask import current_app, g, make_response, request
+from werkzeug.utils import import_string
+from functools import wraps
+from threading import Lock
+
+
+class ResponseCache(object):
+    """
+    Flask extension caching successful GET responses.
+
+    Every cached view declares tags (e.g. "project:1"). Entries are keyed by
+    endpoint, view arguments, normalized query args and the current version of
+    each tag, so invalidating a tag only bumps its version - the stale entries
+    are never read again and age out of the backend. Under conditional() they
+    are keyed by the request's ETag as well, so a write the tags did not see
+    (e.g. on another worker) still misses instead of pairing an old body with
+    the new ETag.
+
+    Invalidations only reach the workers sharing the backend, which is why
+    RESPONSE_CACHE_ENABLED defaults to off with the in-process LRUCacheBackend.
+    """
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.enabled = False
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+        self._stats_lock = Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        backend_class = app.config["RESPONSE_CACHE_BACKEND"]
+        if isinstance(backend_class, str):
+            backend_class = import_string(backend_class)
+
+        self.backend = backend_class(
+            max_entries=app.config["RESPONSE_CACHE_MAX_ENTRIES"],
+            default_ttl=app.config["RESPONSE_CACHE_TTL"],
+        )
+        self.enabled = app.config["RESPONSE_CACHE_ENABLED"]
+        app.extensions["response_cache"] = self
+
+    def _count(self, stat):
+        with self._stats_lock:
+            self._stats[stat] += 1
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else None
+        return stats
+
+    def _cache_key(self, tags, view_args):
+        # query args sorted by name, so ?a=1&b=2 and ?b=2&a=1 share an entry
+        args = sorted((key, tuple(values)) for key, values in request.args.lists())
+        versions = [(tag, self.backend.get_counter(f"tag:{tag}")) for tag in tags]
+        validator = g.get("response_validator")
+        return repr(
+            (request.endpoint, sorted(view_args.items()), args, versions, validator)
+        )
+
+    def cached(self, tags, ttl=None):
+        """
+        Cache a GET view.
+
+        :param tags: callable receiving the view arguments and returning the
+            tags the response depends on
+        :param ttl: Seconds to keep the response (backend default when None)
+        """
+
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if not self.enabled or request.method != "GET":
+                    return view(*args, **kwargs)
+
+                key = self._cache_key(tags(**kwargs), kwargs)
+                cached_response = self.backend.get(key)
+                if cached_response is not None:
+                    self._count("hits")
+                    body, status_code, mimetype = cached_response
+                    response = current_app.response_class(
+                        body, status=status_code, mimetype=mimetype
+                    )
+                    response.headers["X-Cache"] = "HIT"
+                    return response
+
+                self._count("misses")
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200 and not response.is_streamed:
+                    self.backend.set(
+                        key,
+                        (response.get_data(), response.status_code, response.mimetype),
+                        ttl,
+                    )
+                response.headers["X-Cache"] = "MISS"
+                return response
+
+            return wrapper
+
+        return decorator
+
+    def invalidate(self, *tags):
+        """Make every cached response carrying one of the tags stale."""
+        for tag in tags:
+            self.backend.incr(f"tag:{tag}")
+            self._count("invalidations")
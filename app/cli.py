@@ -0,0 +1,24 @@
+from app import db
+import click
+import os
+
+
+def register_commands(app):
+    # Flask-Migrate pulls in alembic (~150 ms at import), which only the
+    # "flask db ..." commands need - web workers skip it
+    if os.environ.get("FLASK_RUN_FROM_CLI") == "true":
+        from flask_migrate import Migrate
+
+        Migrate(app, db)
+
+    @app.cli.command("init-db")
+    def init_db():
+        """Create missing tables from the models.
+
+        The migrations start from an existing schema, so a fresh database is
+        created here and then marked current with "flask db stamp head";
+        existing databases are upgraded with "flask db upgrade".
+        """
+
+        db.create_all()
+        click.echo('Database tables created - run "flask db stamp head" once')
@@ -1,9 +1,149 @@
 from dotenv import load_dotenv
+from app.utils.pool_metrics import InstrumentedQueuePool
 import os
+import tempfile
 
 load_dotenv()
 
 
+def engine_options(database_uri):
+    # pool settings only apply to the MySQL QueuePool; SQLite (used by the
+    # benchmarks) keeps SQLAlchemy's defaults
+    if not database_uri or not database_uri.startswith("mysql"):
+        return {}
+
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", 10)),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 5)),
+        # seconds to wait for a free connection before giving up
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", 10)),
+        # recycle before MySQL's wait_timeout closes idle connections
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", 1800)),
+        # test connections on checkout ("MySQL server has gone away")
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() == "true",
+        "connect_args": {
+            "connect_timeout": int(os.getenv("DB_CONNECT_TIMEOUT", 10)),
+            "read_timeout": int(os.getenv("DB_READ_TIMEOUT", 30)),
+            "write_timeout": int(os.getenv("DB_WRITE_TIMEOUT", 30)),
+        },
+    }
+
+
 class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv("MYSQL_URI")
     SQLALCHEMY_TRACK_MODIFICATION = False
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+
+    # number of rows read, validated and inserted per batch by the Excel/CSV
+    # import, and the largest accepted upload
+    IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", 500))
+    IMPORT_MAX_FILE_SIZE_MB = int(os.getenv("IMPORT_MAX_FILE_SIZE_MB", 50))
+
+    # number of tasks fetched per round-trip by the streaming export
+    EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 1000))
+
+    # rows fetched per round-trip by the sync feed, and how far sync tokens
+    # are rewound so rows committed late by concurrent writers are not missed
+    SYNC_CHUNK_SIZE = int(os.getenv("SYNC_CHUNK_SIZE", 1000))
+    SYNC_TOKEN_LAG_SECONDS = int(os.getenv("SYNC_TOKEN_LAG_SECONDS", 5))
+
+    # background jobs (async import/export). Job records live in the backend,
+    # so the default in-process ThreadJobBackend only suits a single worker:
+    # with several, polling /api/jobs/<id> may reach a worker that never saw
+    # the job. ?async=true is therefore off unless a shared backend is
+    # configured or it is enabled explicitly (JOB_ASYNC_ENABLED=true). Export
+    # results are files in JOB_RESULT_DIR, removed once the job drops out of
+    # the JOB_HISTORY_SIZE most recent jobs
+    JOB_BACKEND = os.getenv("JOB_BACKEND", "app.jobs.ThreadJobBackend")
+    JOB_ASYNC_ENABLED = (
+        os.getenv(
+            "JOB_ASYNC_ENABLED", str(JOB_BACKEND != "app.jobs.ThreadJobBackend")
+        ).lower()
+        == "true"
+    )
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+    JOB_HISTORY_SIZE = int(os.getenv("JOB_HISTORY_SIZE", 1000))
+    JOB_RESULT_DIR = os.getenv("JOB_RESULT_DIR", tempfile.gettempdir())
+
+    # read-through cache of GET responses. Entries and tag versions live in
+    # the backend, so the default in-process LRU only suits a single worker:
+    # with several, a write on one never reaches the others' caches and they
+    # serve pre-write responses until RESPONSE_CACHE_TTL runs out. The cache
+    # is therefore off unless a shared backend is configured or it is enabled
+    # explicitly (RESPONSE_CACHE_ENABLED=true, e.g. for a single worker)
+    RESPONSE_CACHE_BACKEND = os.getenv(
+        "RESPONSE_CACHE_BACKEND", "app.cache.LRUCacheBackend"
+    )
+    RESPONSE_CACHE_ENABLED = (
+        os.getenv(
+            "RESPONSE_CACHE_ENABLED",
+            str(RESPONSE_CACHE_BACKEND != "app.cache.LRUCacheBackend"),
+        ).lower()
+        == "true"
+    )
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", 30))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 1024))
+
+    # project/user name -> id lookups of the Excel/CSV import. Renames and
+    # deletes only invalidate the backend of the worker serving them, so with
+    # the default in-process LRU another worker keeps the old name -> id and
+    # its imports attach tasks to the wrong row or a deleted id until
+    # NAME_CACHE_TTL runs out. Off unless a shared backend is configured or it
+    # is enabled explicitly (NAME_CACHE_ENABLED=true, e.g. for a single worker)
+    NAME_CACHE_BACKEND = os.getenv("NAME_CACHE_BACKEND", "app.cache.LRUCacheBackend")
+    NAME_CACHE_ENABLED = (
+        os.getenv(
+            "NAME_CACHE_ENABLED",
+            str(NAME_CACHE_BACKEND != "app.cache.LRUCacheBackend"),
+        ).lower()
+        == "true"
+    )
+    NAME_CACHE_TTL = int(os.getenv("NAME_CACHE_TTL", 300))
+    NAME_CACHE_MAX_ENTRIES = int(os.getenv("NAME_CACHE_MAX_ENTRIES", 10000))
+
+    # server-sent task events - pub/sub backend, per-client buffer (events
+    # beyond it are dropped and the client told to resync) and heartbeat.
+    # The default InProcessBroker only reaches streams on the publishing
+    # worker: with several, a stream silently misses the other workers' writes.
+    # /events is therefore off unless a shared broker is configured or it is
+    # enabled explicitly (EVENT_STREAM_ENABLED=true, e.g. for a single worker)
+    EVENT_BROKER_BACKEND = os.getenv(
+        "EVENT_BROKER_BACKEND", "app.events.InProcessBroker"
+    )
+    EVENT_STREAM_ENABLED = (
+        os.getenv(
+            "EVENT_STREAM_ENABLED",
+            str(EVENT_BROKER_BACKEND != "app.events.InProcessBroker"),
+        ).lower()
+        == "true"
+    )
+    EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", 100))
+    EVENT_HEARTBEAT_SECONDS = float(os.getenv("EVENT_HEARTBEAT_SECONDS", 15))
+
+    # encode JSON responses with orjson when it is installed
+    JSON_USE_ORJSON = os.getenv("JSON_USE_ORJSON", "true").lower() == "true"
+
+    # share of requests profiled with cProfile (0 disables), and where the
+    # .prof dumps go
+    REQUEST_PROFILE_SAMPLE_RATE = float(os.getenv("REQUEST_PROFILE_SAMPLE_RATE", 0))
+    REQUEST_PROFILE_DIR = os.getenv(
+        "REQUEST_PROFILE_DIR", os.path.join(tempfile.gettempdir(), "taskify-profiles")
+    )
+
+    # max number of creates + updates + deletes in one task batch request
+    TASK_BATCH_MAX_ITEMS = int(os.getenv("TASK_BATCH_MAX_ITEMS", 1000))
+
+    # serve /api/project/<id>/stats status counts from the project_task_stats
+    # counter table instead of a GROUP BY over the project's tasks
+    PROJECT_STATS_MATERIALIZED = (
+        os.getenv("PROJECT_STATS_MATERIALIZED", "false").lower() == "true"
+    )
+
+    # async (ASGI) serving mode - see asgi.py. Defaults to SQLALCHEMY_DATABASE_URI
+    # with its driver swapped for an async one (aiomysql/asyncmy, aiosqlite)
+    ASYNC_DATABASE_URI = os.getenv("ASYNC_DATABASE_URI")
+    ASYNC_MYSQL_DRIVER = os.getenv("ASYNC_MYSQL_DRIVER", "aiomysql")
+    # threads running the routes served by the Flask app in that mode - every
+    # open /events stream keeps one busy, so size it above the expected streams
+    ASGI_WSGI_WORKERS = int(os.getenv("ASGI_WSGI_WORKERS", 32))
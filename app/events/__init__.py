@@ -0,0 +1,2 @@
+from app.events.backends import BrokerBackend, InProcessBroker, Subscription
+from app.events.broker import EventBroker
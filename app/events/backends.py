@@ -0,0 +1,102 @@
+from queue import Empty, Full, Queue
+from threading import Lock
+
+# returned by Subscription.get when messages were dropped for a slow subscriber
+RESYNC = object()
+
+
+class Subscription(object):
+    """
+    One subscriber's bounded mailbox.
+
+    Publishers never block on a slow subscriber: when the mailbox is full the
+    message is dropped and the subscription is marked lagged. The reader then
+    gets RESYNC instead of the stale backlog and should refetch its state.
+    """
+
+    def __init__(self, channel, max_queue=100):
+        self.channel = channel
+        self.dropped = 0
+        self._queue = Queue(maxsize=max_queue)
+        self._lagged = False
+
+    def put(self, message):
+        try:
+            self._queue.put_nowait(message)
+        except Full:
+            self._lagged = True
+            self.dropped += 1
+
+    def get(self, timeout):
+        """Return the next message, RESYNC after an overflow, or None on timeout."""
+        if self._lagged:
+            self._lagged = False
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except Empty:
+                    break
+            return RESYNC
+
+        try:
+            return self._queue.get(timeout=timeout)
+        except Empty:
+            return None
+
+
+class BrokerBackend(object):
+    """
+    Pub/sub interface for the event broker.
+
+    Subscriptions are always local to the process - the base class fans a
+    message out to this process's subscribers of a channel. Subclass it and
+    override publish to plug in a shared broker (e.g. Redis pub/sub): send the
+    message there, and have a listener thread call _deliver with what comes
+    back, so subscribers on every worker receive it.
+    """
+
+    def __init__(self, max_queue=100):
+        self.max_queue = max_queue
+        self._channels = {}
+        self._lock = Lock()
+
+    def publish(self, channel, message):
+        """Send a message to every subscriber of channel."""
+        raise NotImplementedError
+
+    def subscribe(self, channel):
+        subscription = Subscription(channel, self.max_queue)
+        with self._lock:
+            self._channels.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._channels.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._channels[subscription.channel]
+
+    def _deliver(self, channel, message):
+        with self._lock:
+            subscribers = list(self._channels.get(channel, ()))
+        for subscription in subscribers:
+            subscription.put(message)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "channels": len(self._channels),
+                "subscribers": sum(len(subs) for subs in self._channels.values()),
+            }
+
+
+class InProcessBroker(BrokerBackend):
+    """
+    In-process backend - only subscribers in the same process see a message,
+    so event streams are off by default with it (see EVENT_STREAM_ENABLED).
+    """
+
+    def publish(self, channel, message):
+        self._deliver(channel, message)
@@ -0,0 +1,83 @@
+from flask import current_app
+from werkzeug.utils import import_string
+from app.events.backends import RESYNC
+from itertools import count
+
+
+class EventBroker(object):
+    """
+    Flask extension pushing task changes to clients as Server-Sent Events.
+
+    Write paths publish events to a project's channel after they commit;
+    every open event stream of that project receives them. Streams send a
+    comment line as a heartbeat, which also detects disconnected clients.
+
+    Streams only see events published through their backend, so with the
+    in-process InProcessBroker they miss every write made on another worker -
+    see EVENT_STREAM_ENABLED.
+    """
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.enabled = False
+        self.heartbeat = 15
+        self._ids = count(1)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        backend_class = app.config["EVENT_BROKER_BACKEND"]
+        if isinstance(backend_class, str):
+            backend_class = import_string(backend_class)
+
+        self.backend = backend_class(max_queue=app.config["EVENT_QUEUE_SIZE"])
+        self.heartbeat = app.config["EVENT_HEARTBEAT_SECONDS"]
+        self.enabled = app.config["EVENT_STREAM_ENABLED"]
+        app.extensions["events"] = self
+
+    def publish(self, project_id, event, data):
+        """
+        Publish an event to a project's stream.
+
+        :param project_id: Project whose subscribers receive the event
+        :param event: Event name (e.g. "task.created")
+        :param data: JSON serializable payload
+        """
+
+        # encoded once here, not once per subscriber
+        message = (next(self._ids), event, current_app.json.dumps(data))
+        self.backend.publish(f"project:{project_id}", message)
+
+    def stream(self, project_id):
+        """
+        Return a generator of SSE text for a project's events.
+
+        The generator needs no app or request context, so the view's database
+        session is released as soon as the response starts. It subscribes when
+        it starts, so a client gone before that leaves no subscription behind.
+        """
+
+        backend = self.backend
+        heartbeat = self.heartbeat
+
+        def generate():
+            subscription = backend.subscribe(f"project:{project_id}")
+            try:
+                # tell EventSource how long to wait before reconnecting
+                yield "retry: 3000\n\n"
+                while True:
+                    message = subscription.get(timeout=heartbeat)
+                    if message is None:
+                        yield ": keep-alive\n\n"
+                    elif message is RESYNC:
+                        yield "event: resync\ndata: {}\n\n"
+                    else:
+                        event_id, event, data = message
+                        yield f"id: {event_id}\nevent: {event}\ndata: {data}\n\n"
+            finally:
+                backend.unsubscribe(subscription)
+
+        return generate()
+
+    def stats(self):
+        return self.backend.stats()
@@ -1,7 +1,14 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
-from flask_migrate import Migrate
+from app.jobs import JobQueue
+from app.cache import NameCache, ResponseCache
+from app.events import EventBroker
+from app.utils.pool_metrics import pool_metrics
+from app.utils.request_metrics import request_metrics
 
 db = SQLAlchemy()
-migrate = Migrate
 cors = CORS()
+jobs = JobQueue()
+response_cache = ResponseCache()
+name_cache = NameCache()
+events = EventBroker()
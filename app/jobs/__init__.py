@@ -0,0 +1,2 @@
+from app.jobs.backends import JobBackend, ThreadJobBackend
+from app.jobs.queue import JobQueue
@@ -0,0 +1,79 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+
+class JobBackend(object):
+    """
+    Storage and execution interface for background jobs.
+
+    A backend keeps job records (plain dicts, so they can be serialized to a
+    shared store) and runs submitted callables on its workers. Subclass it to
+    plug in a shared store / broker when jobs must be visible across processes.
+
+    on_evict(job) is called with every record the backend drops to stay within
+    max_jobs, so whatever the job left behind (e.g. an export file) goes too.
+    """
+
+    def __init__(self, max_workers=2, max_jobs=1000, on_evict=None):
+        self.max_workers = max_workers
+        self.max_jobs = max_jobs
+        self.on_evict = on_evict
+
+    def submit(self, func, *args):
+        """Run func(*args) on a worker."""
+        raise NotImplementedError
+
+    def save(self, job):
+        """Store a new job record."""
+        raise NotImplementedError
+
+    def load(self, job_id):
+        """Return a copy of the job record, or None if it is unknown."""
+        raise NotImplementedError
+
+    def update(self, job_id, fields):
+        """Merge fields into the stored job record."""
+        raise NotImplementedError
+
+
+class ThreadJobBackend(JobBackend):
+    """
+    In-process backend - a thread pool plus a bounded in-memory job table.
+
+    Needs no external broker, but jobs are only visible to the process that
+    created them.
+    """
+
+    def __init__(self, max_workers=2, max_jobs=1000, on_evict=None):
+        super().__init__(max_workers, max_jobs, on_evict)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="taskify-job"
+        )
+        self._jobs = OrderedDict()
+        self._lock = Lock()
+
+    def submit(self, func, *args):
+        self._executor.submit(func, *args)
+
+    def save(self, job):
+        evicted = []
+        with self._lock:
+            self._jobs[job["id"]] = dict(job)
+            # forget the oldest jobs once the table is full
+            while len(self._jobs) > self.max_jobs:
+                evicted.append(self._jobs.popitem(last=False)[1])
+
+        if self.on_evict:
+            for evicted_job in evicted:
+                self.on_evict(evicted_job)
+
+    def load(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def update(self, job_id, fields):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
@@ -0,0 +1,93 @@
+from flask import current_app
+from werkzeug.utils import import_string
+from datetime import datetime
+import os
+import uuid
+
+
+class JobQueue(object):
+    """
+    Flask extension that runs long operations (imports, exports) off the
+    request thread and tracks their progress.
+    """
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.enabled = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        backend_class = app.config["JOB_BACKEND"]
+        if isinstance(backend_class, str):
+            backend_class = import_string(backend_class)
+
+        self.backend = backend_class(
+            max_workers=app.config["JOB_WORKERS"],
+            max_jobs=app.config["JOB_HISTORY_SIZE"],
+            on_evict=self._discard_result,
+        )
+        self.enabled = app.config["JOB_ASYNC_ENABLED"]
+        app.extensions["jobs"] = self
+
+    def enqueue(self, kind, func, *args, **kwargs):
+        """
+        Queue func(*args, progress=callback, **kwargs) and return the job record.
+
+        func runs inside an app context; whatever it returns is stored as the
+        job result. progress(rows_processed, total_rows) may be called any time.
+        """
+
+        now = datetime.utcnow()
+        job = {
+            "id": uuid.uuid4().hex,
+            "kind": kind,
+            "status": "queued",
+            "rows_processed": 0,
+            "total_rows": None,
+            "result": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        self.backend.save(job)
+
+        app = current_app._get_current_object()
+        self.backend.submit(self._run, app, job["id"], func, args, kwargs)
+
+        return job
+
+    def get(self, job_id):
+        return self.backend.load(job_id)
+
+    def update(self, job_id, **fields):
+        fields["updated_at"] = datetime.utcnow()
+        self.backend.update(job_id, fields)
+
+    @staticmethod
+    def _discard_result(job):
+        # export results are files in JOB_RESULT_DIR
+        result = job.get("result")
+        if isinstance(result, dict) and result.get("path"):
+            try:
+                os.remove(result["path"])
+            except FileNotFoundError:
+                pass
+
+    def _run(self, app, job_id, func, args, kwargs):
+        def progress(rows_processed, total_rows=None):
+            self.update(job_id, rows_processed=rows_processed, total_rows=total_rows)
+
+        with app.app_context():
+            self.update(job_id, status="running")
+            try:
+                result = func(*args, progress=progress, **kwargs)
+            except Exception as err:
+                app.logger.exception("Job %s failed", job_id)
+                self.update(job_id, status="failed", error=str(err))
+                return
+
+            self.update(job_id, status="finished", result=result)
+            # evicted while it ran - nobody can fetch the result any more
+            if self.get(job_id) is None:
+                self._discard_result({"result": result})
@@ -1,4 +1,7 @@
 from .time_stamp import TimeStampBase
+from .name_key import NameKeyBase, normalize_name
 from .project import Project
 from .task import Task
 from .user import User
+from .project_stats import ProjectTaskStats
+from .tombstone import Tombstone
@@ -0,0 +1,26 @@
+from sqlalchemy.orm import validates
+from app.extensions import db
+
+
+def normalize_name(name):
+    # names are matched case-insensitively, ignoring surrounding whitespace
+    return str(name).strip().casefold()
+
+
+def _default_name_key(context):
+    # Core and bulk inserts (the Excel import, seeding) only pass the name
+    return normalize_name(context.get_current_parameters()["name"])
+
+
+class NameKeyBase(object):
+    """
+    Adds name_key - the normalized name, kept in step with name - so names
+    are looked up with an exact match on a unique index.
+    """
+
+    name_key = db.Column(db.String(100), nullable=False, default=_default_name_key)
+
+    @validates("name")
+    def _set_name_key(self, key, name):
+        self.name_key = normalize_name(name)
+        return name
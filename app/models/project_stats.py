@@ -0,0 +1,17 @@
+from app.extensions import db
+from app.models import TimeStampBase
+
+
+class ProjectTaskStats(db.Model, TimeStampBase):
+    # materialized task counters per project, kept in sync by the task write
+    # paths when PROJECT_STATS_MATERIALIZED is enabled
+    __tablename__ = "project_task_stats"
+
+    project_id = db.Column(
+        db.Integer,
+        db.ForeignKey("project.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    not_started = db.Column(db.Integer, nullable=False, default=0)
+    in_progress = db.Column(db.Integer, nullable=False, default=0)
+    completed = db.Column(db.Integer, nullable=False, default=0)
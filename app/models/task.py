@@ -18,6 +18,8 @@ user_task = db.Table(
         db.ForeignKey("task.id", ondelete="CASCADE"),
         primary_key=True,
     ),
+    # reverse lookup (task -> users); the primary key only covers user -> tasks
+    db.Index("ix_user_tasks_task_id_user_id", "task_id", "user_id"),
 )
 
 
@@ -28,6 +30,26 @@ class StatusEnum(enum.Enum):
 
 
 class Task(db.Model, TimeStampBase):
+    # listings are always scoped to a project, then sorted by one of these
+    # columns with id as the tie-breaker (see keyset pagination)
+    __table_args__ = (
+        db.Index("ix_task_project_id_updated_at_id", "project_id", "updated_at", "id"),
+        db.Index("ix_task_project_id_created_at_id", "project_id", "created_at", "id"),
+        db.Index("ix_task_project_id_due_date_id", "project_id", "due_date", "id"),
+        db.Index("ix_task_project_id_name_id", "project_id", "name", "id"),
+        db.Index("ix_task_project_id_status", "project_id", "status"),
+        # cross-project lookups (user inbox); user_tasks' primary key
+        # (user_id, task_id) drives the join from the user side
+        db.Index("ix_task_due_date_status_id", "due_date", "status", "id"),
+        # change feed (app.utils.sync) - every task changed since a point in time
+        db.Index("ix_task_updated_at_id", "updated_at", "id"),
+        # full-text search (MySQL only - other databases use the in-memory
+        # index in app.utils.search)
+        db.Index(
+            "ft_task_name_description", "name", "description", mysql_prefix="FULLTEXT"
+        ).ddl_if(dialect="mysql"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.String(300), nullable=True)
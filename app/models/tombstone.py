@@ -0,0 +1,14 @@
+from app.extensions import db
+from datetime import datetime
+
+
+class Tombstone(db.Model):
+    # a deleted project, task or user - deletes leave no row behind, so the
+    # sync feed reads these to tell clients what to drop
+    __table_args__ = (db.Index("ix_tombstone_deleted_at_id", "deleted_at", "id"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    entity = db.Column(db.String(20), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    project_id = db.Column(db.Integer, nullable=True)
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
@@ -1,7 +1,15 @@
 from app.extensions import db
-from app.models import TimeStampBase
+from app.models import NameKeyBase, TimeStampBase
 
 
-class User(db.Model, TimeStampBase):
+class User(db.Model, TimeStampBase, NameKeyBase):
+    # sort columns of the listing endpoint, id as the tie-breaker
+    __table_args__ = (
+        db.Index("ix_user_updated_at_id", "updated_at", "id"),
+        db.Index("ix_user_created_at_id", "created_at", "id"),
+        # one row per name, compared trimmed and case-folded
+        db.Index("uq_user_name_key", "name_key", unique=True),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False, unique=True)
@@ -0,0 +1,37 @@
+from flask import Blueprint, jsonify, send_file
+from app.extensions import jobs
+from app.serializers import serialize_job
+
+job_bp = Blueprint("job_bp", __name__)
+
+
+# get status and progress of a background job
+@job_bp.route("/<job_id>", methods=["GET"])
+def get_job(job_id):
+    job = jobs.get(job_id)
+    if not job:
+        return jsonify({"error": f"Job not found with id {job_id}"}), 404
+
+    return jsonify(serialize_job(job)), 200
+
+
+# download the result of a finished background job
+@job_bp.route("/<job_id>/result", methods=["GET"])
+def get_job_result(job_id):
+    job = jobs.get(job_id)
+    if not job:
+        return jsonify({"error": f"Job not found with id {job_id}"}), 404
+
+    if job["status"] != "finished":
+        return jsonify({"error": f"Job is {job['status']}"}), 409
+
+    if job["kind"] != "export":
+        return jsonify(job["result"]), 200
+
+    result = job["result"]
+    return send_file(
+        result["path"],
+        mimetype=result["mimetype"],
+        as_attachment=True,
+        download_name=result["download_name"],
+    )
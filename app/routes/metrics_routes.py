@@ -0,0 +1,40 @@
+from flask import Blueprint, jsonify
+from app.extensions import (
+    events,
+    name_cache,
+    pool_metrics,
+    request_metrics,
+    response_cache,
+)
+
+metrics_bp = Blueprint("metrics_bp", __name__)
+
+
+# response cache hit/miss counters
+@metrics_bp.route("/cache", methods=["GET"])
+def get_cache_metrics():
+    return jsonify(response_cache.stats()), 200
+
+
+# import name lookup cache hit/miss counters
+@metrics_bp.route("/name-cache", methods=["GET"])
+def get_name_cache_metrics():
+    return jsonify(name_cache.stats()), 200
+
+
+# open event streams and channels
+@metrics_bp.route("/events", methods=["GET"])
+def get_event_metrics():
+    return jsonify(events.stats()), 200
+
+
+# connection pool saturation, checkout wait time and connection churn
+@metrics_bp.route("/pool", methods=["GET"])
+def get_pool_metrics():
+    return jsonify(pool_metrics.snapshot()), 200
+
+
+# per-endpoint latency histograms, SQL counts and DB/serialization time
+@metrics_bp.route("/requests", methods=["GET"])
+def get_request_metrics():
+    return jsonify(request_metrics.snapshot()), 200
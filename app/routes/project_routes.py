@@ -1,14 +1,28 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 from app.models import Project
 from app import db
-from app.utils.db_helpers import get_instance_or_404
+from app.extensions import events, name_cache, response_cache
+from app.utils.db_helpers import get_instance_or_404, get_name_conflict
+from app.utils.pagination import keyset_paginate
+from app.utils.project_stats import get_project_stats
+from app.utils.sync import record_project_delete
+from app.utils.conditional import (
+    conditional,
+    instance_validators,
+    listing_validators,
+)
+from app.utils.query_options import parse_fields, sparse_query_options
 from app.serializers import serialize_project
 
 project_bp = Blueprint("project_bp", __name__)
 
+PROJECT_SORT_FIELDS = ["name", "created_at", "updated_at"]
+
 
 # get multiple projects - paginated and sorted
 @project_bp.route("/", methods=["GET"])
+@conditional(lambda: listing_validators(Project, PROJECT_SORT_FIELDS))
+@response_cache.cached(lambda: ["projects"])
 def get_projects():
     # query params for pagination and sorting
     page = request.args.get("page", 1, type=int)
@@ -17,8 +31,33 @@ def get_projects():
     order = request.args.get("order", "desc")
 
     # validate sort_by argument value
-    if sort_by not in ["name", "created_at", "updated_at"]:
+    if sort_by not in PROJECT_SORT_FIELDS:
         return jsonify({"error": "Invalid sort_by field"}), 400
+
+    # sparse fieldset - fields=id,name selects only those columns
+    try:
+        fields = parse_fields(request.args, Project)
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
+    projects_query = Project.query.options(
+        *sparse_query_options(Project, fields, sort_by)
+    )
+
+    # keyset (cursor) pagination - opt in by passing cursor (empty for first page)
+    cursor = request.args.get("cursor")
+    if cursor is not None:
+        projects_page, error_response, status_code = keyset_paginate(
+            projects_query, Project, sort_by, order, cursor, per_page
+        )
+        if error_response:
+            return error_response, status_code
+
+        projects_page["projects"] = [
+            serialize_project(project, fields) for project in projects_page.pop("items")
+        ]
+        return jsonify(projects_page), 200
+
     sort_column = getattr(Project, sort_by)
     # sorting order - descending or ascending
     if order == "asc":
@@ -26,7 +65,7 @@ def get_projects():
     else:
         sort_column = sort_column.desc()
 
-    projects_paginated = Project.query.order_by(sort_column).paginate(
+    projects_paginated = projects_query.order_by(sort_column).paginate(
         page=page, per_page=per_page, error_out=False
     )
 
@@ -37,7 +76,8 @@ def get_projects():
                 "pages": projects_paginated.pages,
                 "current_page": projects_paginated.page,
                 "projects": [
-                    serialize_project(project) for project in projects_paginated.items
+                    serialize_project(project, fields)
+                    for project in projects_paginated.items
                 ],
             }
         ),
@@ -47,19 +87,72 @@ def get_projects():
 
 # get a project by id
 @project_bp.route("/<int:project_id>", methods=["GET"])
+@conditional(lambda project_id: instance_validators(Project, project_id))
+@response_cache.cached(lambda project_id: [f"project:{project_id}"])
 def get_project_by_id(project_id):
+    try:
+        fields = parse_fields(request.args, Project)
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
     project, error_response, status_code = get_instance_or_404(
-        Project, project_id, "id", label="project"
+        Project,
+        project_id,
+        "id",
+        label="project",
+        options=sparse_query_options(Project, fields),
     )
     if error_response:
         return error_response, status_code
 
     return (
-        jsonify(serialize_project(project)),
+        jsonify(serialize_project(project, fields)),
         200,
     )
 
 
+# task counts by status, overdue count and next due date of a project
+@project_bp.route("/<int:project_id>/stats", methods=["GET"])
+@response_cache.cached(lambda project_id: [f"project:{project_id}:tasks"])
+def get_project_stats_by_id(project_id):
+    project, error_response, status_code = get_instance_or_404(
+        Project, project_id, "id", label="project"
+    )
+    if error_response:
+        return error_response, status_code
+
+    return jsonify(get_project_stats(project_id)), 200
+
+
+# server-sent events for the project's tasks - created, updated, deleted,
+# assignments, batches and imports - instead of polling the task listing.
+# Needs a broker shared by every worker (see EVENT_STREAM_ENABLED)
+@project_bp.route("/<int:project_id>/events", methods=["GET"])
+def get_project_events(project_id):
+    if not events.enabled:
+        return (
+            jsonify(
+                {
+                    "error": "event streams need a shared EVENT_BROKER_BACKEND "
+                    "(or EVENT_STREAM_ENABLED=true on a single worker)"
+                }
+            ),
+            400,
+        )
+
+    project, error_response, status_code = get_instance_or_404(
+        Project, project_id, "id", label="project"
+    )
+    if error_response:
+        return error_response, status_code
+
+    return Response(
+        events.stream(project_id),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # create a project
 @project_bp.route("/", methods=["POST"])
 def create_project():
@@ -70,11 +163,16 @@ def create_project():
     if not name:
         return jsonify({"error": "Project Name is required"}), 400
 
+    error_response, status_code = get_name_conflict(Project, name)
+    if error_response:
+        return error_response, status_code
+
     project = Project(name=name)
 
     db.session.add(project)
     db.session.commit()
     db.session.refresh(project)
+    response_cache.invalidate("projects")
 
     return (
         jsonify(
@@ -97,10 +195,20 @@ def update_project(project_id):
         return error_response, status_code
 
     data = request.get_json()
+    previous_name_key = project.name_key
+    if data.get("name"):
+        error_response, status_code = get_name_conflict(
+            Project, data["name"], exclude_id=project_id
+        )
+        if error_response:
+            return error_response, status_code
     project.name = data.get("name", project.name)
 
     db.session.commit()
+    name_cache.invalidate(Project, previous_name_key)
     db.session.refresh(project)
+    # task responses carry the project name as well
+    response_cache.invalidate("projects", f"project:{project_id}")
 
     return (
         jsonify(
@@ -122,7 +230,14 @@ def delete_project(project_id):
     if error_response:
         return error_response, status_code
 
+    name_key = project.name_key
+    record_project_delete(project_id)
     db.session.delete(project)
     db.session.commit()
+    name_cache.invalidate(Project, name_key)
+    # its tasks are gone through the cascade
+    response_cache.invalidate(
+        "projects", f"project:{project_id}", f"project:{project_id}:tasks"
+    )
 
     return jsonify({"message": "Project deleted successfully"})
@@ -0,0 +1,20 @@
+from flask import Blueprint, request, jsonify
+from app.utils.search import search_tasks_page
+
+search_bp = Blueprint("search_bp", __name__)
+
+
+# full-text search over task names and descriptions - all projects or one
+@search_bp.route("/tasks", methods=["GET"])
+def search_all_tasks():
+    text = request.args.get("q", "").strip()
+    page = request.args.get("page", 1, type=int)
+    per_page = request.args.get("per_page", 10, type=int)
+    project_id = request.args.get("project_id", type=int)
+
+    if not text:
+        return jsonify({"error": "q is required"}), 400
+    if per_page < 1:
+        return jsonify({"error": "per_page must be positive"}), 400
+
+    return jsonify(search_tasks_page(text, project_id, page, per_page)), 200
@@ -0,0 +1,19 @@
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from app.utils.sync import decode_sync_token, stream_changes
+
+sync_bp = Blueprint("sync_bp", __name__)
+
+
+# everything changed since a sync token (or everything), including deletes
+@sync_bp.route("/", methods=["GET"])
+def get_changes():
+    since = None
+    if request.args.get("since"):
+        try:
+            since = decode_sync_token(request.args["since"])
+        except ValueError as err:
+            return jsonify({"error": str(err)}), 400
+
+    return Response(
+        stream_with_context(stream_changes(since)), mimetype="application/json"
+    )
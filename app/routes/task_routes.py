@@ -1,40 +1,126 @@
-from flask import Blueprint, request, jsonify, send_file
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    request,
+    jsonify,
+    send_file,
+    stream_with_context,
+)
 from app.models import Task, Project, User
 from app.models.task import StatusEnum
 from app import db
-from app.serializers import serialize_task, serialize_task_for_export
+from app.extensions import events, jobs, response_cache
+from app.serializers import serialize_job, serialize_task
+from app.utils.assignments import (
+    add_task_users,
+    remove_task_users,
+    replace_task_users,
+)
+from app.utils.batch_tasks import apply_task_batch
 from app.utils.db_helpers import get_instance_or_404
-from app.utils.export_tasks import export_tasks
-from app.utils.import_tasks import validate_uploaded_file, process_excel_data
+from app.utils.pagination import keyset_paginate, parse_sort, sort_clauses
+from app.utils.conditional import (
+    conditional,
+    task_listing_validators,
+    task_validators,
+)
+from app.utils.project_stats import adjust_project_counters
+from app.utils.search import search_tasks_page
+from app.utils.sync import record_deletes
+from app.utils.task_filters import parse_task_filters
+from app.utils.query_options import (
+    apply_query_profile,
+    get_query_options,
+    parse_fields,
+    sparse_query_options,
+)
+from app.utils.export_tasks import (
+    EXPORT_MIMETYPES,
+    content_disposition,
+    export_file_name,
+    export_project_tasks,
+    iter_project_tasks,
+    stream_tasks_csv,
+    write_tasks_xlsx,
+)
+from app.utils.import_tasks import (
+    validate_uploaded_file,
+    process_excel_data,
+    process_excel_file,
+)
 from datetime import datetime
-import pandas as pd
+import os
+import tempfile
 
 task_bp = Blueprint("task_bp", __name__)
 
+TASK_SORT_FIELDS = ["name", "created_at", "updated_at", "due_date"]
+
+# job records must be visible to every worker a client may poll
+ASYNC_DISABLED_ERROR = (
+    "async=true needs a shared JOB_BACKEND "
+    "(or JOB_ASYNC_ENABLED=true on a single worker)"
+)
+
 
 # get all tasks by project id - paginated and sorted
 @task_bp.route("/", methods=["GET"])
+@conditional(lambda project_id: task_listing_validators(project_id, TASK_SORT_FIELDS))
+@response_cache.cached(
+    lambda project_id, **_: [
+        "tasks",
+        "users",
+        f"project:{project_id}",
+        f"project:{project_id}:tasks",
+    ]
+)
 def get_tasks(project_id):
     # query params for pagination and sorting
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 5, type=int)
-    sort_by = request.args.get("sort_by", "updated_at")
-    order = request.args.get("order", "desc")
-
-    # validate sort_by argument value
-    if sort_by not in ["name", "created_at", "updated_at", "due_date"]:
-        return jsonify({"error": "Invalid sort_by field"}), 400
-    sort_column = getattr(Task, sort_by)
-    # sorting order - descending or ascending
-    if order == "asc":
-        sort_column = sort_column.asc()
+
+    # sort=-due_date,name or sort_by=...&order=..., plus filters - see
+    # app.utils.task_filters - and an optional sparse fieldset (fields=...)
+    try:
+        sort_keys = parse_sort(request.args, TASK_SORT_FIELDS)
+        filters = parse_task_filters(request.args)
+        fields = parse_fields(request.args, Task)
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
+    if fields is None:
+        options = get_query_options("task_list")
     else:
-        sort_column = sort_column.desc()
+        options = sparse_query_options(Task, fields, *(field for field, _ in sort_keys))
+
+    tasks_query = (
+        Task.query.options(*options).filter_by(project_id=project_id).filter(*filters)
+    )
+
+    # keyset (cursor) pagination - opt in by passing cursor (empty for first page)
+    cursor = request.args.get("cursor")
+    if cursor is not None:
+        if len(sort_keys) > 1:
+            return (
+                jsonify({"error": "cursor pagination supports a single sort field"}),
+                400,
+            )
+
+        sort_by, order = sort_keys[0]
+        tasks_page, error_response, status_code = keyset_paginate(
+            tasks_query, Task, sort_by, order, cursor, per_page
+        )
+        if error_response:
+            return error_response, status_code
 
-    tasks_paginated = (
-        Task.query.filter_by(project_id=project_id)
-        .order_by(sort_column)
-        .paginate(page=page, per_page=per_page, error_out=False)
+        tasks_page["tasks"] = [
+            serialize_task(task, fields) for task in tasks_page.pop("items")
+        ]
+        return jsonify(tasks_page), 200
+
+    tasks_paginated = tasks_query.order_by(*sort_clauses(Task, sort_keys)).paginate(
+        page=page, per_page=per_page, error_out=False
     )
 
     return (
@@ -43,24 +129,60 @@ def get_tasks(project_id):
                 "total": tasks_paginated.total,
                 "pages": tasks_paginated.pages,
                 "current_page": tasks_paginated.page,
-                "tasks": [serialize_task(task) for task in tasks_paginated.items],
+                "tasks": [
+                    serialize_task(task, fields) for task in tasks_paginated.items
+                ],
             }
         ),
         200,
     )
 
 
+# full-text search over the project's task names and descriptions
+@task_bp.route("/search", methods=["GET"])
+def search_project_tasks(project_id):
+    text = request.args.get("q", "").strip()
+    page = request.args.get("page", 1, type=int)
+    per_page = request.args.get("per_page", 10, type=int)
+
+    if not text:
+        return jsonify({"error": "q is required"}), 400
+    if per_page < 1:
+        return jsonify({"error": "per_page must be positive"}), 400
+
+    return jsonify(search_tasks_page(text, project_id, page, per_page)), 200
+
+
 # get a task by id
 @task_bp.route("/<int:task_id>", methods=["GET"])
+@conditional(lambda project_id, task_id: task_validators(task_id))
+@response_cache.cached(
+    lambda project_id, **_: [
+        "tasks",
+        "users",
+        f"project:{project_id}",
+        f"project:{project_id}:tasks",
+    ]
+)
 def get_task_by_id(project_id, task_id):
+    try:
+        fields = parse_fields(request.args, Task)
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
+    if fields is None:
+        options = get_query_options("task_detail")
+    else:
+        options = sparse_query_options(Task, fields)
+
     task, error_response, status_code = get_instance_or_404(
-        Task, task_id, "id", label="Task"
+        Task, task_id, "id", label="Task", options=options
     )
     if error_response:
         return error_response, status_code
 
     return (
-        jsonify(serialize_task(task)),
+        jsonify(serialize_task(task, fields)),
         200,
     )
 
@@ -108,14 +230,19 @@ def create_task(project_id):
         task.users.extend(users)
 
     db.session.add(task)
+    db.session.flush()
+    adjust_project_counters(project.id, task.status, 1)
     db.session.commit()
-    db.session.refresh(task)
+    response_cache.invalidate(f"project:{project.id}:tasks")
+    task = apply_query_profile(Task.query, "task_detail").filter_by(id=task.id).one()
+    task_data = serialize_task(task)
+    events.publish(project.id, "task.created", task_data)
 
     return (
         jsonify(
             {
                 "message": "Task created successfully",
-                "task": serialize_task(task),
+                "task": task_data,
             }
         ),
         200,
@@ -132,6 +259,8 @@ def update_task(project_id, task_id):
         return error_response, status_code
 
     data = request.get_json()
+    previous_project_id = task.project_id
+    previous_status = task.status
     task.name = data.get("name", task.name)
     task.description = data.get("description", task.description)
     task.status = data.get("status", task.status)
@@ -145,32 +274,105 @@ def update_task(project_id, task_id):
         except ValueError:
             due_date = datetime.fromisoformat(data.get("due_date"))
 
+    # set-based diff against user_tasks, without loading task.users
     if data.get("user_ids"):
-        new_users = User.query.filter(User.id.in_(data.get("user_ids"))).all()
-        new_user_ids = {user.id for user in new_users}
-        existing_user_ids = {user.id for user in task.users}
-
-        # Remove users no longer in new_user_ids
-        task.users = [user for user in task.users if user.id in new_user_ids]
+        db.session.flush()
+        replace_task_users(task.id, data.get("user_ids"))
 
-        # Add users that are new
-        users_to_add = [user for user in new_users if user.id not in existing_user_ids]
-        task.users.extend(users_to_add)
+    task_project_id = task.project_id
+    if task_project_id != previous_project_id or task.status != previous_status:
+        db.session.flush()
+        adjust_project_counters(previous_project_id, previous_status, -1)
+        adjust_project_counters(task_project_id, task.status, 1)
 
     db.session.commit()
-    db.session.refresh(task)
+    response_cache.invalidate(
+        f"project:{previous_project_id}:tasks", f"project:{task_project_id}:tasks"
+    )
+    task = apply_query_profile(Task.query, "task_detail").filter_by(id=task_id).one()
+    task_data = serialize_task(task)
+    # a task moved to another project leaves the old project's board
+    if task_project_id != previous_project_id:
+        events.publish(previous_project_id, "task.deleted", {"id": task_id})
+    events.publish(task_project_id, "task.updated", task_data)
 
     return (
         jsonify(
             {
                 "message": "Task updated successfully",
-                "task": serialize_task(task),
+                "task": task_data,
             }
         ),
         200,
     )
 
 
+# assign a user to a task
+@task_bp.route("/<int:task_id>/users/<int:user_id>", methods=["POST"])
+def add_task_user(project_id, task_id, user_id):
+    task, error_response, status_code = get_instance_or_404(
+        Task, task_id, "id", label="Task"
+    )
+    if error_response:
+        return error_response, status_code
+
+    user, error_response, status_code = get_instance_or_404(
+        User, user_id, "id", label="User"
+    )
+    if error_response:
+        return error_response, status_code
+
+    added = add_task_users(task_id, [user_id])
+    db.session.commit()
+    if added:
+        response_cache.invalidate(f"project:{task.project_id}:tasks")
+        events.publish(
+            task.project_id,
+            "task.user_added",
+            {"task_id": task_id, "user_id": user_id, "user_name": user.name},
+        )
+
+    return (
+        jsonify(
+            {
+                "message": (
+                    "User assigned to task successfully"
+                    if added
+                    else "User is already assigned to task"
+                ),
+                "task_id": task_id,
+                "user_id": user_id,
+            }
+        ),
+        201 if added else 200,
+    )
+
+
+# unassign a user from a task
+@task_bp.route("/<int:task_id>/users/<int:user_id>", methods=["DELETE"])
+def remove_task_user(project_id, task_id, user_id):
+    task, error_response, status_code = get_instance_or_404(
+        Task, task_id, "id", label="Task"
+    )
+    if error_response:
+        return error_response, status_code
+
+    task_project_id = task.project_id
+    removed = remove_task_users(task_id, [user_id])
+    db.session.commit()
+    if not removed:
+        return (
+            jsonify({"error": f"User {user_id} is not assigned to task {task_id}"}),
+            404,
+        )
+    response_cache.invalidate(f"project:{task_project_id}:tasks")
+    events.publish(
+        task_project_id, "task.user_removed", {"task_id": task_id, "user_id": user_id}
+    )
+
+    return jsonify({"message": "User unassigned from task successfully"})
+
+
 # delete a task by id
 @task_bp.route("/<int:task_id>", methods=["DELETE"])
 def delete_task(project_id, task_id):
@@ -180,13 +382,54 @@ def delete_task(project_id, task_id):
     if error_response:
         return error_response, status_code
 
+    task_project_id = task.project_id
+    task_status = task.status
     db.session.delete(task)
+    db.session.flush()
+    adjust_project_counters(task_project_id, task_status, -1)
+    record_deletes("task", [task_id], task_project_id)
     db.session.commit()
+    response_cache.invalidate(f"project:{task_project_id}:tasks")
+    events.publish(task_project_id, "task.deleted", {"id": task_id})
 
     return jsonify({"message": "Task deleted successfully"})
 
 
-# download all tasks by project id
+# create, update and delete many tasks of a project in one transaction
+@task_bp.route("/batch", methods=["POST"])
+def batch_tasks(project_id):
+    project, error_response, status_code = get_instance_or_404(
+        Project, project_id, "id", label="Project"
+    )
+    if error_response:
+        return error_response, status_code
+
+    data = request.get_json()
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+
+    results, error_response, status_code = apply_task_batch(project_id, data)
+    if error_response:
+        return error_response, status_code
+    response_cache.invalidate(f"project:{project_id}:tasks")
+
+    # return the created/updated tasks, loaded in one query
+    touched_ids = [result["id"] for result in results if result["status"] != "deleted"]
+    tasks = {
+        task.id: task
+        for task in apply_query_profile(Task.query, "task_list").filter(
+            Task.id.in_(touched_ids)
+        )
+    }
+    for result in results:
+        if result["id"] in tasks:
+            result["task"] = serialize_task(tasks[result["id"]])
+    events.publish(project_id, "tasks.batch", {"results": results})
+
+    return jsonify({"message": "Batch applied successfully", "results": results}), 200
+
+
+# download all tasks by project id - streamed as xlsx (default) or csv
 @task_bp.route("/download", methods=["GET"])
 def download_file(project_id):
     # check if project exists
@@ -196,25 +439,49 @@ def download_file(project_id):
     if error_response:
         return error_response, status_code
 
-    tasks = Task.query.filter_by(project_id=project_id)
-    serialized_tasks = [serialize_task_for_export(task) for task in tasks]
+    export_format = request.args.get("format", "xlsx").lower()
+    if export_format not in ["xlsx", "csv"]:
+        return jsonify({"error": "Invalid format, use xlsx or csv"}), 400
 
-    if len(serialized_tasks) < 1:
+    if not db.session.query(Task.id).filter_by(project_id=project_id).first():
         return jsonify({"message": "No tasks to download/export"})
 
-    output = export_tasks(serialized_tasks)
+    # run the export in the background and let the client poll /api/jobs/<id>
+    if request.args.get("async", "false").lower() == "true":
+        if not jobs.enabled:
+            return jsonify({"error": ASYNC_DISABLED_ERROR}), 400
+        job = jobs.enqueue(
+            "export", export_project_tasks, project_id, export_format=export_format
+        )
+        return jsonify(serialize_job(job)), 202
+
+    # fetch tasks chunk by chunk through a server-side cursor
+    chunk_size = current_app.config["EXPORT_CHUNK_SIZE"]
+    serialized_tasks = iter_project_tasks(project, chunk_size)
+    download_name = export_file_name(project, export_format)
+
+    if export_format == "csv":
+        return Response(
+            stream_with_context(stream_tasks_csv(serialized_tasks, chunk_size)),
+            mimetype=EXPORT_MIMETYPES["csv"],
+            headers={"Content-Disposition": content_disposition(download_name)},
+        )
 
-    project_name = "-".join(Project.query.get(project_id).name.lower().split(" "))
+    # xlsx is a zip archive, so it is spooled to a temporary file and then
+    # streamed from disk instead of being built in memory
+    output = tempfile.TemporaryFile()
+    write_tasks_xlsx(serialized_tasks, output)
+    output.seek(0)
 
     return send_file(
         output,
-        mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        mimetype=EXPORT_MIMETYPES["xlsx"],
         as_attachment=True,
-        download_name=f"{project_name}-tasks.xlsx",
+        download_name=download_name,
     )
 
 
-# import tasks from excel file
+# import tasks from an excel (.xlsx, .xls) or csv file
 @task_bp.route("/upload", methods=["POST"])
 def import_task_from_excel(project_id):
     # check if project exists
@@ -227,10 +494,32 @@ def import_task_from_excel(project_id):
     if "file" not in request.files:
         return jsonify({"error": "No file uploaded"}), 400
 
+    if len(request.files.getlist("file")) > 1:
+        return jsonify({"error": "Only one file is allowed"}), 400
+
     file = request.files["file"]
-    validate_uploaded_file(file)
+    error_response, status_code = validate_uploaded_file(file)
+    if error_response:
+        return error_response, status_code
+
+    # process the file in the background and let the client poll /api/jobs/<id>
+    if request.args.get("async", "false").lower() == "true":
+        if not jobs.enabled:
+            return jsonify({"error": ASYNC_DISABLED_ERROR}), 400
+        # the request's file stream is gone once the response is sent
+        suffix = os.path.splitext(file.filename)[1]
+        with tempfile.NamedTemporaryFile(
+            dir=current_app.config["JOB_RESULT_DIR"], suffix=suffix, delete=False
+        ) as upload:
+            file.save(upload)
+        job = jobs.enqueue("import", process_excel_file, upload.name, project_id)
+        return jsonify(serialize_job(job)), 202
 
     # process excel file
-    task_upload_summary = process_excel_data(file, project_id)
+    task_upload_summary, error_response, status_code = process_excel_data(
+        file, project_id
+    )
+    if error_response:
+        return error_response, status_code
 
     return jsonify({"task_upload_summary": task_upload_summary}), 200
@@ -1,14 +1,34 @@
 from flask import Blueprint, request, jsonify
-from app.models import User
-from app.utils.db_helpers import get_instance_or_404
-from app.serializers import serialize_user
+from app.models import Task, User
+from app.models.task import user_task
+from app.utils.db_helpers import get_instance_or_404, get_name_conflict
+from app.utils.pagination import keyset_paginate
+from app.utils.conditional import (
+    conditional,
+    instance_validators,
+    listing_validators,
+)
+from app.serializers import serialize_task, serialize_user
+from app.utils.batch_tasks import parse_due_date, parse_status
+from app.utils.sync import record_deletes
+from app.utils.query_options import (
+    apply_query_profile,
+    parse_fields,
+    sparse_query_options,
+)
 from app import db
+from app.extensions import name_cache, response_cache
 
 user_bp = Blueprint("user_bp", __name__)
 
+USER_SORT_FIELDS = ["name", "created_at", "updated_at"]
+INBOX_SORT_FIELDS = ["due_date", "name", "created_at", "updated_at"]
+
 
 # get all users - paginated and sorted
 @user_bp.route("/", methods=["GET"])
+@conditional(lambda: listing_validators(User, USER_SORT_FIELDS))
+@response_cache.cached(lambda: ["users"])
 def get_users():
     # query params for pagination and sorting
     page = request.args.get("page", 1, type=int)
@@ -17,8 +37,31 @@ def get_users():
     order = request.args.get("order", "desc")
 
     # validate sort_by argument value
-    if sort_by not in ["name", "created_at", "updated_at"]:
+    if sort_by not in USER_SORT_FIELDS:
         return jsonify({"error": "Invalid sort_by field"}), 400
+
+    # sparse fieldset - fields=id,name selects only those columns
+    try:
+        fields = parse_fields(request.args, User)
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
+    users_query = User.query.options(*sparse_query_options(User, fields, sort_by))
+
+    # keyset (cursor) pagination - opt in by passing cursor (empty for first page)
+    cursor = request.args.get("cursor")
+    if cursor is not None:
+        users_page, error_response, status_code = keyset_paginate(
+            users_query, User, sort_by, order, cursor, per_page
+        )
+        if error_response:
+            return error_response, status_code
+
+        users_page["users"] = [
+            serialize_user(user, fields) for user in users_page.pop("items")
+        ]
+        return jsonify(users_page), 200
+
     sort_column = getattr(User, sort_by)
     # sorting order - descending or ascending
     if order == "asc":
@@ -26,7 +69,7 @@ def get_users():
     else:
         sort_column = sort_column.desc()
 
-    user_paginated = User.query.order_by(sort_column).paginate(
+    user_paginated = users_query.order_by(sort_column).paginate(
         page=page, per_page=per_page, error_out=False
     )
 
@@ -36,7 +79,9 @@ def get_users():
                 "total": user_paginated.total,
                 "pages": user_paginated.pages,
                 "current_page": user_paginated.page,
-                "users": [serialize_user(user) for user in user_paginated.items],
+                "users": [
+                    serialize_user(user, fields) for user in user_paginated.items
+                ],
             }
         ),
         200,
@@ -45,18 +90,87 @@ def get_users():
 
 # get a user by id
 @user_bp.route("/<int:user_id>", methods=["GET"])
+@conditional(lambda user_id: instance_validators(User, user_id))
+@response_cache.cached(lambda user_id: ["users"])
 def get_user_by_id(user_id):
+    try:
+        fields = parse_fields(request.args, User)
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
     user, error_response, status_code = get_instance_or_404(
-        User, user_id, "id", label="User"
+        User,
+        user_id,
+        "id",
+        label="User",
+        options=sparse_query_options(User, fields),
     )
     if error_response:
         return error_response, status_code
     return (
-        jsonify(serialize_user(user)),
+        jsonify(serialize_user(user, fields)),
         200,
     )
 
 
+# get the tasks assigned to a user across projects - keyset paginated
+@user_bp.route("/<int:user_id>/tasks", methods=["GET"])
+def get_user_tasks(user_id):
+    user, error_response, status_code = get_instance_or_404(
+        User, user_id, "id", label="User"
+    )
+    if error_response:
+        return error_response, status_code
+
+    per_page = request.args.get("per_page", 20, type=int)
+    sort_by = request.args.get("sort_by", "due_date")
+    order = request.args.get("order", "asc")
+    cursor = request.args.get("cursor", "")
+
+    # validate sort_by argument value
+    if sort_by not in INBOX_SORT_FIELDS:
+        return jsonify({"error": "Invalid sort_by field"}), 400
+
+    # driven by user_tasks' (user_id, task_id) primary key, then task by id
+    tasks_query = (
+        apply_query_profile(Task.query, "user_inbox")
+        .join(user_task, user_task.c.task_id == Task.id)
+        .filter(user_task.c.user_id == user_id)
+    )
+
+    # filters - status=Not Started,IN_PROGRESS&due_after=...&due_before=...
+    if request.args.get("status"):
+        try:
+            statuses = [
+                parse_status(status.strip())
+                for status in request.args["status"].split(",")
+            ]
+        except ValueError:
+            return jsonify({"error": "Invalid status filter"}), 400
+        tasks_query = tasks_query.filter(Task.status.in_(statuses))
+
+    try:
+        if request.args.get("due_after"):
+            tasks_query = tasks_query.filter(
+                Task.due_date >= parse_due_date(request.args["due_after"])
+            )
+        if request.args.get("due_before"):
+            tasks_query = tasks_query.filter(
+                Task.due_date < parse_due_date(request.args["due_before"])
+            )
+    except ValueError:
+        return jsonify({"error": "Invalid due_after/due_before value"}), 400
+
+    tasks_page, error_response, status_code = keyset_paginate(
+        tasks_query, Task, sort_by, order, cursor, per_page
+    )
+    if error_response:
+        return error_response, status_code
+
+    tasks_page["tasks"] = [serialize_task(task) for task in tasks_page.pop("items")]
+    return jsonify(tasks_page), 200
+
+
 # create a user
 @user_bp.route("/", methods=["POST"])
 def create_user():
@@ -67,11 +181,16 @@ def create_user():
     if not name:
         return jsonify({"error": "User Name is required"}), 400
 
+    error_response, status_code = get_name_conflict(User, name)
+    if error_response:
+        return error_response, status_code
+
     user = User(name=name)
 
     db.session.add(user)
     db.session.commit()
     db.session.refresh(user)
+    response_cache.invalidate("users")
 
     return (
         jsonify(
@@ -94,10 +213,20 @@ def update_user(user_id):
         return error_response, status_code
 
     data = request.get_json()
+    previous_name_key = user.name_key
+    if data.get("name"):
+        error_response, status_code = get_name_conflict(
+            User, data["name"], exclude_id=user_id
+        )
+        if error_response:
+            return error_response, status_code
     user.name = data.get("name", user.name)
 
     db.session.commit()
+    name_cache.invalidate(User, previous_name_key)
     db.session.refresh(user)
+    # task responses carry user names as well
+    response_cache.invalidate("users")
 
     return (
         jsonify(
@@ -119,7 +248,12 @@ def delete_user(user_id):
     if error_response:
         return error_response, status_code
 
+    name_key = user.name_key
     db.session.delete(user)
+    record_deletes("user", [user_id])
     db.session.commit()
+    name_cache.invalidate(User, name_key)
+    # its task assignments are gone through the cascade
+    response_cache.invalidate("users")
 
     return jsonify({"message": "User deleted successfully"})
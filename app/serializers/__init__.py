@@ -1,3 +1,4 @@
 from app.serializers.task_serializers import serialize_task, serialize_task_for_export
 from app.serializers.project_serializer import serialize_project
 from app.serializers.user_serializer import serialize_user
+from app.serializers.job_serializer import serialize_job
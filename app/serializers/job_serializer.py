@@ -0,0 +1,21 @@
+from flask import url_for
+
+
+def serialize_job(job):
+    # export results are files, served by the job result endpoint
+    result = job["result"]
+    if job["status"] == "finished" and job["kind"] == "export":
+        result = url_for("job_bp.get_job_result", job_id=job["id"])
+
+    return {
+        "id": job["id"],
+        "kind": job["kind"],
+        "status": job["status"],
+        "rows_processed": job["rows_processed"],
+        "total_rows": job["total_rows"],
+        "result": result,
+        "error": job["error"],
+        "status_url": url_for("job_bp.get_job", job_id=job["id"]),
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+    }
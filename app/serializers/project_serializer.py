@@ -1,4 +1,16 @@
-def serialize_project(project):
+# per-field getters for sparse fieldsets (?fields=...)
+PROJECT_FIELDS = {
+    "id": lambda project: project.id,
+    "name": lambda project: project.name,
+    "created_at": lambda project: project.created_at,
+    "updated_at": lambda project: project.updated_at,
+}
+
+
+def serialize_project(project, fields=None):
+    if fields is not None:
+        return {field: PROJECT_FIELDS[field](project) for field in fields}
+
     return {
         "id": project.id,
         "name": project.name,
@@ -1,7 +1,25 @@
-from app.models import User, Project
+# per-field getters for sparse fieldsets (?fields=...) - only the requested
+# attributes are read, so unrequested relationships are never loaded
+TASK_FIELDS = {
+    "id": lambda task: task.id,
+    "name": lambda task: task.name,
+    "description": lambda task: task.description,
+    "status": lambda task: task.status.value,
+    "due_date": lambda task: task.due_date,
+    "project_id": lambda task: task.project_id,
+    "project": lambda task: {"id": task.project_id, "name": task.project.name},
+    "users": lambda task: [
+        {"user_id": user.id, "user_name": user.name} for user in task.users
+    ],
+    "created_at": lambda task: task.created_at,
+    "updated_at": lambda task: task.updated_at,
+}
 
 
-def serialize_task(task):
+def serialize_task(task, fields=None):
+    if fields is not None:
+        return {field: TASK_FIELDS[field](task) for field in fields}
+
     return {
         "id": task.id,
         "name": task.name,
@@ -15,15 +33,18 @@ def serialize_task(task):
     }
 
 
-def serialize_task_for_export(task):
+def serialize_task_for_export(task, project=None):
+    # pass the project when exporting a whole project, so it is not looked up
+    # per task; task.users should be eager loaded by the caller
+    project = project or task.project
     return {
         "id": task.id,
         "name": task.name,
         "description": task.description,
         "status": task.status.value,
         "due_date": task.due_date.strftime("%Y-%m-%d %H:%M:%S"),
-        "project": Project.query.get(task.project_id).name,
-        "users": [User.query.get(user.id).name for user in task.users],
+        "project": project.name,
+        "users": [user.name for user in task.users],
         "created_at": task.created_at.strftime("%Y-%m-%d %H:%M:%S"),
         "updated_at": task.updated_at.strftime("%Y-%m-%d %H:%M:%S"),
     }
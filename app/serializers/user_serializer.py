@@ -1,4 +1,16 @@
-def serialize_user(user):
+# per-field getters for sparse fieldsets (?fields=...)
+USER_FIELDS = {
+    "id": lambda user: user.id,
+    "name": lambda user: user.name,
+    "created_at": lambda user: user.created_at,
+    "updated_at": lambda user: user.updated_at,
+}
+
+
+def serialize_user(user, fields=None):
+    if fields is not None:
+        return {field: USER_FIELDS[field](user) for field in fields}
+
     return {
         "id": user.id,
         "name": user.name,
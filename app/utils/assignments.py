@@ -0,0 +1,83 @@
+from sqlalchemy import and_, delete, exists, literal, select, update
+from datetime import datetime
+from app import db
+from app.models import Task, User
+from app.models.task import user_task
+
+
+def _touch_task(task_id):
+    # assignment changes do not go through the ORM, so bump updated_at here to
+    # keep ETags and change feeds correct
+    db.session.execute(
+        update(Task)
+        .where(Task.id == task_id)
+        .values(updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+
+
+def add_task_users(task_id, user_ids, touch=True):
+    """
+    Assign users to a task with one INSERT ... SELECT, skipping unknown users
+    and users already assigned.
+
+    :return: number of assignments added
+    """
+
+    if not user_ids:
+        return 0
+
+    already_assigned = exists().where(
+        and_(user_task.c.task_id == task_id, user_task.c.user_id == User.id)
+    )
+    result = db.session.execute(
+        user_task.insert().from_select(
+            ["user_id", "task_id"],
+            select(User.id, literal(task_id)).where(
+                User.id.in_(user_ids), ~already_assigned
+            ),
+        )
+    )
+    if touch and result.rowcount:
+        _touch_task(task_id)
+    return result.rowcount
+
+
+def remove_task_users(task_id, user_ids, touch=True):
+    """
+    Unassign users from a task with one DELETE.
+
+    :return: number of assignments removed
+    """
+
+    if not user_ids:
+        return 0
+
+    result = db.session.execute(
+        delete(user_task).where(
+            user_task.c.task_id == task_id, user_task.c.user_id.in_(user_ids)
+        )
+    )
+    if touch and result.rowcount:
+        _touch_task(task_id)
+    return result.rowcount
+
+
+def replace_task_users(task_id, user_ids):
+    """
+    Make user_ids the exact assignee set of a task: one DELETE for the users
+    no longer listed and one INSERT ... SELECT for the new ones, regardless of
+    how many users the task has.
+
+    :return: (number removed, number added)
+    """
+
+    removed = db.session.execute(
+        delete(user_task).where(
+            user_task.c.task_id == task_id, user_task.c.user_id.not_in(user_ids)
+        )
+    ).rowcount
+    added = add_task_users(task_id, user_ids, touch=False)
+    if removed or added:
+        _touch_task(task_id)
+    return removed, added
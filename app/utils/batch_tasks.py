@@ -0,0 +1,295 @@
+from flask import current_app, jsonify
+from sqlalchemy import delete, update
+from datetime import datetime
+from app import db
+from app.models import Task, User
+from app.models.task import StatusEnum, user_task
+from app.utils.db_helpers import bulk_insert
+from app.utils.project_stats import refresh_project_counters
+from app.utils.sync import record_deletes
+
+UPDATABLE_FIELDS = ["name", "description", "status", "due_date"]
+
+
+def parse_due_date(value):
+    """Parse an HTTP date ("Wed, 01 Jan 2025 00:00:00 GMT") or an ISO 8601 date."""
+    try:
+        return datetime.strptime(value, "%a, %d %b %Y %H:%M:%S %Z")
+    except ValueError:
+        return datetime.fromisoformat(value)
+
+
+def parse_status(value):
+    """Accept a StatusEnum name ("IN_PROGRESS") or value ("In Progress")."""
+    if not isinstance(value, str):
+        raise ValueError(f"Invalid status: {value}")
+    if value in StatusEnum.__members__:
+        return StatusEnum[value]
+    return StatusEnum(value)
+
+
+def _is_id(value):
+    # JSON true/false arrive as bools, which isinstance(value, int) accepts
+    return type(value) is int
+
+
+def _validate_fields(item, required):
+    # returns (column values, error message)
+    values = {}
+
+    for field in required:
+        if not item.get(field):
+            return None, f"{field} is required"
+
+    if "name" in item:
+        if not isinstance(item["name"], str):
+            return None, "name must be a string"
+        if not item["name"]:
+            return None, "name can not be empty"
+        if len(item["name"]) > Task.name.type.length:
+            return None, f"name can be at most {Task.name.type.length} characters"
+        values["name"] = item["name"]
+
+    if "description" in item:
+        if item["description"] is not None and not isinstance(item["description"], str):
+            return None, "description must be a string"
+        if len(item["description"] or "") > Task.description.type.length:
+            return (
+                None,
+                f"description can be at most {Task.description.type.length} characters",
+            )
+        values["description"] = item["description"]
+
+    if "status" in item:
+        try:
+            values["status"] = parse_status(item["status"])
+        except ValueError:
+            return None, f"Invalid status: {item['status']}"
+
+    if "due_date" in item:
+        try:
+            values["due_date"] = parse_due_date(item["due_date"])
+        except (ValueError, TypeError):
+            return None, f"Invalid due_date: {item['due_date']}"
+
+    if "user_ids" in item:
+        if not isinstance(item["user_ids"], list):
+            return None, "user_ids must be a list"
+        if not all(_is_id(user_id) for user_id in item["user_ids"]):
+            return None, "user_ids must be integers"
+        values["user_ids"] = sorted(set(item["user_ids"]))
+
+    return values, None
+
+
+def validate_task_batch(project_id, data):
+    """
+    Validate a batch payload without writing anything.
+
+    :return: (creates, updates, delete_ids, errors) - errors is a list of
+        per-item results, empty when the batch is valid
+    """
+
+    creates = data.get("create") or []
+    updates = data.get("update") or []
+    delete_ids = data.get("delete") or []
+    errors = []
+
+    if not all(isinstance(items, list) for items in (creates, updates, delete_ids)):
+        return [], [], [], [{"error": "create, update and delete must be lists"}]
+
+    max_items = current_app.config["TASK_BATCH_MAX_ITEMS"]
+    if len(creates) + len(updates) + len(delete_ids) > max_items:
+        return [], [], [], [{"error": f"A batch can hold at most {max_items} items"}]
+
+    parsed_creates = []
+    for index, item in enumerate(creates):
+        values, error = (
+            _validate_fields(item, ["name", "due_date"])
+            if isinstance(item, dict)
+            else (None, "item must be an object")
+        )
+        if error:
+            errors.append({"op": "create", "index": index, "error": error})
+            continue
+        values.setdefault("status", StatusEnum.NOT_STARTED)
+        parsed_creates.append((index, values))
+
+    parsed_updates = []
+    for index, item in enumerate(updates):
+        if not isinstance(item, dict) or not _is_id(item.get("id")):
+            errors.append({"op": "update", "index": index, "error": "id is required"})
+            continue
+        values, error = _validate_fields(item, [])
+        if error:
+            errors.append(
+                {"op": "update", "index": index, "id": item["id"], "error": error}
+            )
+            continue
+        parsed_updates.append((index, item["id"], values))
+
+    parsed_deletes = []
+    for index, task_id in enumerate(delete_ids):
+        if not _is_id(task_id):
+            errors.append(
+                {"op": "delete", "index": index, "error": "id must be an integer"}
+            )
+            continue
+        parsed_deletes.append((index, task_id))
+
+    # every referenced task must belong to the project, once
+    referenced = [task_id for _, task_id, _ in parsed_updates] + [
+        task_id for _, task_id in parsed_deletes
+    ]
+    existing = {
+        task_id
+        for (task_id,) in db.session.query(Task.id).filter(
+            Task.project_id == project_id, Task.id.in_(referenced)
+        )
+    }
+    seen = set()
+    for op, index, task_id in [
+        ("update", index, task_id) for index, task_id, _ in parsed_updates
+    ] + [("delete", index, task_id) for index, task_id in parsed_deletes]:
+        if task_id not in existing:
+            error = f"Task not found with id {task_id}"
+        elif task_id in seen:
+            error = f"Task {task_id} appears more than once in the batch"
+        else:
+            seen.add(task_id)
+            continue
+        errors.append({"op": op, "index": index, "id": task_id, "error": error})
+
+    # every referenced user must exist - one query for the whole batch
+    referenced_users = {
+        user_id
+        for values in [values for _, values in parsed_creates]
+        + [values for _, _, values in parsed_updates]
+        for user_id in values.get("user_ids", [])
+    }
+    existing_users = {
+        user_id
+        for (user_id,) in db.session.query(User.id).filter(
+            User.id.in_(referenced_users)
+        )
+    }
+    missing_users = referenced_users - existing_users
+    if missing_users:
+        for op, index, values in [
+            ("create", index, values) for index, values in parsed_creates
+        ] + [("update", index, values) for index, _, values in parsed_updates]:
+            missing = sorted(missing_users.intersection(values.get("user_ids", [])))
+            if missing:
+                errors.append(
+                    {"op": op, "index": index, "error": f"Users not found: {missing}"}
+                )
+
+    return parsed_creates, parsed_updates, parsed_deletes, errors
+
+
+def apply_task_batch(project_id, data):
+    """
+    Validate and apply a batch of task creates, partial updates and deletes in
+    one transaction.
+
+    :param project_id: Project every task of the batch belongs to
+    :param data: {"create": [...], "update": [{"id": ..., ...}], "delete": [ids]}
+    :return: (results or None, error_response or None, status_code or None)
+    """
+
+    creates, updates, deletes, errors = validate_task_batch(project_id, data)
+    if errors:
+        return (
+            None,
+            jsonify({"error": "Batch validation failed", "results": errors}),
+            400,
+        )
+
+    now = datetime.utcnow()
+    results = []
+    try:
+        # creates - one INSERT for all of them, returning the ids
+        created_ids = bulk_insert(
+            Task,
+            [
+                {
+                    "name": values["name"],
+                    "description": values.get("description"),
+                    "status": values["status"],
+                    "due_date": values["due_date"],
+                    "project_id": project_id,
+                }
+                for _, values in creates
+            ],
+        )
+
+        # updates - one executemany UPDATE per distinct set of columns
+        update_rows = [
+            dict(
+                {field: values[field] for field in UPDATABLE_FIELDS if field in values},
+                id=task_id,
+                updated_at=now,
+            )
+            for _, task_id, values in updates
+        ]
+        if update_rows:
+            db.session.execute(update(Task), update_rows)
+
+        # user reassignment - replace the assignee set of every listed task
+        replaced = [
+            (task_id, values["user_ids"])
+            for _, task_id, values in updates
+            if "user_ids" in values
+        ]
+        if replaced:
+            db.session.execute(
+                delete(user_task).where(
+                    user_task.c.task_id.in_([task_id for task_id, _ in replaced])
+                )
+            )
+        assignments = [
+            {"user_id": user_id, "task_id": task_id}
+            for task_id, (_, values) in zip(created_ids, creates)
+            for user_id in values.get("user_ids", [])
+        ] + [
+            {"user_id": user_id, "task_id": task_id}
+            for task_id, user_ids in replaced
+            for user_id in user_ids
+        ]
+        if assignments:
+            db.session.execute(user_task.insert(), assignments)
+
+        # deletes - association rows first, so this does not rely on FK cascades
+        delete_ids = [task_id for _, task_id in deletes]
+        if delete_ids:
+            db.session.execute(
+                delete(user_task).where(user_task.c.task_id.in_(delete_ids))
+            )
+            db.session.execute(
+                delete(Task)
+                .where(Task.id.in_(delete_ids))
+                .execution_options(synchronize_session=False)
+            )
+            record_deletes("task", delete_ids, project_id)
+
+        refresh_project_counters(project_id)
+        db.session.commit()
+    except Exception as err:
+        db.session.rollback()
+        current_app.logger.exception("Task batch failed")
+        return None, jsonify({"error": f"Batch failed: {err}"}), 500
+
+    results.extend(
+        {"op": "create", "index": index, "id": task_id, "status": "created"}
+        for task_id, (index, _) in zip(created_ids, creates)
+    )
+    results.extend(
+        {"op": "update", "index": index, "id": task_id, "status": "updated"}
+        for index, task_id, _ in updates
+    )
+    results.extend(
+        {"op": "delete", "index": index, "id": task_id, "status": "deleted"}
+        for index, task_id in deletes
+    )
+
+    return results, None, None
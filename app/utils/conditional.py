@@ -0,0 +1,232 @@
+from flask import current_app, g, make_response, request
+from sqlalchemy import func, select
+from datetime import timezone
+from functools import wraps
+from app import db
+from app.models import Project, Task, Tombstone, User
+from app.models.task import user_task
+from app.utils.pagination import parse_sort, sort_clauses
+from app.utils.task_filters import parse_task_filters
+import hashlib
+
+
+def make_etag(*parts):
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def _not_modified(etag, last_modified):
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2)
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+
+    if request.if_modified_since and last_modified:
+        last_modified = last_modified.replace(microsecond=0, tzinfo=timezone.utc)
+        return last_modified <= request.if_modified_since
+
+    return False
+
+
+def _set_validators(response, etag, last_modified, weak):
+    response.set_etag(etag, weak=weak)
+    if last_modified:
+        response.last_modified = last_modified.replace(tzinfo=timezone.utc)
+    return response
+
+
+def conditional(validators):
+    """
+    Answer conditional GETs with 304 before the view serializes anything.
+
+    Goes outside response_cache.cached, which then keys its entries by the
+    ETag computed here.
+
+    :param validators: callable receiving the view arguments and returning
+        (etag, last_modified, weak), or None to skip conditional handling
+        (e.g. the resource does not exist - the view then answers 404)
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            result = validators(**kwargs) if request.method == "GET" else None
+            if result is None:
+                return view(*args, **kwargs)
+
+            etag, last_modified, weak = result
+            if _not_modified(etag, last_modified):
+                response = current_app.response_class(status=304)
+                return _set_validators(response, etag, last_modified, weak)
+
+            # the response cache keys entries by it, so a cached body is only
+            # served under the validator it was stored with
+            g.response_validator = etag
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                _set_validators(response, etag, last_modified, weak)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def _latest(*timestamps):
+    timestamps = [timestamp for timestamp in timestamps if timestamp]
+    return max(timestamps) if timestamps else None
+
+
+# single resources - strong validators from the row's own updated_at
+
+
+def instance_validators(model_class, object_id):
+    updated_at = db.session.execute(
+        select(model_class.updated_at).where(model_class.id == object_id)
+    ).first()
+    if updated_at is None:
+        return None
+
+    updated_at = updated_at[0]
+    etag = make_etag(model_class.__tablename__, object_id, updated_at)
+    return etag, updated_at, False
+
+
+def task_validators(task_id):
+    # a task response also carries its project name and assigned users, whose
+    # changes do not touch task.updated_at
+    row = (
+        db.session.query(
+            Task.updated_at,
+            Project.updated_at,
+            func.count(User.id),
+            func.sum(User.id),
+            func.max(User.updated_at),
+        )
+        .join(Project, Project.id == Task.project_id)
+        .outerjoin(user_task, user_task.c.task_id == Task.id)
+        .outerjoin(User, User.id == user_task.c.user_id)
+        .filter(Task.id == task_id)
+        .group_by(Task.id, Task.updated_at, Project.updated_at)
+        .first()
+    )
+    if row is None:
+        return None
+
+    etag = make_etag("task", task_id, *row)
+    return etag, _latest(row[0], row[1], row[4]), False
+
+
+# listings (page/per_page mode) - weak validators from aggregates over the
+# page's rows plus the filtered set's size and latest change (the body carries
+# total and pages too), so a poll costs a few index scans instead of
+# serialization. Deletes leave no updated_at behind, so Last-Modified also
+# takes the latest tombstone of the listed rows.
+
+
+def _page_rows(model_class, order_by, *filters):
+    page = request.args.get("page", 1, type=int)
+    per_page = request.args.get("per_page", 5, type=int)
+
+    # cursor mode and invalid arguments are left to the view
+    if "cursor" in request.args or per_page < 1:
+        return None
+
+    return (
+        db.session.query(
+            model_class.id.label("id"), model_class.updated_at.label("updated_at")
+        )
+        .filter(*filters)
+        .order_by(*order_by)
+        .limit(per_page)
+        .offset((max(page, 1) - 1) * per_page)
+        .subquery()
+    )
+
+
+def _page_aggregates(page_rows):
+    return (
+        func.count(page_rows.c.id),
+        func.sum(page_rows.c.id),
+        func.max(page_rows.c.updated_at),
+    )
+
+
+def _set_aggregates(model_class, *filters):
+    return (
+        select(func.count(model_class.id)).where(*filters).scalar_subquery(),
+        select(func.max(model_class.updated_at)).where(*filters).scalar_subquery(),
+    )
+
+
+def _last_deleted(entity, *filters):
+    return (
+        select(func.max(Tombstone.deleted_at))
+        .where(Tombstone.entity == entity, *filters)
+        .scalar_subquery()
+    )
+
+
+def listing_validators(model_class, sort_fields):
+    sort_by = request.args.get("sort_by", "updated_at")
+    order = request.args.get("order", "desc")
+    if sort_by not in sort_fields:
+        return None
+
+    sort_column = getattr(model_class, sort_by)
+    sort_column = sort_column.asc() if order == "asc" else sort_column.desc()
+
+    page_rows = _page_rows(model_class, [sort_column])
+    if page_rows is None:
+        return None
+
+    # page count, sum(id), max(updated_at), then total, max(updated_at) of
+    # every row and the latest delete
+    row = db.session.query(
+        *_page_aggregates(page_rows),
+        *_set_aggregates(model_class),
+        _last_deleted(model_class.__tablename__),
+    ).one()
+
+    etag = make_etag(
+        model_class.__tablename__, sorted(request.args.items(multi=True)), *row
+    )
+    return etag, _latest(row[4], row[5]), True
+
+
+def task_listing_validators(project_id, sort_fields):
+    # the same rows the view lists, so filters and sort keys count too
+    try:
+        order_by = sort_clauses(Task, parse_sort(request.args, sort_fields))
+        filters = parse_task_filters(request.args)
+    except ValueError:
+        return None
+
+    in_project = Task.project_id == project_id
+    page_rows = _page_rows(Task, order_by, in_project, *filters)
+    if page_rows is None:
+        return None
+
+    # page count, sum(id), max(updated_at); total and max(updated_at) of the
+    # filtered tasks; then what Last-Modified is taken from - every task of
+    # the project (a task filtered out by an update still changed the listing),
+    # its latest task delete and the project row
+    tasks = db.session.query(
+        *_page_aggregates(page_rows),
+        *_set_aggregates(Task, in_project, *filters),
+        select(func.max(Task.updated_at)).where(in_project).scalar_subquery(),
+        _last_deleted("task", Tombstone.project_id == project_id),
+        select(Project.updated_at).where(Project.id == project_id).scalar_subquery(),
+    ).one()
+    users = (
+        db.session.query(
+            func.count(User.id), func.sum(User.id), func.max(User.updated_at)
+        )
+        .select_from(page_rows)
+        .join(user_task, user_task.c.task_id == page_rows.c.id)
+        .join(User, User.id == user_task.c.user_id)
+        .one()
+    )
+
+    etag = make_etag(
+        "task", project_id, sorted(request.args.items(multi=True)), *tasks, *users
+    )
+    return etag, _latest(tasks[5], tasks[6], tasks[7], users[2]), True
@@ -1,7 +1,14 @@
 from flask import jsonify
+from sqlalchemy import insert, text
+from weakref import WeakKeyDictionary
+from app import db
+from app.models import normalize_name
 
+# engine -> whether a multi-row INSERT gets consecutive AUTO_INCREMENT ids
+_consecutive_ids = WeakKeyDictionary()
 
-def get_instance_or_404(model_class, object_id, id_field="id", label=None):
+
+def get_instance_or_404(model_class, object_id, id_field="id", label=None, options=()):
     """
     Generic function to fetch a model instance by its ID with a 404 response.
 
@@ -9,11 +16,14 @@ def get_instance_or_404(model_class, object_id, id_field="id", label=None):
     :param object_id: ID value to search by
     :param id_field: Field name to match against (default is "id")
     :param label: Human-readable name for error message (defaults to model name)
+    :param options: Loader options applied to the query (e.g., eager loads)
     :return: (instance or None, error_response or None, status_code or None)
     """
 
     model_field = getattr(model_class, id_field)
-    instance = model_class.query.filter(model_field == object_id).first()
+    instance = (
+        model_class.query.options(*options).filter(model_field == object_id).first()
+    )
 
     if not instance:
         model_name = label or model_class.__name__
@@ -24,3 +34,81 @@ def get_instance_or_404(model_class, object_id, id_field="id", label=None):
         )
 
     return instance, None, None
+
+
+def get_name_conflict(model_class, name, exclude_id=None, label=None):
+    """
+    Check that no other row uses a name once trimmed and case-folded - the
+    unique name_key index would reject it.
+
+    :param model_class: Project or User
+    :param name: Name about to be saved
+    :param exclude_id: id of the row being renamed
+    :param label: Human-readable name for error message (defaults to model name)
+    :return: (error_response or None, status_code or None)
+    """
+
+    query = model_class.query.filter(model_class.name_key == normalize_name(name))
+    if exclude_id is not None:
+        query = query.filter(model_class.id != exclude_id)
+
+    if db.session.query(query.exists()).scalar():
+        model_name = label or model_class.__name__
+        return jsonify({"error": f"{model_name} named {name!r} already exists"}), 409
+
+    return None, None
+
+
+def _has_consecutive_ids(engine):
+    # InnoDB hands out consecutive ids to a multi-row INSERT unless
+    # innodb_autoinc_lock_mode is 2 ("interleaved", MySQL 8's default)
+    if engine not in _consecutive_ids:
+        with engine.connect() as connection:
+            lock_mode = connection.execute(
+                text("SELECT @@innodb_autoinc_lock_mode")
+            ).scalar()
+        _consecutive_ids[engine] = int(lock_mode) < 2
+    return _consecutive_ids[engine]
+
+
+def bulk_insert(model_class, rows):
+    """
+    Insert rows with a constant number of statements and return their ids.
+
+    - SQLite: one multi-row INSERT. Writers are serialized and a new rowid is
+      max(rowid) + 1, so the rows get the ids up to the reported lastrowid.
+    - MySQL: one multi-row INSERT, ids counted up from LAST_INSERT_ID() (the
+      first row's id) - when InnoDB hands them out consecutively. With
+      innodb_autoinc_lock_mode=2 they may interleave with concurrent inserts,
+      so there every row is inserted on its own to read its id.
+    - MariaDB, PostgreSQL: one executemany with INSERT ... RETURNING, the ids
+      kept in row order through the AUTO_INCREMENT/SERIAL sentinel.
+
+    :param model_class: Model whose table gets the rows
+    :param rows: list of column -> value dicts (defaults are applied per row)
+    :return: list of ids, in the order of rows
+    """
+
+    if not rows:
+        return []
+
+    engine = db.session.get_bind()
+    dialect = engine.dialect
+
+    if dialect.name == "sqlite":
+        last_id = db.session.execute(insert(model_class).values(rows)).lastrowid
+        return list(range(last_id - len(rows) + 1, last_id + 1))
+
+    if dialect.name == "mysql" and not dialect.is_mariadb:
+        if _has_consecutive_ids(engine):
+            first_id = db.session.execute(insert(model_class).values(rows)).lastrowid
+            return list(range(first_id, first_id + len(rows)))
+        return [
+            db.session.execute(insert(model_class).values(row)).lastrowid
+            for row in rows
+        ]
+
+    statement = insert(model_class).returning(
+        model_class.id, sort_by_parameter_order=True
+    )
+    return list(db.session.scalars(statement, rows))
@@ -1,16 +1,181 @@
-from io import BytesIO
-import pandas as pd
+from flask import current_app
+from io import BytesIO, StringIO
+from app.models import Project, Task
+from app import db
+from app.serializers import serialize_task_for_export
+from app.utils.query_options import apply_query_profile
+from urllib.parse import quote
+from werkzeug.http import dump_options_header
+import csv
+import os
+import unicodedata
 
+EXPORT_COLUMNS = [
+    "id",
+    "name",
+    "description",
+    "status",
+    "due_date",
+    "project",
+    "users",
+    "created_at",
+    "updated_at",
+]
 
-def export_tasks(tasks):
-    # convert data to DataFrame
-    df = pd.DataFrame(tasks)
 
+EXPORT_MIMETYPES = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv",
+}
+
+
+def iter_project_tasks(project, chunk_size):
+    """
+    Yield the serialized tasks of a project, fetched chunk_size rows at a time
+    through a server-side cursor.
+    """
+
+    tasks = (
+        apply_query_profile(Task.query, "task_export")
+        .filter_by(project_id=project.id)
+        .order_by(Task.id)
+        .yield_per(chunk_size)
+    )
+    for task in tasks:
+        yield serialize_task_for_export(task, project)
+
+
+def export_file_name(project, export_format):
+    project_name = "-".join(project.name.lower().split(" "))
+    return f"{project_name}-tasks.{export_format}"
+
+
+def content_disposition(download_name):
+    """
+    Content-Disposition header value for an attachment, built the way
+    send_file builds it: the name is quoted, and names that are not ASCII get
+    an ASCII fallback plus an RFC 5987 filename* parameter.
+    """
+
+    try:
+        download_name.encode("ascii")
+    except UnicodeEncodeError:
+        simple = unicodedata.normalize("NFKD", download_name)
+        simple = simple.encode("ascii", "ignore").decode("ascii")
+        # safe characters from RFC 5987 attr-char
+        quoted = quote(download_name, safe="!#$&+^`|~")
+        value = {"filename": simple, "filename*": f"UTF-8''{quoted}"}
+    else:
+        value = {"filename": download_name}
+
+    return dump_options_header("attachment", value)
+
+
+def _export_row(task):
+    # users are written comma separated, the format the Excel import reads
+    return [
+        ",".join(task[column]) if column == "users" else task[column]
+        for column in EXPORT_COLUMNS
+    ]
+
+
+def write_tasks_xlsx(tasks, output):
+    """
+    Write serialized tasks to an xlsx file using a write-only workbook.
+
+    Rows are flushed to a temporary file as they are appended, so memory does
+    not grow with the number of tasks.
+
+    :param tasks: iterable of dicts from serialize_task_for_export
+    :param output: path or binary file object to save the workbook to
+    """
+
+    # imported on first use - most workers never export xlsx
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Tasks")
+    sheet.append(EXPORT_COLUMNS)
+    for task in tasks:
+        sheet.append(_export_row(task))
+    workbook.save(output)
+
+
+def stream_tasks_csv(tasks, chunk_size=1000):
+    """
+    Generate CSV text for serialized tasks, chunk_size rows at a time.
+
+    :param tasks: iterable of dicts from serialize_task_for_export
+    :param chunk_size: rows buffered before a chunk is yielded
+    """
+
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+
+    for count, task in enumerate(tasks, start=1):
+        writer.writerow(_export_row(task))
+        if count % chunk_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+
+
+def export_tasks(tasks):
     # save to excel in memory
     output = BytesIO()
-    with pd.ExcelWriter(output, engine="openpyxl") as writer:
-        df.to_excel(writer, index=False, sheet_name="Tasks")
+    write_tasks_xlsx(tasks, output)
 
     output.seek(0)
 
     return output
+
+
+def export_project_tasks(project_id, export_format="xlsx", progress=None):
+    """
+    Export a project's tasks to a file in JOB_RESULT_DIR (background job).
+
+    :param project_id: Project to export
+    :param export_format: "xlsx" or "csv"
+    :param progress: Optional callback(rows_processed, total_rows)
+    :return: dict with path, download_name and mimetype of the written file
+    """
+
+    project = db.session.get(Project, project_id)
+    if not project:
+        raise ValueError(f"Project not found with id {project_id}")
+
+    chunk_size = current_app.config["EXPORT_CHUNK_SIZE"]
+    total_rows = Task.query.filter_by(project_id=project_id).count()
+
+    def tracked(tasks):
+        for count, task in enumerate(tasks, start=1):
+            yield task
+            if progress and count % chunk_size == 0:
+                progress(count, total_rows)
+
+    download_name = export_file_name(project, export_format)
+    path = os.path.join(
+        current_app.config["JOB_RESULT_DIR"],
+        # not named after the project - its name may not be a valid file name
+        f"taskify-export-{os.urandom(8).hex()}.{export_format}",
+    )
+    serialized_tasks = tracked(iter_project_tasks(project, chunk_size))
+
+    if export_format == "csv":
+        with open(path, "w", newline="", encoding="utf-8") as output:
+            for chunk in stream_tasks_csv(serialized_tasks, chunk_size):
+                output.write(chunk)
+    else:
+        write_tasks_xlsx(serialized_tasks, path)
+
+    if progress:
+        progress(total_rows, total_rows)
+
+    return {
+        "path": path,
+        "download_name": download_name,
+        "mimetype": EXPORT_MIMETYPES[export_format],
+    }
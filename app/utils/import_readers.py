@@ -0,0 +1,122 @@
+from itertools import islice
+import csv
+import io
+import os
+
+UPLOAD_MIMETYPES = {
+    ".xlsx": [
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        "application/vnd.ms-excel",
+    ],
+    ".xls": ["application/vnd.ms-excel"],
+    # browsers on Windows send .csv files as application/vnd.ms-excel
+    ".csv": ["text/csv", "application/csv", "application/vnd.ms-excel"],
+}
+
+
+class SheetReader(object):
+    """
+    Rows of an uploaded sheet as dicts keyed by lower-cased header, read
+    lazily so only one row (one chunk, with chunks()) is in memory at a time.
+    The header is read on construction, so columns can be checked up front.
+
+    .xlsx files are read with openpyxl in read-only mode and .csv files with
+    the csv module. Legacy .xls files have no streaming reader and are loaded
+    with pandas, which is fine at their 65536-row limit.
+
+    :param file: Binary file object (an upload or an opened file)
+    :param filename: Name the format is taken from
+    :raises ValueError: if the file cannot be read as that format
+    """
+
+    def __init__(self, file, filename):
+        self.extension = os.path.splitext(filename or "")[1].lower()
+        self.total_rows = None
+        self._close = None
+
+        if self.extension == ".xlsx":
+            rows = self._open_xlsx(file)
+        elif self.extension == ".xls":
+            rows = self._open_xls(file)
+        elif self.extension == ".csv":
+            rows = self._open_csv(file)
+        else:
+            raise ValueError(f"Unsupported file type: {self.extension or filename}")
+
+        try:
+            header = next(rows)
+        except StopIteration:
+            header = ()
+        except (csv.Error, UnicodeDecodeError) as err:
+            raise ValueError(str(err))
+        self.columns = [
+            str(label).strip().lower() if label is not None else "" for label in header
+        ]
+        self._rows = rows
+
+    def _open_xlsx(self, file):
+        # openpyxl is imported on the first upload, not by every worker at boot
+        from openpyxl import load_workbook
+
+        try:
+            workbook = load_workbook(file, read_only=True, data_only=True)
+        except Exception as err:
+            raise ValueError(str(err))
+        self._close = workbook.close
+
+        sheet = workbook.active
+        # from the sheet's <dimension> tag, so it is only an estimate
+        if sheet.max_row:
+            self.total_rows = max(sheet.max_row - 1, 0)
+        return sheet.iter_rows(values_only=True)
+
+    def _open_xls(self, file):
+        import pandas as pd
+
+        try:
+            df = pd.read_excel(file, header=None, dtype=object)
+        except Exception as err:
+            raise ValueError(str(err))
+
+        self.total_rows = max(len(df) - 1, 0)
+        return (
+            tuple(None if pd.isna(value) else value for value in row)
+            for row in df.itertuples(index=False)
+        )
+
+    def _open_csv(self, file):
+        # utf-8-sig drops the byte order mark Excel writes in front of CSVs
+        text = io.TextIOWrapper(
+            getattr(file, "stream", file), encoding="utf-8-sig", newline=""
+        )
+        # hand the binary stream back instead of closing it with the wrapper
+        self._close = text.detach
+        return (
+            tuple(value if value != "" else None for value in row)
+            for row in csv.reader(text)
+        )
+
+    def __iter__(self):
+        """Yield (row number, row dict) - row numbers as shown by Excel."""
+        try:
+            # the header is row 1
+            for row_number, values in enumerate(self._rows, start=2):
+                # skip blank lines - Excel keeps formatted but empty rows
+                if not any(value is not None for value in values):
+                    continue
+                yield row_number, dict(zip(self.columns, values))
+        except (csv.Error, UnicodeDecodeError) as err:
+            raise ValueError(str(err))
+
+    def chunks(self, size):
+        """Yield lists of at most size (row number, row dict) pairs."""
+        rows = iter(self)
+        while True:
+            chunk = list(islice(rows, size))
+            if not chunk:
+                return
+            yield chunk
+
+    def close(self):
+        if self._close is not None:
+            self._close()
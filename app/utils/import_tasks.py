@@ -1,126 +1,345 @@
-from flask import jsonify
-from app.models import User, Task, Project
+from flask import current_app, jsonify
+from sqlalchemy import insert
+from app.models import User, Task, Project, normalize_name
+from app.models.task import StatusEnum, user_task
 from app import db
-import pandas as pd
+from app.extensions import events, name_cache, response_cache
+from app.utils.batch_tasks import parse_due_date
+from app.utils.db_helpers import bulk_insert
+from app.utils.import_readers import UPLOAD_MIMETYPES, SheetReader
+from app.utils.project_stats import refresh_project_counters
+from collections import Counter
+from datetime import date, datetime, time
+import os
+
+# row errors listed in an import summary; further failures are only counted
+MAX_REPORTED_ERRORS = 1000
+
+# accepted for text due dates besides ISO 8601 and HTTP dates
+IMPORT_DATE_FORMATS = ("%m/%d/%Y", "%m/%d/%Y %H:%M", "%m/%d/%Y %H:%M:%S")
 
 
 def validate_uploaded_file(file):
-    FILE_SIZE_LIMIT_IN_MB = 2
-    FILE_SIZE_LIMIT_IN_BYTES = FILE_SIZE_LIMIT_IN_MB * 1024 * 1024
+    """
+    Check an uploaded sheet's size, file name and MIME type.
+
+    :return: (error_response or None, status_code or None)
+    """
+
+    size_limit_mb = current_app.config["IMPORT_MAX_FILE_SIZE_MB"]
 
     # chcek file size
     file.seek(0, 2)
     file_size = file.tell()
     file.seek(0)
 
-    if file_size > FILE_SIZE_LIMIT_IN_BYTES:
-        return jsonify(
-            {"error": f"File size must be less than {FILE_SIZE_LIMIT_IN_MB} MB"}
+    if file_size > size_limit_mb * 1024 * 1024:
+        return (
+            jsonify({"error": f"File size must be less than {size_limit_mb} MB"}),
+            413,
         )
 
-    # multiple file uploaded - NOT ALLOWED
-    if isinstance(file, list) or hasattr(file, "__len__") and len(file) > 1:
-        return jsonify({"error": "Only file is allowed"}), 400
-
     # validate file name and type
     if file.filename == "":
         return jsonify({"error": "No file selected"}), 400
 
-    if not (file.filename.lower().endswith((".xls", ".xlsx"))):
-        return jsonify(
-            {"error": "Invalid file type. Only .xls or .xlsx files are allowed"}
+    extension = os.path.splitext(file.filename)[1].lower()
+    if extension not in UPLOAD_MIMETYPES:
+        return (
+            jsonify(
+                {
+                    "error": "Invalid file type. Only .xls, .xlsx or .csv files are allowed"
+                }
+            ),
+            400,
+        )
+
+    if file.mimetype not in UPLOAD_MIMETYPES[extension]:
+        return jsonify({"error": f"Invalid MIME type for {extension} file"}), 400
+
+    return None, None
+
+
+def _resolve_names(model_class, names, known=()):
+    """
+    Map every name to an id - from the name cache, then with one query on the
+    unique name_key index - creating the missing rows with one bulk insert.
+
+    :param model_class: Project or User
+    :param names: iterable of names as written in the sheet
+    :param known: name keys already resolved (by an earlier chunk), skipped
+    :return: dict of name key -> id
+    """
+
+    wanted = {}
+    for name in names:
+        if normalize_name(name) not in known:
+            wanted.setdefault(normalize_name(name), str(name).strip())
+    if not wanted:
+        return {}
+
+    def lookup(name_keys):
+        return dict(
+            db.session.query(model_class.name_key, model_class.id).filter(
+                model_class.name_key.in_(name_keys)
+            )
         )
 
-    allowed_mimetypes = [
-        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        "application/vnd.ms-excel",
-    ]
+    resolved = name_cache.get_many(model_class, list(wanted))
+    uncached = [key for key in wanted if key not in resolved]
+    if uncached:
+        resolved.update(lookup(uncached))
 
-    if file.mimetype not in allowed_mimetypes:
-        return jsonify({"error": "Invalid MIME type for Excel file"}), 400
+    missing = [key for key in uncached if key not in resolved]
+    if missing:
+        db.session.execute(
+            insert(model_class), [{"name": wanted[key]} for key in missing]
+        )
+        resolved.update(lookup(missing))
 
-    return
+    return resolved
 
 
-def process_excel_data(file, project_id):
+def _parse_date_text(value):
+    # ISO 8601 or HTTP dates, then the month-first dates spreadsheets export
     try:
-        df = pd.read_excel(file)
+        return parse_due_date(value)
+    except ValueError:
+        pass
+    for date_format in IMPORT_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+    return None
+
+
+def _parse_row(row, project_id):
+    """
+    Validate one sheet row.
+
+    :return: (parsed row dict or None, error message or None)
+    """
+
+    name = row.get("name")
+    if not name:
+        return None, "name is required"
+
+    due_date = row.get("due_date")
+    if due_date is None:
+        return None, "due_date is required"
+
+    # date cells come as datetimes, CSV (and text cells) as strings
+    if isinstance(due_date, datetime):
+        pass
+    elif isinstance(due_date, date):
+        due_date = datetime.combine(due_date, time())
+    else:
+        due_date = _parse_date_text(str(due_date).strip())
+        if due_date is None:
+            return None, f"Invalid due_date: {row.get('due_date')}"
+
+    status = row.get("status")
+    if status:
+        status = "_".join(str(status).upper().split(" "))
+        if status not in StatusEnum.__members__:
+            return None, f"Invalid status: {row.get('status')}"
+    else:
+        status = StatusEnum.NOT_STARTED.name
+
+    # a blank project cell means the project the sheet was uploaded to
+    project = row.get("project")
+    project = str(project).strip() if project is not None else ""
+
+    users = row.get("users")
+    user_names = (
+        [user.strip() for user in str(users).split(",") if user.strip()]
+        if users
+        else []
+    )
+
+    return {
+        "name": name,
+        "description": row.get("description"),
+        "status": status,
+        "due_date": due_date,
+        # fall back to the project the sheet was uploaded to
+        "project": project or None,
+        "project_id": project_id,
+        "users": user_names,
+    }, None
+
+
+def process_excel_data(file, project_id, chunk_size=None, progress=None):
+    """
+    Import the tasks of an Excel or CSV sheet in one transaction.
+
+    The sheet is streamed chunk_size rows at a time: every chunk is validated,
+    the projects and users it names for the first time are resolved through
+    the name cache and one query per table (missing ones are created with one
+    bulk insert each) into import-wide name -> id dicts, and its tasks plus their
+    user_tasks rows are inserted before the next chunk is read, so memory use
+    does not grow with the length of the sheet.
 
-        # convert column labels to lowercase
-        df.columns = df.columns.str.lower()
+    :param file: Uploaded file, or a saved upload opened in binary mode
+    :param project_id: Project used for rows without a project column value
+    :param chunk_size: Rows per batch (defaults to IMPORT_CHUNK_SIZE)
+    :param progress: Optional callback(rows_processed, total_rows)
+    :return: (tasks_summary or None, error_response or None, status_code or None)
+    """
 
-        # replace NaN to None
-        df = df.astype(object).where(pd.notna(df), None)
+    chunk_size = chunk_size or current_app.config["IMPORT_CHUNK_SIZE"]
+    filename = getattr(file, "filename", None) or getattr(file, "name", "")
 
-        # validate rquired columns
+    try:
+        reader = SheetReader(file, filename)
+    except ValueError as err:
+        return None, jsonify({"error": f"Could not read file: {err}"}), 400
+
+    try:
+        # validate rquired columns before reading any rows
         required_columns = {"name", "due_date"}
-        if not required_columns.issubset(df.columns):
+        if not required_columns.issubset(reader.columns):
             return (
+                None,
                 jsonify({"error": f"Missing required columns: {required_columns}"}),
                 400,
             )
 
-        # summary
-        tasks_summary = {
-            "total_tasks": len(df),
-            "created_successfully": 0,
-            "failed_to_create": 0,
-        }
-
-        # inserting into db
-        for _, row in df.iterrows():
-            try:
-                name = row["name"]
-                description = row.get("description")
-                status = (
-                    "_".join(row.get("status").upper().split(" "))
-                    if row.get("status")
-                    else row.get("status")
+        return _import_rows(reader, project_id, chunk_size, progress), None, None
+    finally:
+        reader.close()
+
+
+def _import_rows(reader, project_id, chunk_size, progress):
+    # summary
+    tasks_summary = {
+        "total_tasks": 0,
+        "created_successfully": 0,
+        "failed_to_create": 0,
+        "errors": [],
+    }
+
+    project_ids, user_ids = {}, {}
+    created_per_project = Counter()
+
+    try:
+        for rows in reader.chunks(chunk_size):
+            tasks_summary["total_tasks"] += len(rows)
+
+            chunk = []
+            for row_number, row in rows:
+                parsed, error = _parse_row(row, project_id)
+                if error:
+                    # a sheet of bad rows should not fill the memory either
+                    if len(tasks_summary["errors"]) < MAX_REPORTED_ERRORS:
+                        tasks_summary["errors"].append(
+                            {"row": row_number, "error": error}
+                        )
+                    continue
+                chunk.append(parsed)
+
+            project_ids.update(
+                _resolve_names(
+                    Project,
+                    {row["project"] for row in chunk if row["project"]},
+                    project_ids,
                 )
-                due_date = row["due_date"]
-                users = row.get("users")
-
-                # associate project with task if exists, else create one then associate it
-                project_name = row.get("project")
-                project = Project.query.filter(
-                    Project.name.ilike(f"%{project_name}%")
-                ).first()
-                project_to_associate = project
-                if not project:
-                    new_project = Project(name=project_name)
-                    db.session.add(new_project)
-                    db.session.commit()
-                    db.session.refresh(new_project)
-                    project_to_associate(new_project)
-
-                task = Task(
-                    name=name,
-                    description=description,
-                    status=status,
-                    due_date=due_date,
-                    project_id=project_to_associate.id,
+            )
+            user_ids.update(
+                _resolve_names(
+                    User, {name for row in chunk for name in row["users"]}, user_ids
                 )
+            )
+
+            tasks = [
+                {
+                    "name": row["name"],
+                    "description": row["description"],
+                    "status": StatusEnum[row["status"]],
+                    "due_date": row["due_date"],
+                    "project_id": (
+                        project_ids[normalize_name(row["project"])]
+                        if row["project"]
+                        else row["project_id"]
+                    ),
+                }
+                for row in chunk
+            ]
+            created_per_project.update(task["project_id"] for task in tasks)
+            # one INSERT per chunk, returning the task ids
+            task_ids = bulk_insert(Task, tasks)
 
-                if users:
-                    for user in users.split(","):
-                        users_to_associate = User.query.filter(
-                            User.name.ilike(f"%{user}%")
-                        ).first()
-                        if not users_to_associate:
-                            new_user = User(name=user)
-                            db.session.add(new_user)
-                            db.session.commit()
-                            db.session.refresh(new_user)
-                            users_to_associate = new_user
-                        task.users.extend([users_to_associate])
-
-                db.session.add(task)
-                db.session.commit()
-                tasks_summary["created_successfully"] += 1
-            except Exception as err:
-                tasks_summary["failed_to_create"] += 1
+            assignments = {
+                (user_ids[normalize_name(name)], task_id)
+                for task_id, row in zip(task_ids, chunk)
+                for name in row["users"]
+            }
+            if assignments:
+                db.session.execute(
+                    user_task.insert(),
+                    [
+                        {"user_id": user_id, "task_id": task_id}
+                        for user_id, task_id in assignments
+                    ],
+                )
 
+            tasks_summary["created_successfully"] += len(tasks)
+
+            if progress:
+                progress(tasks_summary["total_tasks"], reader.total_rows)
+
+        refresh_project_counters(project_id, *set(project_ids.values()))
+        db.session.commit()
+    except Exception as err:
+        db.session.rollback()
+        current_app.logger.exception("Task import failed")
+        tasks_summary["errors"].append({"row": None, "error": str(err)})
+        tasks_summary["created_successfully"] = 0
+        tasks_summary["failed_to_create"] = tasks_summary["total_tasks"]
         return tasks_summary
 
-    except Exception as e:
-        print(e)
+    # only now that the rows created on the way are committed
+    name_cache.set_many(Project, project_ids)
+    name_cache.set_many(User, user_ids)
+
+    # rows may target any project and create projects and users; the stats
+    # of every project that got tasks are only tagged per project
+    response_cache.invalidate(
+        "projects",
+        "users",
+        "tasks",
+        *(
+            f"project:{target_project_id}:tasks"
+            for target_project_id in created_per_project
+        ),
+    )
+    for target_project_id, created in created_per_project.items():
+        events.publish(target_project_id, "tasks.imported", {"created": created})
+
+    tasks_summary["failed_to_create"] = (
+        tasks_summary["total_tasks"] - tasks_summary["created_successfully"]
+    )
+
+    return tasks_summary
+
+
+def process_excel_file(path, project_id, progress=None):
+    """
+    Import a saved upload (background job) and remove it afterwards.
+
+    :return: tasks_summary
+    """
+
+    try:
+        with open(path, "rb") as file:
+            tasks_summary, error_response, _ = process_excel_data(
+                file, project_id, progress=progress
+            )
+    finally:
+        os.remove(path)
+
+    if error_response:
+        raise ValueError(error_response.get_json()["error"])
+
+    return tasks_summary
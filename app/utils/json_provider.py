@@ -0,0 +1,40 @@
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional - the stdlib encoder is used without it
+    orjson = None
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider that encodes with orjson when it is installed and enabled
+    (JSON_USE_ORJSON), falling back to the stdlib encoder otherwise.
+
+    The output matches DefaultJSONProvider's: keys are sorted and datetimes
+    are still HTTP dates (they are passed through to the default hook rather
+    than encoded as ISO 8601 by orjson). Non-ASCII text is emitted as UTF-8
+    instead of \\u escapes. Indented output (debug mode) uses the stdlib.
+    """
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.use_orjson = orjson is not None and app.config.get(
+            "JSON_USE_ORJSON", True
+        )
+
+    def dumps(self, obj, **kwargs):
+        if not self.use_orjson or kwargs.get("indent"):
+            return super().dumps(obj, **kwargs)
+
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+
+        try:
+            return orjson.dumps(
+                obj, default=kwargs.get("default", self.default), option=option
+            ).decode()
+        except TypeError:
+            # e.g. integers wider than 64 bits - let the stdlib handle it
+            return super().dumps(obj, **kwargs)
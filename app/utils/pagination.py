@@ -0,0 +1,221 @@
+from flask import jsonify, request
+from sqlalchemy import DateTime, and_, or_
+from datetime import datetime
+import base64
+import json
+
+
+def parse_sort(args, sort_fields, default_sort_by="updated_at", default_order="desc"):
+    """
+    Read a listing's order from ?sort=-due_date,name (a leading "-" sorts that
+    column descending) or, when sort is absent, from ?sort_by=&order=.
+
+    :param args: request.args
+    :param sort_fields: Column names the listing may be sorted by
+    :raises ValueError: with a client-facing message on an unknown or repeated field
+    :return: list of (sort column name, "asc" or "desc")
+    """
+
+    if args.get("sort"):
+        sort_keys = []
+        for part in args["sort"].split(","):
+            field = part.strip().lstrip("+-")
+            if field not in sort_fields or field in dict(sort_keys):
+                raise ValueError(f"Invalid sort field: {part.strip()}")
+            sort_keys.append((field, "desc" if part.strip()[:1] == "-" else "asc"))
+        return sort_keys
+
+    sort_by = args.get("sort_by", default_sort_by)
+    if sort_by not in sort_fields:
+        raise ValueError("Invalid sort_by field")
+    order = "asc" if args.get("order", default_order) == "asc" else "desc"
+    return [(sort_by, order)]
+
+
+def sort_clauses(model_class, sort_keys):
+    """
+    ORDER BY clauses for parse_sort's keys, with id as the final tie-breaker
+    (in the last key's direction, so a single-column sort walks the
+    (..., column, id) index) to keep OFFSET pages stable.
+    """
+
+    clauses = []
+    for field, order in sort_keys:
+        column = getattr(model_class, field)
+        clauses.append(column.asc() if order == "asc" else column.desc())
+    clauses.append(
+        model_class.id.asc() if sort_keys[-1][1] == "asc" else model_class.id.desc()
+    )
+    return clauses
+
+
+def encode_cursor(sort_by, order, direction, instance):
+    """
+    Build an opaque cursor pointing at an instance's (sort column, id) position.
+
+    :param sort_by: Name of the sort column
+    :param order: "asc" or "desc"
+    :param direction: "next" or "prev" - which way to seek from the position
+    :param instance: Model instance the cursor points at
+    :return: URL-safe cursor string
+    """
+
+    value = getattr(instance, sort_by)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+
+    payload = {
+        "s": sort_by,
+        "o": order,
+        "d": direction,
+        "v": value,
+        "id": instance.id,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor, model_class, sort_by, order):
+    """
+    Decode a cursor built by encode_cursor.
+
+    :raises ValueError: if the cursor is malformed or was built for another sort
+    :return: (sort value, id, direction)
+    """
+
+    column = getattr(model_class, sort_by)
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value, last_id, direction = payload["v"], int(payload["id"]), payload["d"]
+        if isinstance(column.type, DateTime):
+            value = datetime.fromisoformat(value)
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Malformed cursor")
+
+    if payload.get("s") != sort_by or payload.get("o") != order:
+        raise ValueError("Cursor does not match sort_by/order")
+    if direction not in ("next", "prev"):
+        raise ValueError("Malformed cursor")
+
+    return value, last_id, direction
+
+
+def keyset_seek(query, model_class, sort_by, order, cursor, per_page):
+    """
+    Apply a keyset page's seek predicate, ORDER BY and LIMIT to a query.
+
+    Works on both a legacy Query and a select() statement, so the async
+    handlers in app.asgi share the sync routes' cursor format.
+
+    :param query: Filtered (unordered) query or select() to paginate
+    :param model_class: SQLAlchemy model class being listed
+    :param sort_by: Name of the sort column (already validated by the route)
+    :param order: "asc" or "desc"
+    :param cursor: Cursor from a previous response, empty for the first page
+    :param per_page: Page size
+    :raises ValueError: if the cursor is malformed or was built for another sort
+    :return: (query fetching up to per_page + 1 rows, "next" or "prev")
+    """
+
+    sort_column = getattr(model_class, sort_by)
+    id_column = model_class.id
+    order = "asc" if order == "asc" else "desc"
+    direction = "next"
+    seek_query = query
+
+    if cursor:
+        value, last_id, direction = decode_cursor(cursor, model_class, sort_by, order)
+
+        # seeking backwards walks the index in the opposite order
+        seek_desc = (order == "desc") != (direction == "prev")
+        if seek_desc:
+            seek_query = seek_query.filter(
+                or_(
+                    sort_column < value,
+                    and_(sort_column == value, id_column < last_id),
+                )
+            )
+        else:
+            seek_query = seek_query.filter(
+                or_(
+                    sort_column > value,
+                    and_(sort_column == value, id_column > last_id),
+                )
+            )
+    else:
+        seek_desc = order == "desc"
+
+    if seek_desc:
+        seek_query = seek_query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        seek_query = seek_query.order_by(sort_column.asc(), id_column.asc())
+
+    # fetch one extra row to know whether there is another page
+    return seek_query.limit(per_page + 1), direction
+
+
+def keyset_page(items, sort_by, order, cursor, direction, per_page):
+    """
+    Build a keyset page from the rows fetched by keyset_seek's query.
+
+    :return: dict with items, next_cursor and prev_cursor
+    """
+
+    order = "asc" if order == "asc" else "desc"
+    has_more = len(items) > per_page
+    items = list(items[:per_page])
+
+    if direction == "prev":
+        items.reverse()
+        has_next, has_prev = bool(cursor), has_more
+    else:
+        has_next, has_prev = has_more, bool(cursor)
+
+    return {
+        "items": items,
+        "next_cursor": (
+            encode_cursor(sort_by, order, "next", items[-1])
+            if items and has_next
+            else None
+        ),
+        "prev_cursor": (
+            encode_cursor(sort_by, order, "prev", items[0])
+            if items and has_prev
+            else None
+        ),
+    }
+
+
+def keyset_paginate(query, model_class, sort_by, order, cursor, per_page):
+    """
+    Paginate a query by seeking on (sort column, id) instead of OFFSET.
+
+    No COUNT(*) is issued unless the client passes include_total=true.
+
+    :param query: Filtered (unordered) query to paginate
+    :param model_class: SQLAlchemy model class being listed
+    :param sort_by: Name of the sort column (already validated by the route)
+    :param order: "asc" or "desc"
+    :param cursor: Cursor from a previous response, empty for the first page
+    :param per_page: Page size
+    :return: (page dict or None, error_response or None, status_code or None)
+    """
+
+    if per_page < 1:
+        return None, jsonify({"error": "per_page must be positive"}), 400
+
+    try:
+        seek_query, direction = keyset_seek(
+            query, model_class, sort_by, order, cursor, per_page
+        )
+    except ValueError as err:
+        return None, jsonify({"error": f"Invalid cursor: {err}"}), 400
+
+    page = keyset_page(seek_query.all(), sort_by, order, cursor, direction, per_page)
+
+    if request.args.get("include_total", "false").lower() == "true":
+        page["total"] = query.order_by(None).count()
+
+    return page, None, None
@@ -0,0 +1,125 @@
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+from threading import Lock
+import time
+
+
+class PoolMetrics(object):
+    """
+    Counters for the engine's connection pool.
+
+    Checkout waits are recorded by InstrumentedQueuePool; connection churn and
+    checkout/checkin counts come from SQLAlchemy pool events.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._engine = None
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._counters = {
+                "checkouts": 0,
+                "checkins": 0,
+                "checkout_timeouts": 0,
+                "connections_opened": 0,
+                "connections_closed": 0,
+                "connections_invalidated": 0,
+            }
+            self._wait_count = 0
+            self._wait_total = 0.0
+            self._wait_max = 0.0
+            self._peak_checked_out = 0
+
+    def init_app(self, app, engine):
+        self._engine = engine
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "close", self._on_close)
+        event.listen(engine, "invalidate", self._on_invalidate)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        app.extensions["pool_metrics"] = self
+
+    def _count(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        self._count("connections_opened")
+
+    def _on_close(self, dbapi_connection, connection_record):
+        self._count("connections_closed")
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        self._count("connections_invalidated")
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        self._count("checkouts")
+        pool = self._engine.pool if self._engine is not None else None
+        if isinstance(pool, QueuePool):
+            with self._lock:
+                self._peak_checked_out = max(self._peak_checked_out, pool.checkedout())
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        self._count("checkins")
+
+    def record_wait(self, seconds, timed_out=False):
+        with self._lock:
+            self._wait_count += 1
+            self._wait_total += seconds
+            self._wait_max = max(self._wait_max, seconds)
+            if timed_out:
+                self._counters["checkout_timeouts"] += 1
+
+    def snapshot(self):
+        with self._lock:
+            metrics = dict(self._counters)
+            metrics["checkout_wait_ms"] = {
+                "count": self._wait_count,
+                "avg": (
+                    round(self._wait_total / self._wait_count * 1000, 3)
+                    if self._wait_count
+                    else None
+                ),
+                "max": round(self._wait_max * 1000, 3),
+            }
+            metrics["peak_checked_out"] = self._peak_checked_out
+
+        pool = self._engine.pool if self._engine is not None else None
+        metrics["pool_class"] = type(pool).__name__ if pool is not None else None
+        if isinstance(pool, QueuePool):
+            capacity = pool.size() + max(pool._max_overflow, 0)
+            metrics.update(
+                {
+                    "pool_size": pool.size(),
+                    "max_overflow": pool._max_overflow,
+                    "checked_out": pool.checkedout(),
+                    "checked_in": pool.checkedin(),
+                    "overflow": pool.overflow(),
+                    # share of the pool's capacity in use right now
+                    "saturation": (
+                        round(pool.checkedout() / capacity, 4) if capacity else None
+                    ),
+                }
+            )
+
+        return metrics
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        pool_metrics.record_wait(time.perf_counter() - start)
+        return connection
@@ -0,0 +1,161 @@
+from flask import current_app
+from sqlalchemy import and_, case, func, update
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime
+from app import db
+from app.models import ProjectTaskStats, Task
+from app.models.task import StatusEnum
+
+# counter column of project_task_stats per status
+STATUS_COLUMNS = {
+    StatusEnum.NOT_STARTED: "not_started",
+    StatusEnum.IN_PROGRESS: "in_progress",
+    StatusEnum.COMPLETED: "completed",
+}
+
+
+def materialized_stats_enabled():
+    return current_app.config["PROJECT_STATS_MATERIALIZED"]
+
+
+def _as_status(value):
+    # task.status may still hold the raw request value before a flush
+    if isinstance(value, StatusEnum):
+        return value
+    if value in StatusEnum.__members__:
+        return StatusEnum[value]
+    return StatusEnum(value)
+
+
+def _stats_response(project_id, counts, overdue, next_due_date, source):
+    return {
+        "project_id": project_id,
+        "total": sum(counts.values()),
+        "by_status": {status.value: counts.get(status, 0) for status in StatusEnum},
+        "overdue": overdue or 0,
+        "next_due_date": next_due_date,
+        "source": source,
+    }
+
+
+def compute_project_stats(project_id):
+    """Status counts, overdue count and next due date with one GROUP BY."""
+    now = datetime.utcnow()
+    is_open = Task.status != StatusEnum.COMPLETED
+    rows = (
+        db.session.query(
+            Task.status,
+            func.count(Task.id),
+            func.sum(case((and_(is_open, Task.due_date < now), 1), else_=0)),
+            func.min(case((and_(is_open, Task.due_date >= now), Task.due_date))),
+        )
+        .filter(Task.project_id == project_id)
+        .group_by(Task.status)
+        .all()
+    )
+
+    counts = {status: count for status, count, _, _ in rows}
+    overdue = sum(row[2] or 0 for row in rows)
+    upcoming = [row[3] for row in rows if row[3] is not None]
+
+    return _stats_response(
+        project_id, counts, overdue, min(upcoming) if upcoming else None, "live"
+    )
+
+
+def get_project_stats(project_id):
+    """
+    Project stats, read from the counter table when it is enabled.
+
+    Status counts are then a primary key lookup; overdue and the next due date
+    depend on the clock, so they are still read from the task table through
+    the (project_id, due_date) index, limited to open tasks.
+    """
+
+    if not materialized_stats_enabled():
+        return compute_project_stats(project_id)
+
+    stats = db.session.get(ProjectTaskStats, project_id)
+    if stats is None:
+        refresh_project_counters(project_id)
+        db.session.commit()
+        stats = db.session.get(ProjectTaskStats, project_id)
+
+    now = datetime.utcnow()
+    overdue, next_due_date = (
+        db.session.query(
+            func.sum(case((Task.due_date < now, 1), else_=0)),
+            func.min(case((Task.due_date >= now, Task.due_date))),
+        )
+        .filter(Task.project_id == project_id, Task.status != StatusEnum.COMPLETED)
+        .one()
+    )
+    counts = {
+        status: getattr(stats, column) for status, column in STATUS_COLUMNS.items()
+    }
+
+    return _stats_response(project_id, counts, overdue, next_due_date, "materialized")
+
+
+def adjust_project_counters(project_id, status, delta):
+    """
+    Add delta to a project's counter for status, in the caller's transaction.
+
+    Call it after the task change has been flushed: a missing counter row is
+    rebuilt from the task table instead.
+    """
+
+    if not materialized_stats_enabled():
+        return
+
+    column = getattr(ProjectTaskStats, STATUS_COLUMNS[_as_status(status)])
+    result = db.session.execute(
+        update(ProjectTaskStats)
+        .where(ProjectTaskStats.project_id == project_id)
+        .values({column: column + delta, "updated_at": datetime.utcnow()})
+        .execution_options(synchronize_session=False)
+    )
+    if not result.rowcount:
+        refresh_project_counters(project_id)
+
+
+def refresh_project_counters(*project_ids):
+    """
+    Rebuild the counter rows of the given projects from the task table with
+    one GROUP BY (used by the bulk write paths and to backfill missing rows).
+    """
+
+    if not materialized_stats_enabled() or not project_ids:
+        return
+
+    counts = {project_id: {} for project_id in project_ids}
+    rows = (
+        db.session.query(Task.project_id, Task.status, func.count(Task.id))
+        .filter(Task.project_id.in_(project_ids))
+        .group_by(Task.project_id, Task.status)
+    )
+    for project_id, status, count in rows:
+        counts[project_id][STATUS_COLUMNS[status]] = count
+
+    now = datetime.utcnow()
+    for project_id, project_counts in counts.items():
+        values = {
+            column: project_counts.get(column, 0) for column in STATUS_COLUMNS.values()
+        }
+        values["updated_at"] = now
+        statement = (
+            update(ProjectTaskStats)
+            .where(ProjectTaskStats.project_id == project_id)
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
+        if db.session.execute(statement).rowcount:
+            continue
+
+        # first write for this project - a concurrent request may insert the
+        # same row, in which case updating it is enough
+        try:
+            with db.session.begin_nested():
+                db.session.add(ProjectTaskStats(project_id=project_id, **values))
+        except IntegrityError:
+            db.session.execute(statement)
@@ -0,0 +1,124 @@
+from sqlalchemy.orm import joinedload, load_only, selectinload
+from app.models import Project, Task, User
+
+# loader options per endpoint - every relationship the matching serializer
+# touches is loaded up front, so the number of queries stays constant no matter
+# how many rows are returned. Built lazily because backrefs (e.g. Task.project)
+# only exist once the mappers are configured.
+QUERY_PROFILES = {
+    # project is many-to-one, so a JOIN keeps LIMIT/OFFSET correct;
+    # users are loaded with one extra "WHERE task_id IN (...)" query per page
+    "task_list": lambda: (joinedload(Task.project), selectinload(Task.users)),
+    "task_detail": lambda: (joinedload(Task.project), selectinload(Task.users)),
+    "user_inbox": lambda: (joinedload(Task.project), selectinload(Task.users)),
+    # streamed with yield_per, which rules out joined collection loads
+    "task_export": lambda: (selectinload(Task.users),),
+}
+
+
+def get_query_options(profile):
+    """
+    Return the loader options registered for an endpoint profile.
+
+    :param profile: Key in QUERY_PROFILES (e.g., "task_list")
+    :return: tuple of loader options
+    """
+
+    return QUERY_PROFILES[profile]()
+
+
+def apply_query_profile(query, profile):
+    """
+    Apply the loader options registered for an endpoint profile to a query.
+
+    :param query: SQLAlchemy query (e.g., Task.query)
+    :param profile: Key in QUERY_PROFILES (e.g., "task_list")
+    :return: query with the profile's loader options applied
+    """
+
+    return query.options(*get_query_options(profile))
+
+
+# ?fields=... sparse fieldsets - the columns each serialized field reads.
+# Relationship fields (a task's project and users) get a loader only when
+# requested; everything else is left out of the SELECT.
+SPARSE_FIELDS = {
+    Project: {
+        "id": ("id",),
+        "name": ("name",),
+        "created_at": ("created_at",),
+        "updated_at": ("updated_at",),
+    },
+    User: {
+        "id": ("id",),
+        "name": ("name",),
+        "created_at": ("created_at",),
+        "updated_at": ("updated_at",),
+    },
+    Task: {
+        "id": ("id",),
+        "name": ("name",),
+        "description": ("description",),
+        "status": ("status",),
+        "due_date": ("due_date",),
+        "project_id": ("project_id",),
+        "project": ("project_id",),
+        "users": ("id",),
+        "created_at": ("created_at",),
+        "updated_at": ("updated_at",),
+    },
+}
+
+SPARSE_RELATIONSHIPS = {
+    Task: {
+        "project": lambda: joinedload(Task.project).load_only(Project.name),
+        "users": lambda: selectinload(Task.users).load_only(User.name),
+    },
+}
+
+
+def parse_fields(args, model_class):
+    """
+    Read a sparse fieldset (?fields=id,name,status) for a model's serializer.
+
+    :param args: request.args
+    :param model_class: Model being serialized (a key of SPARSE_FIELDS)
+    :raises ValueError: with a client-facing message on an unknown field
+    :return: list of field names in request order, or None for every field
+    """
+
+    if not args.get("fields"):
+        return None
+
+    fields = []
+    for field in args["fields"].split(","):
+        field = field.strip()
+        if field not in SPARSE_FIELDS[model_class]:
+            raise ValueError(f"Invalid field: {field}")
+        if field not in fields:
+            fields.append(field)
+    return fields
+
+
+def sparse_query_options(model_class, fields, *columns):
+    """
+    Loader options that load only what a sparse fieldset serializes.
+
+    :param model_class: Model being queried (a key of SPARSE_FIELDS)
+    :param fields: Field names from parse_fields, or None for no restriction
+    :param columns: Extra column names the view reads (e.g. the cursor's sort column)
+    :return: tuple of loader options
+    """
+
+    if fields is None:
+        return ()
+
+    names = set(columns)
+    for field in fields:
+        names.update(SPARSE_FIELDS[model_class][field])
+
+    relationships = SPARSE_RELATIONSHIPS.get(model_class, {})
+    return (
+        load_only(*(getattr(model_class, name) for name in sorted(names))),
+        *(relationships[field]() for field in fields if field in relationships),
+    )
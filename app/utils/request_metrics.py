@@ -0,0 +1,193 @@
+from flask import g, has_app_context, request
+from sqlalchemy import event
+from app.utils.json_provider import FastJSONProvider
+from threading import Lock
+import cProfile
+import os
+import random
+import time
+
+# upper bounds (ms) of the latency histogram buckets
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+def _current():
+    # per-request counters, None outside a request (e.g. background jobs)
+    if not has_app_context():
+        return None
+    return g.get("_request_metrics")
+
+
+class TimedJSONProvider(FastJSONProvider):
+    """JSON provider that adds encoding time to the request's metrics."""
+
+    def dumps(self, obj, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            current = _current()
+            if current is not None:
+                current["serialize"] += time.perf_counter() - start
+
+
+class RequestMetrics(object):
+    """
+    Per-request instrumentation: wall time, JSON serialization time, number of
+    SQL statements, total DB time and the slowest statement.
+
+    Every response gets a Server-Timing header; aggregated per-endpoint
+    histograms are kept in memory for the metrics endpoint. A sample of
+    requests can be profiled with cProfile (REQUEST_PROFILE_SAMPLE_RATE).
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._endpoints = {}
+        self.profile_sample_rate = 0.0
+        self.profile_dir = None
+
+    def init_app(self, app, engine):
+        self.profile_sample_rate = app.config["REQUEST_PROFILE_SAMPLE_RATE"]
+        self.profile_dir = app.config["REQUEST_PROFILE_DIR"]
+
+        app.json = TimedJSONProvider(app)
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        app.extensions["request_metrics"] = self
+
+    def _before_request(self):
+        g._request_metrics = {
+            "start": time.perf_counter(),
+            "serialize": 0.0,
+            "sql_count": 0,
+            "sql_time": 0.0,
+            "slowest_sql": None,
+            "slowest_sql_time": 0.0,
+            "profiler": None,
+        }
+        if self.profile_sample_rate and random.random() < self.profile_sample_rate:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            g._request_metrics["profiler"] = profiler
+
+    def _before_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        current = _current()
+        if current is None:
+            return
+
+        current["sql_count"] += 1
+        current["sql_time"] += elapsed
+        if elapsed >= current["slowest_sql_time"]:
+            current["slowest_sql_time"] = elapsed
+            current["slowest_sql"] = statement
+
+    def _after_request(self, response):
+        current = _current()
+        if current is None:
+            return response
+
+        wall = time.perf_counter() - current["start"]
+        response.headers["Server-Timing"] = (
+            f"app;dur={wall * 1000:.2f}, "
+            f'db;dur={current["sql_time"] * 1000:.2f};desc="{current["sql_count"]} queries", '
+            f"serialize;dur={current['serialize'] * 1000:.2f}"
+        )
+
+        self._record(request.endpoint or "unmatched", wall, current)
+
+        profiler = current["profiler"]
+        if profiler is not None:
+            profiler.disable()
+            self._dump_profile(profiler, request.endpoint or "unmatched")
+
+        return response
+
+    def _dump_profile(self, profiler, endpoint):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        path = os.path.join(
+            self.profile_dir, f"{endpoint}-{time.time_ns()}-{os.getpid()}.prof"
+        )
+        profiler.dump_stats(path)
+
+    def _record(self, endpoint, wall, current):
+        wall_ms = wall * 1000
+        with self._lock:
+            stats = self._endpoints.setdefault(
+                endpoint,
+                {
+                    "count": 0,
+                    "wall_ms_total": 0.0,
+                    "wall_ms_max": 0.0,
+                    "db_ms_total": 0.0,
+                    "serialize_ms_total": 0.0,
+                    "sql_statements_total": 0,
+                    "sql_statements_max": 0,
+                    "slowest_sql_ms": 0.0,
+                    "slowest_sql": None,
+                    "histogram": [0] * (len(LATENCY_BUCKETS_MS) + 1),
+                },
+            )
+            stats["count"] += 1
+            stats["wall_ms_total"] += wall_ms
+            stats["wall_ms_max"] = max(stats["wall_ms_max"], wall_ms)
+            stats["db_ms_total"] += current["sql_time"] * 1000
+            stats["serialize_ms_total"] += current["serialize"] * 1000
+            stats["sql_statements_total"] += current["sql_count"]
+            stats["sql_statements_max"] = max(
+                stats["sql_statements_max"], current["sql_count"]
+            )
+            if current["slowest_sql_time"] * 1000 > stats["slowest_sql_ms"]:
+                stats["slowest_sql_ms"] = current["slowest_sql_time"] * 1000
+                stats["slowest_sql"] = current["slowest_sql"]
+
+            bucket = len(LATENCY_BUCKETS_MS)
+            for index, upper_bound in enumerate(LATENCY_BUCKETS_MS):
+                if wall_ms <= upper_bound:
+                    bucket = index
+                    break
+            stats["histogram"][bucket] += 1
+
+    def snapshot(self):
+        with self._lock:
+            endpoints = {}
+            for endpoint, stats in self._endpoints.items():
+                count = stats["count"]
+                endpoints[endpoint] = {
+                    "count": count,
+                    "wall_ms_avg": round(stats["wall_ms_total"] / count, 3),
+                    "wall_ms_max": round(stats["wall_ms_max"], 3),
+                    "db_ms_avg": round(stats["db_ms_total"] / count, 3),
+                    "serialize_ms_avg": round(stats["serialize_ms_total"] / count, 3),
+                    "sql_statements_avg": round(
+                        stats["sql_statements_total"] / count, 2
+                    ),
+                    "sql_statements_max": stats["sql_statements_max"],
+                    "slowest_sql_ms": round(stats["slowest_sql_ms"], 3),
+                    "slowest_sql": stats["slowest_sql"],
+                    # cumulative counts, Prometheus style
+                    "latency_histogram_ms": {
+                        str(upper_bound): sum(stats["histogram"][: index + 1])
+                        for index, upper_bound in enumerate(LATENCY_BUCKETS_MS)
+                    }
+                    | {"+Inf": count},
+                }
+
+        return {"buckets_ms": LATENCY_BUCKETS_MS, "endpoints": endpoints}
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+request_metrics = RequestMetrics()
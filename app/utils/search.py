@@ -0,0 +1,122 @@
+from sqlalchemy.dialects.mysql import match
+from collections import Counter, defaultdict
+from app import db
+from app.models import Task
+from app.serializers import serialize_task
+from app.utils.query_options import apply_query_profile
+import math
+import re
+
+# tokens shorter than this are ignored, like InnoDB's innodb_ft_min_token_size
+MIN_TOKEN_LENGTH = 3
+# a match in the task name counts this many times a match in the description
+NAME_WEIGHT = 2
+
+
+def tokenize(text):
+    return [
+        token
+        for token in re.findall(r"\w+", (text or "").lower())
+        if len(token) >= MIN_TOKEN_LENGTH
+    ]
+
+
+class InvertedIndex(object):
+    """
+    Pure-Python inverted index over task names and descriptions, used when the
+    database has no FULLTEXT support (SQLite in tests and benchmarks).
+
+    Ranking is TF-IDF: every query token adds tf * log(1 + N / df).
+    """
+
+    def __init__(self):
+        self.postings = defaultdict(dict)
+        self.documents = 0
+
+    def add(self, task_id, name, description):
+        self.documents += 1
+        frequencies = Counter(tokenize(description))
+        for token in tokenize(name):
+            frequencies[token] += NAME_WEIGHT
+        for token, frequency in frequencies.items():
+            self.postings[token][task_id] = frequency
+
+    def search(self, text):
+        scores = defaultdict(float)
+        for token in set(tokenize(text)):
+            postings = self.postings.get(token, {})
+            if not postings:
+                continue
+            idf = math.log(1 + self.documents / len(postings))
+            for task_id, frequency in postings.items():
+                scores[task_id] += frequency * idf
+
+        # best score first, newest task first on ties
+        return sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+
+
+def _build_index(project_id):
+    index = InvertedIndex()
+    rows = db.session.query(Task.id, Task.name, Task.description)
+    if project_id is not None:
+        rows = rows.filter(Task.project_id == project_id)
+    for task_id, name, description in rows.yield_per(1000):
+        index.add(task_id, name, description)
+    return index
+
+
+def search_tasks(text, project_id=None, page=1, per_page=10):
+    """
+    Rank tasks whose name or description matches text.
+
+    Uses MATCH ... AGAINST on MySQL (FULLTEXT index) and the in-memory
+    InvertedIndex elsewhere.
+
+    :param text: Search terms
+    :param project_id: Restrict the search to one project (None searches all)
+    :return: (total matches, list of (task id, score)) for the requested page
+    """
+
+    page = max(page, 1)
+
+    if db.engine.dialect.name == "mysql":
+        score = match(Task.name, Task.description, against=text)
+        query = db.session.query(Task.id, score.label("score")).filter(score > 0)
+        if project_id is not None:
+            query = query.filter(Task.project_id == project_id)
+        total = query.order_by(None).count()
+        hits = (
+            query.order_by(score.desc(), Task.id.desc())
+            .limit(per_page)
+            .offset((page - 1) * per_page)
+            .all()
+        )
+        return total, [(task_id, float(score)) for task_id, score in hits]
+
+    hits = _build_index(project_id).search(text)
+    start = (page - 1) * per_page
+    return len(hits), hits[start : start + per_page]
+
+
+def search_tasks_page(text, project_id=None, page=1, per_page=10):
+    """Run search_tasks and serialize the page of hits, best match first."""
+    total, hits = search_tasks(text, project_id, page, per_page)
+
+    tasks = {
+        task.id: task
+        for task in apply_query_profile(Task.query, "task_list").filter(
+            Task.id.in_([task_id for task_id, _ in hits])
+        )
+    }
+
+    results = []
+    for task_id, score in hits:
+        if task_id in tasks:
+            results.append(dict(serialize_task(tasks[task_id]), score=round(score, 4)))
+
+    return {
+        "total": total,
+        "pages": math.ceil(total / per_page) if per_page else 0,
+        "current_page": max(page, 1),
+        "tasks": results,
+    }
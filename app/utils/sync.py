@@ -0,0 +1,174 @@
+from flask import current_app
+from sqlalchemy import insert, literal, select
+from datetime import datetime, timedelta
+from app import db
+from app.models import Project, Task, Tombstone, User
+from app.models.task import user_task
+from app.serializers import serialize_project, serialize_task, serialize_user
+import base64
+import json
+
+# task fields in the feed - project and users come as ids, the assignment
+# rows are a section of their own
+SYNC_TASK_FIELDS = [
+    "id",
+    "name",
+    "description",
+    "status",
+    "due_date",
+    "project_id",
+    "created_at",
+    "updated_at",
+]
+
+
+def encode_sync_token(timestamp):
+    raw = json.dumps({"t": timestamp.isoformat()}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_sync_token(token):
+    """
+    Decode a token built by encode_sync_token.
+
+    :raises ValueError: if the token is malformed
+    :return: datetime the token points at
+    """
+
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["t"])
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Malformed sync token")
+
+
+def record_deletes(entity, ids, project_id=None):
+    """
+    Leave tombstones for deleted rows, in the deleting transaction.
+
+    :param entity: "project", "task" or "user"
+    :param ids: ids of the deleted rows
+    :param project_id: Project the rows belonged to (tasks)
+    """
+
+    now = datetime.utcnow()
+    rows = [
+        {
+            "entity": entity,
+            "entity_id": entity_id,
+            "project_id": project_id,
+            "deleted_at": now,
+        }
+        for entity_id in ids
+    ]
+    if rows:
+        db.session.execute(insert(Tombstone), rows)
+
+
+def record_project_delete(project_id):
+    """
+    Tombstone a project and, with one INSERT ... SELECT, every task the
+    delete cascades to.
+    """
+
+    now = datetime.utcnow()
+    db.session.execute(
+        insert(Tombstone).from_select(
+            ["entity", "entity_id", "project_id", "deleted_at"],
+            select(literal("task"), Task.id, Task.project_id, literal(now)).where(
+                Task.project_id == project_id
+            ),
+        )
+    )
+    record_deletes("project", [project_id])
+
+
+def _stream(statement, chunk_size):
+    return db.session.execute(statement.execution_options(yield_per=chunk_size))
+
+
+def _section(name, items, dumps, first=False):
+    yield f'{"" if first else ","}"{name}":['
+    separator = ""
+    for item in items:
+        yield separator + dumps(item)
+        separator = ","
+    yield "]"
+
+
+def stream_changes(since=None):
+    """
+    Generate the sync feed as JSON text: every project, task and user changed
+    at or after since, the assignment rows of those tasks (the complete set
+    per task - replace, don't merge), tombstones of deletes and the token to
+    pass next time. Without since, everything and no tombstones.
+
+    Rows are read chunk by chunk through server-side cursors, so memory does
+    not grow with the size of the feed. Changes at exactly the token's time
+    are sent again; clients should apply the feed as idempotent upserts.
+    """
+
+    chunk_size = current_app.config["SYNC_CHUNK_SIZE"]
+    lag = timedelta(seconds=current_app.config["SYNC_TOKEN_LAG_SECONDS"])
+    dumps = current_app.json.dumps
+    # taken before reading, and rewound by the lag - a writer that stamped its
+    # rows earlier but committed after these reads is caught next time
+    next_token = encode_sync_token(datetime.utcnow() - lag)
+
+    def changed(model_class):
+        statement = select(model_class).order_by(model_class.updated_at, model_class.id)
+        if since is not None:
+            statement = statement.where(model_class.updated_at >= since)
+        return _stream(statement, chunk_size).scalars()
+
+    yield "{"
+    yield from _section(
+        "projects", map(serialize_project, changed(Project)), dumps, first=True
+    )
+    yield from _section("users", map(serialize_user, changed(User)), dumps)
+    yield from _section(
+        "tasks",
+        (serialize_task(task, SYNC_TASK_FIELDS) for task in changed(Task)),
+        dumps,
+    )
+
+    assignments = (
+        select(user_task.c.task_id, user_task.c.user_id)
+        .join(Task, Task.id == user_task.c.task_id)
+        .order_by(user_task.c.task_id, user_task.c.user_id)
+    )
+    if since is not None:
+        assignments = assignments.where(Task.updated_at >= since)
+    yield from _section(
+        "assignments",
+        (
+            {"task_id": task_id, "user_id": user_id}
+            for task_id, user_id in _stream(assignments, chunk_size)
+        ),
+        dumps,
+    )
+
+    deleted = []
+    if since is not None:
+        deleted = _stream(
+            select(Tombstone)
+            .where(Tombstone.deleted_at >= since)
+            .order_by(Tombstone.deleted_at, Tombstone.id),
+            chunk_size,
+        ).scalars()
+    yield from _section(
+        "deleted",
+        (
+            {
+                "type": tombstone.entity,
+                "id": tombstone.entity_id,
+                "project_id": tombstone.project_id,
+                "deleted_at": tombstone.deleted_at,
+            }
+            for tombstone in deleted
+        ),
+        dumps,
+    )
+
+    yield f',"next_token":{dumps(next_token)}}}'
@@ -0,0 +1,90 @@
+from sqlalchemy import select
+from app.models import Task
+from app.models.task import user_task
+from app.utils.batch_tasks import parse_due_date, parse_status
+
+# ?<arg>=... filters accepted by task listings, each compiled to one criterion
+# an index can serve together with the project_id equality:
+#   status=Not Started,IN_PROGRESS      ix_task_project_id_status
+#   due_after=...&due_before=...        ix_task_project_id_due_date_id
+#   created_since=...                   ix_task_project_id_created_at_id
+#   updated_since=...                   ix_task_project_id_updated_at_id
+#   name_prefix=...                     ix_task_project_id_name_id
+#   assignee=1,2                        user_tasks primary key (user_id, task_id)
+TASK_FILTER_ARGS = [
+    "status",
+    "due_after",
+    "due_before",
+    "created_since",
+    "updated_since",
+    "name_prefix",
+    "assignee",
+]
+
+
+def _split(value):
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+def _parse_date(arg, value):
+    try:
+        return parse_due_date(value)
+    except ValueError:
+        raise ValueError(f"Invalid {arg} value")
+
+
+def _escape_like(value):
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def parse_task_filters(args):
+    """
+    Compile the listing filters in the query string into SQL criteria.
+
+    :param args: request.args
+    :raises ValueError: with a client-facing message if a filter is invalid
+    :return: list of criteria to pass to Query.filter
+    """
+
+    criteria = []
+
+    if args.get("status"):
+        try:
+            statuses = {parse_status(status) for status in _split(args["status"])}
+        except ValueError:
+            raise ValueError("Invalid status filter")
+        criteria.append(Task.status.in_(sorted(statuses, key=lambda s: s.name)))
+
+    if args.get("due_after"):
+        criteria.append(Task.due_date >= _parse_date("due_after", args["due_after"]))
+    if args.get("due_before"):
+        criteria.append(Task.due_date < _parse_date("due_before", args["due_before"]))
+    if args.get("created_since"):
+        criteria.append(
+            Task.created_at >= _parse_date("created_since", args["created_since"])
+        )
+    if args.get("updated_since"):
+        criteria.append(
+            Task.updated_at >= _parse_date("updated_since", args["updated_since"])
+        )
+
+    # a LIKE with a constant prefix is a range scan on the name index
+    if args.get("name_prefix"):
+        criteria.append(
+            Task.name.like(_escape_like(args["name_prefix"]) + "%", escape="\\")
+        )
+
+    # tasks assigned to any of the users - a semi-join on user_tasks, so a task
+    # shared by several of them is returned once
+    if args.get("assignee"):
+        try:
+            user_ids = sorted({int(user_id) for user_id in _split(args["assignee"])})
+        except ValueError:
+            raise ValueError("Invalid assignee filter")
+        criteria.append(
+            Task.id.in_(
+                select(user_task.c.task_id).where(user_task.c.user_id.in_(user_ids))
+            )
+        )
+
+    return criteria
@@ -0,0 +1,8 @@
+from app.asgi import create_asgi_app
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# uvicorn asgi:app - async read endpoints, everything else served by the
+# Flask app (see app.asgi)
+app = create_asgi_app()
@@ -0,0 +1,192 @@
+"""
+Load test: the sync (WSGI) app against the async (ASGI) app, same worker
+count, same read-heavy request mix, at increasing client concurrency.
+
+Reports throughput, p50/p99 latency and errors per concurrency level. The
+gap shows up when requests wait on the database, so point MYSQL_URI at a
+MySQL server for meaningful numbers - against the default SQLite file both
+modes are CPU bound.
+
+Needs gunicorn for the sync mode and uvicorn (plus the async extras listed
+in app.asgi) for the async one.
+
+Usage: python -m benchmarks.async_load [--workers N] [--concurrency 8,64,256]
+       [--duration S] [--modes sync,async]
+"""
+
+import argparse
+import http.client
+import os
+import random
+import socket
+import statistics
+import subprocess
+import threading
+import time
+
+from benchmarks.seed import make_app, seed_dataset
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVERS = {
+    # the usual deployment - pre-forked sync workers, one request each
+    "sync": lambda port, workers: [
+        "gunicorn",
+        "--workers",
+        str(workers),
+        "--bind",
+        f"127.0.0.1:{port}",
+        "run:app",
+    ],
+    "async": lambda port, workers: [
+        "uvicorn",
+        "--workers",
+        str(workers),
+        "--port",
+        str(port),
+        "--log-level",
+        "warning",
+        "asgi:app",
+    ],
+}
+
+
+def request_mix(projects, tasks):
+    # mostly listings, some detail reads - the board and inbox traffic
+    return [
+        lambda: f"/api/project/{random.randint(1, projects)}/task/?per_page=20",
+        lambda: (
+            f"/api/project/{random.randint(1, projects)}/task/"
+            "?per_page=20&sort=-due_date&status=IN_PROGRESS"
+        ),
+        lambda: f"/api/project/{random.randint(1, projects)}/task/?cursor=&per_page=20",
+        lambda: f"/api/project/1/task/{random.randint(1, tasks)}",
+        lambda: "/api/project/?per_page=20",
+        lambda: "/api/user/?per_page=20",
+    ]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(port, process, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with {process.returncode}")
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/api/project/?per_page=1")
+            connection.getresponse().read()
+            connection.close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+def client(port, mix, stop, latencies, errors):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    while not stop.is_set():
+        path = random.choice(mix)()
+        start = time.perf_counter()
+        try:
+            connection.request("GET", path)
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                continue
+        except (OSError, http.client.HTTPException) as err:
+            errors.append(type(err).__name__)
+            connection.close()
+            continue
+        latencies.append(time.perf_counter() - start)
+    connection.close()
+
+
+def run_level(port, mix, concurrency, duration):
+    stop = threading.Event()
+    latencies, errors = [], []
+    threads = [
+        threading.Thread(target=client, args=(port, mix, stop, latencies, errors))
+        for _ in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99)] if latencies else 0
+    return {
+        "concurrency": concurrency,
+        "requests/s": round(len(latencies) / duration, 1),
+        "p50 ms": round(statistics.median(latencies or [0]) * 1000, 1),
+        "p99 ms": round(p99 * 1000, 1),
+        "errors": len(errors),
+    }
+
+
+def run_mode(mode, args, mix):
+    port = free_port()
+    # the async handlers do not go through the response cache, so neither
+    # mode uses it - both hit the database on every request
+    env = dict(os.environ, RESPONSE_CACHE_ENABLED="false")
+    process = subprocess.Popen(SERVERS[mode](port, args.workers), cwd=ROOT, env=env)
+    try:
+        wait_ready(port, process)
+        # warm up connection pools and imports in every worker
+        run_level(port, mix, args.workers * 2, 1)
+        return [
+            run_level(port, mix, concurrency, args.duration)
+            for concurrency in args.concurrency
+        ]
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--tasks-per-project", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--concurrency",
+        type=lambda value: [int(level) for level in value.split(",")],
+        default=[8, 64, 256],
+    )
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument(
+        "--modes", type=lambda value: value.split(","), default=["sync", "async"]
+    )
+    args = parser.parse_args()
+
+    app = make_app()
+    with app.app_context():
+        print(
+            seed_dataset(
+                projects=args.projects,
+                tasks_per_project=args.tasks_per_project,
+                users=200,
+            )
+        )
+    mix = request_mix(args.projects, args.tasks_per_project)
+
+    for mode in args.modes:
+        print(f"\n{mode} ({args.workers} workers)")
+        for result in run_mode(mode, args, mix):
+            print(
+                f"{mode:>6}  "
+                + "  ".join(f"{key}: {value}" for key, value in result.items())
+            )
+
+
+if __name__ == "__main__":
+    main()
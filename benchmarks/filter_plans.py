@@ -0,0 +1,95 @@
+"""
+Print the plan of every task listing filter against a seeded dataset, and
+exit non-zero if any of them scans the whole task table. The same check runs
+under pytest (tests/test_filter_plans.py); this script shows the plans, e.g.
+against MySQL with MYSQL_URI set.
+
+Usage: python -m benchmarks.filter_plans [--tasks-per-project N]
+"""
+
+import argparse
+import sys
+
+from sqlalchemy import select
+from werkzeug.datastructures import MultiDict
+
+from benchmarks.index_plans import explain
+from benchmarks.seed import make_app, seed_dataset
+from app import db
+from app.models import Task
+from app.utils.pagination import parse_sort, sort_clauses
+from app.utils.task_filters import parse_task_filters
+
+# one query string per filter, as a client would send it to get_tasks
+FILTER_CASES = {
+    "status": {"status": "Not Started,IN_PROGRESS"},
+    "due range": {"due_after": "2025-01-01", "due_before": "2025-02-01"},
+    "created_since": {"created_since": "2025-01-01", "sort_by": "created_at"},
+    "updated_since": {"updated_since": "2025-01-01"},
+    "name_prefix": {"name_prefix": "Task 1", "sort_by": "name", "order": "asc"},
+    "assignee": {"assignee": "1,2"},
+    "multi-column sort": {"sort": "-due_date,name"},
+}
+
+
+def listing_statement(project_id, args):
+    args = MultiDict(args)
+    return (
+        select(Task)
+        .where(Task.project_id == project_id, *parse_task_filters(args))
+        .order_by(
+            *sort_clauses(
+                Task, parse_sort(args, ["name", "created_at", "updated_at", "due_date"])
+            )
+        )
+        .limit(50)
+    )
+
+
+def full_scan(plan):
+    # SQLite: "SCAN task" without an index; MySQL: access type ALL on task
+    for line in plan:
+        if db.engine.dialect.name == "sqlite":
+            if "SCAN task" in line and "USING" not in line:
+                return True
+        elif "| task |" in f"| {line} |" and "| ALL |" in f"| {line} |":
+            return True
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--tasks-per-project", type=int, default=500)
+    parser.add_argument("--users", type=int, default=200)
+    args = parser.parse_args()
+
+    app = make_app()
+    failures = []
+    with app.app_context():
+        print(
+            seed_dataset(
+                projects=args.projects,
+                tasks_per_project=args.tasks_per_project,
+                users=args.users,
+            )
+        )
+        if db.engine.dialect.name == "sqlite":
+            db.session.execute(db.text("ANALYZE"))
+
+        for label, query_args in FILTER_CASES.items():
+            plan = explain(listing_statement(1, query_args))
+            status = "FULL SCAN" if full_scan(plan) else "ok"
+            if status != "ok":
+                failures.append(label)
+            print(f"\n== {label} {query_args}: {status}")
+            for line in plan:
+                print(f"    {line}")
+
+    if failures:
+        print(f"\nfull table scans: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Peak memory and time of the task import for growing sheets, xlsx and csv.
+
+The streaming import should stay flat as rows grow; "pandas load" is the
+first step of the previous import (read_excel plus the object conversion)
+for comparison. Peaks are Python allocations traced by tracemalloc, which
+also slows every run down.
+
+Usage: python -m benchmarks.import_memory [--rows 10000,50000] [--chunk-size N]
+"""
+
+import argparse
+import csv
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from benchmarks.seed import make_app, seed_dataset
+from app.utils.import_tasks import process_excel_data
+
+HEADER = ["name", "description", "status", "due_date", "users"]
+
+
+def sheet_rows(rows):
+    due_date = datetime(2030, 1, 1)
+    for row in range(rows):
+        yield [
+            f"Imported task {row}",
+            f"Row {row} of the import benchmark sheet",
+            ("Not Started", "In Progress", "Completed")[row % 3],
+            due_date + timedelta(hours=row),
+            f"user-{row % 50 + 1}, user-{row % 13 + 1}",
+        ]
+
+
+def write_sheet(path, rows):
+    if path.endswith(".csv"):
+        with open(path, "w", newline="") as output:
+            writer = csv.writer(output)
+            writer.writerow(HEADER)
+            for row in sheet_rows(rows):
+                writer.writerow(row[:3] + [row[3].isoformat(sep=" ")] + row[4:])
+        return
+
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(HEADER)
+    for row in sheet_rows(rows):
+        sheet.append(row)
+    workbook.save(path)
+
+
+def traced(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        func()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024 / 1024, elapsed
+
+
+def pandas_load(path):
+    import pandas as pd
+
+    df = pd.read_excel(path)
+    df.astype(object).where(pd.notna(df), None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--rows",
+        type=lambda value: [int(rows) for rows in value.split(",")],
+        default=[10000, 50000],
+    )
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+
+    # imported up front so its module allocations are not counted
+    import pandas  # noqa: F401
+
+    app = make_app()
+    directory = tempfile.mkdtemp()
+    print(
+        f"{'rows':>8} {'format':>7} {'step':>14} {'file MB':>8} {'peak MB':>8} {'s':>7}"
+    )
+
+    for rows in args.rows:
+        for extension in ("xlsx", "csv"):
+            path = os.path.join(directory, f"tasks-{rows}.{extension}")
+            write_sheet(path, rows)
+            size_mb = os.path.getsize(path) / 1024 / 1024
+
+            with app.app_context():
+                seed_dataset(projects=1, tasks_per_project=0, users=50)
+
+                def run_import():
+                    with open(path, "rb") as file:
+                        summary, error_response, _ = process_excel_data(
+                            file, 1, chunk_size=args.chunk_size
+                        )
+                    assert error_response is None and not summary["errors"], summary
+
+                steps = [("streaming", run_import)]
+                if extension == "xlsx":
+                    steps.append(("pandas load", lambda: pandas_load(path)))
+
+                for step, func in steps:
+                    peak_mb, elapsed = traced(func)
+                    print(
+                        f"{rows:>8} {extension:>7} {step:>14} {size_mb:>8.1f} "
+                        f"{peak_mb:>8.1f} {elapsed:>7.2f}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
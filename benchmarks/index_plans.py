@@ -0,0 +1,135 @@
+"""
+Show query plans and latency of the listing queries with and without the
+sort/filter indexes.
+
+Usage: python -m benchmarks.index_plans [--tasks-per-project N] [--runs N]
+"""
+
+import argparse
+import statistics
+import time
+
+from sqlalchemy import func, select
+
+from benchmarks.seed import make_app, seed_dataset
+from app import db
+from app.models import Project, Task, User
+from app.models.task import user_task
+
+
+def benchmark_queries(project_id, task_id):
+    # the statements the routes issue, by endpoint
+    return {
+        "get_tasks sort_by=updated_at": select(Task)
+        .where(Task.project_id == project_id)
+        .order_by(Task.updated_at.desc(), Task.id.desc())
+        .limit(50),
+        "get_tasks sort_by=due_date": select(Task)
+        .where(Task.project_id == project_id)
+        .order_by(Task.due_date.asc(), Task.id.asc())
+        .limit(50),
+        "tasks by status": select(Task.status, func.count())
+        .where(Task.project_id == project_id)
+        .group_by(Task.status),
+        "users of a task": select(User)
+        .join(user_task, user_task.c.user_id == User.id)
+        .where(user_task.c.task_id == task_id),
+        "get_user_tasks sort_by=due_date": select(Task)
+        .join(user_task, user_task.c.task_id == Task.id)
+        .where(user_task.c.user_id == 1)
+        .order_by(Task.due_date.asc(), Task.id.asc())
+        .limit(20),
+        "get_projects sort_by=name": select(Project)
+        .order_by(Project.name.asc(), Project.id.asc())
+        .limit(50),
+        "get_users sort_by=created_at": select(User)
+        .order_by(User.created_at.desc(), User.id.desc())
+        .limit(50),
+    }
+
+
+def explain(statement):
+    compiled = statement.compile(
+        dialect=db.engine.dialect, compile_kwargs={"literal_binds": True}
+    )
+    prefix = "EXPLAIN QUERY PLAN" if db.engine.dialect.name == "sqlite" else "EXPLAIN"
+    rows = db.session.execute(db.text(f"{prefix} {compiled}")).all()
+    return [" | ".join(str(value) for value in row) for row in rows]
+
+
+def measure(statement, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        db.session.execute(statement).all()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def benchmark_indexes():
+    return [
+        index
+        for table in db.metadata.tables.values()
+        for index in table.indexes
+        if index.name and index.name.startswith("ix_")
+    ]
+
+
+def run(runs):
+    queries = benchmark_queries(project_id=1, task_id=1)
+    results = {}
+    # refresh planner statistics after the index set changed
+    if db.engine.dialect.name == "sqlite":
+        db.session.execute(db.text("ANALYZE"))
+    else:
+        db.session.execute(db.text("ANALYZE TABLE project, task, user, user_tasks"))
+    for label, statement in queries.items():
+        results[label] = {"plan": explain(statement), "ms": measure(statement, runs)}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--tasks-per-project", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    app = make_app()
+    with app.app_context():
+        print(
+            seed_dataset(
+                projects=args.projects,
+                tasks_per_project=args.tasks_per_project,
+                users=args.users,
+            )
+        )
+
+        for index in benchmark_indexes():
+            try:
+                index.drop(bind=db.session.connection(), checkfirst=True)
+                db.session.commit()
+            except Exception as err:
+                # MySQL refuses to drop the last index backing a foreign key
+                db.session.rollback()
+                print(f"kept {index.name}: {err}")
+        before = run(args.runs)
+
+        for index in benchmark_indexes():
+            index.create(bind=db.session.connection(), checkfirst=True)
+        db.session.commit()
+        after = run(args.runs)
+
+    for label in before:
+        print(f"\n== {label}")
+        print(f"before: {before[label]['ms']:.2f} ms (median)")
+        for line in before[label]["plan"]:
+            print(f"    {line}")
+        print(f"after:  {after[label]['ms']:.2f} ms (median)")
+        for line in after[label]["plan"]:
+            print(f"    {line}")
+
+
+if __name__ == "__main__":
+    main()
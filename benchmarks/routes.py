@@ -0,0 +1,494 @@
+"""
+Route benchmark: every endpoint of the project, task and user blueprints,
+driven through the Flask test client against a seeded dataset.
+
+Reports per-route latency percentiles, throughput and SQL statements per
+request (from the Server-Timing header), and can save the results as a
+baseline or compare against one - a route whose p50 grows past the
+tolerance or that issues more SQL statements than before is flagged, and
+the exit status is 1.
+
+Usage: python -m benchmarks.routes [--requests N] [--only tasks.]
+       [--save-baseline PATH] [--compare PATH] [--tolerance 0.2]
+"""
+
+import argparse
+import io
+import json
+import re
+import statistics
+import sys
+import time
+from collections import namedtuple
+
+from benchmarks.seed import make_app, seed_dataset
+from app.extensions import events, response_cache
+
+SQL_COUNT = re.compile(r'desc="(\d+) queries"')
+
+# differences below this are timer noise, whatever the ratio
+NOISE_FLOOR_MS = 1.0
+
+XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# build(client, ctx, index) -> (path, request kwargs); any requests it makes
+# itself (e.g. creating the row a DELETE removes) are not timed. stream=True
+# reads only the first chunk of the response.
+Scenario = namedtuple("Scenario", "name method build stream", defaults=(False,))
+
+
+class Context(object):
+    """Dataset sizes plus the scratch project and rows write scenarios use."""
+
+    def __init__(self, dataset):
+        self.projects = dataset["projects"]
+        self.tasks = dataset["tasks"]
+        self.users = dataset["users"]
+        self.scratch_project_id = None
+        self.upload = None
+
+    def project_id(self, index):
+        return index % self.projects + 1
+
+    def task_id(self, index):
+        return index * 7919 % self.tasks + 1
+
+    def user_id(self, index):
+        return index * 31 % self.users + 1
+
+
+def created_id(response, key):
+    return response.get_json()[key]["id"]
+
+
+def new_task(client, ctx, index):
+    response = client.post(
+        f"/api/project/{ctx.scratch_project_id}/task/",
+        json={"name": f"bench-{index}", "due_date": "2030-01-01T00:00:00"},
+    )
+    return created_id(response, "task")
+
+
+def task_sheet(rows):
+    from openpyxl import Workbook
+
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["name", "description", "status", "due_date", "users"])
+    for row in range(rows):
+        sheet.append(
+            [
+                f"Imported {row}",
+                "imported by the route benchmark",
+                "In Progress",
+                "2030-01-01 00:00:00",
+                f"user-{row % 20 + 1}, user-{row % 7 + 1}",
+            ]
+        )
+    output = io.BytesIO()
+    workbook.save(output)
+    return output.getvalue()
+
+
+def build_delete_project(client, ctx, index):
+    response = client.post("/api/project/", json={"name": f"bench-delete-{index}"})
+    project_id = created_id(response, "project")
+    client.post(
+        f"/api/project/{project_id}/task/batch",
+        json={
+            "create": [
+                {"name": f"bench-{task}", "due_date": "2030-01-01T00:00:00"}
+                for task in range(20)
+            ]
+        },
+    )
+    return f"/api/project/{project_id}", {}
+
+
+def build_add_task_user(client, ctx, index):
+    task_id, user_id = new_task(client, ctx, index), ctx.user_id(index)
+    return f"/api/project/{ctx.scratch_project_id}/task/{task_id}/users/{user_id}", {}
+
+
+def build_remove_task_user(client, ctx, index):
+    task_id, user_id = new_task(client, ctx, index), ctx.user_id(index)
+    path = f"/api/project/{ctx.scratch_project_id}/task/{task_id}/users/{user_id}"
+    client.post(path)
+    return path, {}
+
+
+def build_delete_user(client, ctx, index):
+    response = client.post("/api/user/", json={"name": f"bench-delete-{index}"})
+    return f"/api/user/{created_id(response, 'user')}", {}
+
+
+# reads run first, on the seeded rows; writes go to a scratch project
+SCENARIOS = [
+    # project_routes
+    Scenario(
+        "projects.list",
+        "GET",
+        lambda client, ctx, i: ("/api/project/?per_page=20", {}),
+    ),
+    Scenario(
+        "projects.list_cursor",
+        "GET",
+        lambda client, ctx, i: ("/api/project/?cursor=&per_page=20", {}),
+    ),
+    Scenario(
+        "projects.detail",
+        "GET",
+        lambda client, ctx, i: (f"/api/project/{ctx.project_id(i)}", {}),
+    ),
+    Scenario(
+        "projects.stats",
+        "GET",
+        lambda client, ctx, i: (f"/api/project/{ctx.project_id(i)}/stats", {}),
+    ),
+    Scenario(
+        "projects.events",
+        "GET",
+        lambda client, ctx, i: (f"/api/project/{ctx.project_id(i)}/events", {}),
+        stream=True,
+    ),
+    # task_routes
+    Scenario(
+        "tasks.list",
+        "GET",
+        lambda client, ctx, i: (
+            f"/api/project/{ctx.project_id(i)}/task/?per_page=20",
+            {},
+        ),
+    ),
+    Scenario(
+        "tasks.list_filtered",
+        "GET",
+        lambda client, ctx, i: (
+            f"/api/project/{ctx.project_id(i)}/task/"
+            "?per_page=20&status=IN_PROGRESS&sort=-due_date,name",
+            {},
+        ),
+    ),
+    Scenario(
+        "tasks.list_cursor",
+        "GET",
+        lambda client, ctx, i: (
+            f"/api/project/{ctx.project_id(i)}/task/?cursor=&per_page=20",
+            {},
+        ),
+    ),
+    Scenario(
+        "tasks.list_sparse",
+        "GET",
+        lambda client, ctx, i: (
+            f"/api/project/{ctx.project_id(i)}/task/"
+            "?per_page=20&fields=id,name,status,due_date",
+            {},
+        ),
+    ),
+    Scenario(
+        "tasks.search",
+        "GET",
+        lambda client, ctx, i: (
+            f"/api/project/{ctx.project_id(i)}/task/search?q=invoice+report",
+            {},
+        ),
+    ),
+    Scenario(
+        "tasks.detail",
+        "GET",
+        lambda client, ctx, i: (
+            f"/api/project/{ctx.project_id(i)}/task/{ctx.task_id(i)}",
+            {},
+        ),
+    ),
+    Scenario(
+        "tasks.download_csv",
+        "GET",
+        lambda client, ctx, i: (
+            f"/api/project/{ctx.project_id(i)}/task/download?format=csv",
+            {},
+        ),
+    ),
+    Scenario(
+        "tasks.download_xlsx",
+        "GET",
+        lambda client, ctx, i: (
+            f"/api/project/{ctx.project_id(i)}/task/download?format=xlsx",
+            {},
+        ),
+    ),
+    # user_routes
+    Scenario(
+        "users.list",
+        "GET",
+        lambda client, ctx, i: ("/api/user/?per_page=20", {}),
+    ),
+    Scenario(
+        "users.list_cursor",
+        "GET",
+        lambda client, ctx, i: ("/api/user/?cursor=&per_page=20", {}),
+    ),
+    Scenario(
+        "users.detail",
+        "GET",
+        lambda client, ctx, i: (f"/api/user/{ctx.user_id(i)}", {}),
+    ),
+    Scenario(
+        "users.tasks",
+        "GET",
+        lambda client, ctx, i: (
+            f"/api/user/{ctx.user_id(i)}/tasks?per_page=20&status=IN_PROGRESS",
+            {},
+        ),
+    ),
+    # writes
+    Scenario(
+        "projects.create",
+        "POST",
+        lambda client, ctx, i: ("/api/project/", {"json": {"name": f"bench-{i}"}}),
+    ),
+    Scenario(
+        "projects.update",
+        "PUT",
+        lambda client, ctx, i: (
+            f"/api/project/{ctx.scratch_project_id}",
+            {"json": {"name": f"bench-scratch-{i}"}},
+        ),
+    ),
+    Scenario("projects.delete", "DELETE", build_delete_project),
+    Scenario(
+        "tasks.create",
+        "POST",
+        lambda client, ctx, i: (
+            f"/api/project/{ctx.scratch_project_id}/task/",
+            {
+                "json": {
+                    "name": f"bench-{i}",
+                    "due_date": "2030-01-01T00:00:00",
+                    "user_ids": [ctx.user_id(i), ctx.user_id(i + 1)],
+                }
+            },
+        ),
+    ),
+    Scenario(
+        "tasks.update",
+        "PUT",
+        lambda client, ctx, i: (
+            f"/api/project/{ctx.scratch_project_id}/task/{new_task(client, ctx, i)}",
+            {"json": {"status": "IN_PROGRESS", "user_ids": [ctx.user_id(i)]}},
+        ),
+    ),
+    Scenario("tasks.add_user", "POST", build_add_task_user),
+    Scenario("tasks.remove_user", "DELETE", build_remove_task_user),
+    Scenario(
+        "tasks.delete",
+        "DELETE",
+        lambda client, ctx, i: (
+            f"/api/project/{ctx.scratch_project_id}/task/{new_task(client, ctx, i)}",
+            {},
+        ),
+    ),
+    Scenario(
+        "tasks.batch",
+        "POST",
+        lambda client, ctx, i: (
+            f"/api/project/{ctx.scratch_project_id}/task/batch",
+            {
+                "json": {
+                    "create": [
+                        {"name": f"bench-{i}-{task}", "due_date": "2030-01-01"}
+                        for task in range(50)
+                    ]
+                }
+            },
+        ),
+    ),
+    Scenario(
+        "tasks.upload",
+        "POST",
+        lambda client, ctx, i: (
+            f"/api/project/{ctx.scratch_project_id}/task/upload",
+            {
+                "data": {"file": (io.BytesIO(ctx.upload), "tasks.xlsx", XLSX_MIMETYPE)},
+                "content_type": "multipart/form-data",
+            },
+        ),
+    ),
+    Scenario(
+        "users.create",
+        "POST",
+        lambda client, ctx, i: ("/api/user/", {"json": {"name": f"bench-{i}"}}),
+    ),
+    Scenario(
+        "users.update",
+        "PUT",
+        lambda client, ctx, i: (
+            f"/api/user/{ctx.user_id(i)}",
+            {"json": {"name": f"user-{ctx.user_id(i)}"}},
+        ),
+    ),
+    Scenario("users.delete", "DELETE", build_delete_user),
+]
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[
+        min(int(len(sorted_values) * fraction), len(sorted_values) - 1)
+    ]
+
+
+def run_scenario(client, ctx, scenario, requests, warmup):
+    latencies, sql_counts, errors = [], [], 0
+    for index in range(warmup + requests):
+        path, kwargs = scenario.build(client, ctx, index)
+        start = time.perf_counter()
+        response = client.open(
+            path, method=scenario.method, buffered=not scenario.stream, **kwargs
+        )
+        if scenario.stream:
+            next(iter(response.response))
+        else:
+            response.get_data()
+        elapsed = time.perf_counter() - start
+        response.close()
+
+        if index < warmup:
+            continue
+        latencies.append(elapsed * 1000)
+        match = SQL_COUNT.search(response.headers.get("Server-Timing", ""))
+        sql_counts.append(int(match.group(1)) if match else 0)
+        if response.status_code >= 400:
+            errors += 1
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "requests_per_s": round(1000 * requests / sum(latencies), 1),
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "sql_avg": round(statistics.mean(sql_counts), 2),
+        "sql_max": max(sql_counts),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """
+    Routes that got slower than the baseline by more than tolerance (and the
+    noise floor), or issue more SQL statements than they did.
+
+    :return: list of (route, message)
+    """
+
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        if result["sql_max"] > before["sql_max"]:
+            regressions.append(
+                (name, f"SQL statements {before['sql_max']} -> {result['sql_max']}")
+            )
+        slower_ms = result["p50_ms"] - before["p50_ms"]
+        if slower_ms > NOISE_FLOOR_MS and slower_ms > before["p50_ms"] * tolerance:
+            regressions.append(
+                (name, f"p50 {before['p50_ms']:.2f} -> {result['p50_ms']:.2f} ms")
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--projects", type=int, default=10)
+    parser.add_argument("--tasks-per-project", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--assignees", type=int, default=2)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--upload-rows", type=int, default=200)
+    parser.add_argument(
+        "--only", help="run the scenarios whose name starts with this prefix"
+    )
+    parser.add_argument(
+        "--with-cache",
+        action="store_true",
+        help="keep the response cache on (measures cache hits for GETs)",
+    )
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--compare", metavar="PATH")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="allowed p50 slowdown against the baseline, as a fraction",
+    )
+    args = parser.parse_args()
+
+    app = make_app()
+    response_cache.enabled = args.with_cache
+    # one process, so the in-process broker reaches every stream
+    events.enabled = True
+    dataset_args = {
+        "projects": args.projects,
+        "tasks_per_project": args.tasks_per_project,
+        "users": args.users,
+        "assignees": args.assignees,
+    }
+    with app.app_context():
+        dataset = seed_dataset(**dataset_args)
+    print(dataset)
+
+    client = app.test_client()
+    ctx = Context(dataset)
+    response = client.post("/api/project/", json={"name": "bench-scratch"})
+    ctx.scratch_project_id = created_id(response, "project")
+    ctx.upload = task_sheet(args.upload_rows)
+
+    scenarios = [
+        scenario
+        for scenario in SCENARIOS
+        if not args.only or scenario.name.startswith(args.only)
+    ]
+    results = {}
+    print(
+        f"{'route':<22} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+        f"{'sql avg':>8} {'sql max':>8} {'errors':>7}"
+    )
+    for scenario in scenarios:
+        result = run_scenario(client, ctx, scenario, args.requests, args.warmup)
+        results[scenario.name] = result
+        print(
+            f"{scenario.name:<22} {result['requests_per_s']:>8} "
+            f"{result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+            f"{result['p99_ms']:>8.2f} {result['sql_avg']:>8} "
+            f"{result['sql_max']:>8} {result['errors']:>7}"
+        )
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as output:
+            json.dump(
+                {"dataset": dataset_args, "requests": args.requests, "routes": results},
+                output,
+                indent=2,
+                sort_keys=True,
+            )
+        print(f"\nbaseline saved to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline["dataset"] != dataset_args:
+            print(f"\nwarning: baseline was recorded on {baseline['dataset']}")
+
+        regressions = compare(results, baseline["routes"], args.tolerance)
+        print(f"\n{len(regressions)} regression(s) against {args.compare}")
+        for name, message in regressions:
+            print(f"  {name}: {message}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Compare full-text task search against the LIKE '%term%' scan it replaces.
+
+Usage: python -m benchmarks.search [--tasks-per-project N] [--runs N]
+"""
+
+import argparse
+import statistics
+import time
+
+from sqlalchemy import or_, select
+
+from benchmarks.seed import make_app, seed_dataset
+from app import db
+from app.models import Task
+from app.utils.search import search_tasks
+
+TERMS = ("login", "invoice report", "webhook", "nonexistent")
+
+
+def like_search(text, project_id=None, per_page=10):
+    statement = select(Task.id)
+    for term in text.split():
+        pattern = f"%{term}%"
+        statement = statement.where(
+            or_(Task.name.ilike(pattern), Task.description.ilike(pattern))
+        )
+    if project_id is not None:
+        statement = statement.where(Task.project_id == project_id)
+    return db.session.execute(statement.limit(per_page)).scalars().all()
+
+
+def measure(func, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--tasks-per-project", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    app = make_app()
+    with app.app_context():
+        print(
+            seed_dataset(
+                projects=args.projects,
+                tasks_per_project=args.tasks_per_project,
+                users=args.users,
+            )
+        )
+        print(f"search backend: {db.engine.dialect.name}")
+
+        for term in TERMS:
+            for project_id in (None, 1):
+                scope = "global" if project_id is None else f"project {project_id}"
+                like_ms = measure(lambda: like_search(term, project_id), args.runs)
+                search_ms = measure(lambda: search_tasks(term, project_id), args.runs)
+                total, _ = search_tasks(term, project_id)
+                print(f"\n== {term!r} ({scope}, {total} matches)")
+                print(f"like:   {like_ms:.2f} ms (median)")
+                print(f"search: {search_ms:.2f} ms (median)")
+
+
+if __name__ == "__main__":
+    main()
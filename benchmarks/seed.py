@@ -0,0 +1,119 @@
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta
+
+# benchmarks run against a throwaway SQLite file unless MYSQL_URI is set
+os.environ.setdefault(
+    "MYSQL_URI",
+    "sqlite:///" + os.path.join(tempfile.mkdtemp(), "taskify-benchmark.db"),
+)
+
+from app import create_app, db  # noqa: E402
+from app.models import Project, Task, User  # noqa: E402
+from app.models.task import StatusEnum, user_task  # noqa: E402
+
+CHUNK_SIZE = 5000
+
+
+# words sprinkled into task descriptions so search benchmarks have something
+# to match with varying selectivity
+VOCABULARY = (
+    "login email invoice report export import deploy release backend frontend "
+    "database migration cache latency timeout retry payment refund onboarding "
+    "dashboard billing audit security upgrade mobile android ios search index "
+    "notification webhook schedule calendar"
+).split()
+
+
+def _insert_chunked(table, rows):
+    for start in range(0, len(rows), CHUNK_SIZE):
+        db.session.execute(table.insert(), rows[start : start + CHUNK_SIZE])
+
+
+def seed_dataset(projects=20, tasks_per_project=2000, users=200, assignees=2, seed=0):
+    """
+    Fill the configured database with a synthetic dataset.
+
+    Must be called inside an app context. Existing rows are removed first.
+
+    :param projects: Number of projects
+    :param tasks_per_project: Number of tasks in every project
+    :param users: Number of users
+    :param assignees: Number of users assigned to every task
+    :param seed: Random seed, so runs are comparable
+    :return: dict with the number of rows inserted per table
+    """
+
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    statuses = [status.name for status in StatusEnum]
+
+    db.session.execute(user_task.delete())
+    for model in (Task, User, Project):
+        db.session.execute(model.__table__.delete())
+
+    _insert_chunked(
+        Project.__table__,
+        [
+            {
+                "id": project_id,
+                "name": f"Project {project_id}",
+                "created_at": now - timedelta(minutes=rng.randint(0, 100000)),
+                "updated_at": now - timedelta(minutes=rng.randint(0, 100000)),
+            }
+            for project_id in range(1, projects + 1)
+        ],
+    )
+    _insert_chunked(
+        User.__table__,
+        [
+            {
+                "id": user_id,
+                "name": f"user-{user_id}",
+                "created_at": now - timedelta(minutes=rng.randint(0, 100000)),
+                "updated_at": now - timedelta(minutes=rng.randint(0, 100000)),
+            }
+            for user_id in range(1, users + 1)
+        ],
+    )
+
+    tasks, assignments = [], []
+    task_id = 0
+    for project_id in range(1, projects + 1):
+        for _ in range(tasks_per_project):
+            task_id += 1
+            tasks.append(
+                {
+                    "id": task_id,
+                    "name": f"Task {task_id}",
+                    "description": f"Synthetic task {task_id} of project {project_id}: "
+                    + " ".join(rng.sample(VOCABULARY, 6)),
+                    "status": rng.choice(statuses),
+                    "due_date": now + timedelta(days=rng.randint(-60, 120)),
+                    "project_id": project_id,
+                    "created_at": now - timedelta(minutes=rng.randint(0, 100000)),
+                    "updated_at": now - timedelta(minutes=rng.randint(0, 100000)),
+                }
+            )
+            for user_id in rng.sample(range(1, users + 1), min(assignees, users)):
+                assignments.append({"user_id": user_id, "task_id": task_id})
+
+    _insert_chunked(Task.__table__, tasks)
+    _insert_chunked(user_task, assignments)
+    db.session.commit()
+
+    return {
+        "projects": projects,
+        "tasks": len(tasks),
+        "users": users,
+        "user_tasks": len(assignments),
+    }
+
+
+def make_app():
+    """Create the Flask app against the benchmark database, with its schema."""
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    return app
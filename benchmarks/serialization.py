@@ -0,0 +1,72 @@
+"""
+Bytes sent and time spent per task listing page: full documents against a
+sparse fieldset, encoded with the stdlib json module and with orjson.
+
+Usage: python -m benchmarks.serialization [--tasks-per-project N] [--runs N]
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmarks.seed import make_app, seed_dataset
+from app.extensions import response_cache
+from app.utils.json_provider import orjson
+
+PAGE_SIZES = (10, 50, 200)
+FIELDSETS = {"full": None, "mobile": "id,name,status,due_date"}
+
+
+def measure(func, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--projects", type=int, default=5)
+    parser.add_argument("--tasks-per-project", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    app = make_app()
+    # measure the view, not the response cache
+    response_cache.enabled = False
+    with app.app_context():
+        print(
+            seed_dataset(
+                projects=args.projects,
+                tasks_per_project=args.tasks_per_project,
+                users=args.users,
+            )
+        )
+    client = app.test_client()
+
+    encoders = ["json", "orjson"] if orjson is not None else ["json"]
+    print(
+        f"{'page':>5} {'fields':>7} {'encoder':>7} {'bytes':>8} {'request ms':>11} {'encode ms':>10}"
+    )
+    for per_page in PAGE_SIZES:
+        for label, fields in FIELDSETS.items():
+            url = f"/api/project/1/task/?per_page={per_page}"
+            if fields:
+                url += f"&fields={fields}"
+
+            for encoder in encoders:
+                app.json.use_orjson = encoder == "orjson"
+                request_ms, response = measure(lambda: client.get(url), args.runs)
+                payload = response.get_json()
+                encode_ms, _ = measure(lambda: app.json.response(payload), args.runs)
+                print(
+                    f"{per_page:>5} {label:>7} {encoder:>7} "
+                    f"{len(response.get_data()):>8} {request_ms:>11.2f} {encode_ms:>10.3f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
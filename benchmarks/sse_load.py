@@ -0,0 +1,179 @@
+"""
+Load test: board clients polling the task listing against the same clients
+holding one Server-Sent Events stream each, while a writer creates tasks.
+
+Reports requests, bytes and how stale each client's view gets (time from a
+write to the client seeing it).
+
+Usage: python -m benchmarks.sse_load [--clients N] [--poll-interval S] [--duration S]
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import statistics
+import threading
+import time
+
+from werkzeug.serving import make_server
+
+from benchmarks.seed import make_app, seed_dataset
+from app.extensions import events
+
+
+class Stats(object):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.bytes = 0
+        self.lags = []
+
+    def add(self, requests=0, size=0, lags=()):
+        with self.lock:
+            self.requests += requests
+            self.bytes += size
+            self.lags.extend(lags)
+
+
+def writer(port, projects, rate, stop, written):
+    # new task every 1/rate seconds, stamped with its creation time
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    index = 0
+    while not stop.is_set():
+        project_id = index % projects + 1
+        body = json.dumps(
+            {
+                "name": f"load-{index}",
+                "description": repr(time.time()),
+                "due_date": "2030-01-01T00:00:00",
+            }
+        )
+        connection.request(
+            "POST",
+            f"/api/project/{project_id}/task/",
+            body,
+            {"Content-Type": "application/json"},
+        )
+        connection.getresponse().read()
+        written.append(index)
+        index += 1
+        stop.wait(1 / rate)
+    connection.close()
+
+
+def poller(port, project_id, interval, stop, stats):
+    # the board UI today - refetch the first page, diff locally
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    seen = set()
+    while not stop.is_set():
+        connection.request("GET", f"/api/project/{project_id}/task/?per_page=20")
+        body = connection.getresponse().read()
+        now = time.time()
+        lags = []
+        for task in json.loads(body)["tasks"]:
+            if task["name"].startswith("load-") and task["id"] not in seen:
+                seen.add(task["id"])
+                lags.append(now - float(task["description"]))
+        stats.add(requests=1, size=len(body), lags=lags)
+        stop.wait(interval)
+    connection.close()
+
+
+def subscriber(port, project_id, stop, stats):
+    # the server's heartbeat wakes readline up, so stop is checked regularly
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    connection.request("GET", f"/api/project/{project_id}/events")
+    response = connection.getresponse()
+    stats.add(requests=1)
+    while not stop.is_set():
+        line = response.fp.readline()
+        if not line:
+            break
+        lags = []
+        if line.startswith(b"data: "):
+            data = json.loads(line[6:])
+            if str(data.get("name", "")).startswith("load-"):
+                lags.append(time.time() - float(data["description"]))
+        stats.add(size=len(line), lags=lags)
+    connection.close()
+
+
+def run(mode, app_port, args):
+    stop = threading.Event()
+    stats = Stats()
+    written = []
+    threads = []
+    for client in range(args.clients):
+        project_id = client % args.projects + 1
+        if mode == "poll":
+            target = poller
+            target_args = (app_port, project_id, args.poll_interval, stop, stats)
+        else:
+            target = subscriber
+            target_args = (app_port, project_id, stop, stats)
+        threads.append(threading.Thread(target=target, args=target_args))
+    threads.append(
+        threading.Thread(
+            target=writer,
+            args=(app_port, args.projects, args.writes_per_second, stop, written),
+        )
+    )
+
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    lags = sorted(stats.lags) or [0]
+    return {
+        "mode": mode,
+        "writes": len(written),
+        "client requests": stats.requests,
+        "requests/s": round(stats.requests / args.duration, 1),
+        "bytes received": stats.bytes,
+        "updates seen": len(stats.lags),
+        "staleness p50 ms": round(statistics.median(lags) * 1000, 1),
+        "staleness max ms": round(lags[-1] * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--projects", type=int, default=5)
+    parser.add_argument("--tasks-per-project", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--poll-interval", type=float, default=2.0)
+    parser.add_argument("--writes-per-second", type=float, default=2.0)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    app = make_app()
+    with app.app_context():
+        print(
+            seed_dataset(
+                projects=args.projects,
+                tasks_per_project=args.tasks_per_project,
+                users=20,
+            )
+        )
+    # short heartbeats so both ends notice the run is over
+    events.heartbeat = 1
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        for mode in ("poll", "sse"):
+            result = run(mode, server.server_port, args)
+            print(
+                "\n" + "\n".join(f"{key:>18}: {value}" for key, value in result.items())
+            )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Worker startup cost: time to import the app and run create_app, resident
+memory afterwards and the slowest imports, each measured in a fresh
+interpreter. --eager-excel preloads pandas and openpyxl the way the app
+used to at import time, for comparison.
+
+Usage: python -m benchmarks.startup [--runs N] [--eager-excel] [--top N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+CHILD = r"""
+import json, sys, time
+start = time.perf_counter()
+if {eager_excel!r}:
+    import openpyxl, pandas
+from app import create_app
+create_app()
+elapsed = time.perf_counter() - start
+
+rss_kb = None
+with open("/proc/self/status") as status:
+    for line in status:
+        if line.startswith("VmRSS:"):
+            rss_kb = int(line.split()[1])
+if rss_kb is None:
+    import resource
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+print(json.dumps({{
+    "ms": elapsed * 1000,
+    "rss_mb": rss_kb / 1024,
+    "excel_loaded": [name for name in ("pandas", "openpyxl") if name in sys.modules],
+}}))
+"""
+
+
+def child_env():
+    env = dict(os.environ)
+    # nothing is created or queried at boot, any database URI will do
+    env.setdefault(
+        "MYSQL_URI", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "startup.db")
+    )
+    return env
+
+
+def run_child(code, extra_args=()):
+    result = subprocess.run(
+        [sys.executable, *extra_args, "-c", code],
+        capture_output=True,
+        text=True,
+        env=child_env(),
+        check=True,
+    )
+    return result
+
+
+def import_profile(eager_excel, top):
+    # -X importtime writes "import time: self | cumulative | module" to stderr;
+    # self time summed per top-level package shows which dependency costs what
+    code = CHILD.format(eager_excel=eager_excel)
+    stderr = run_child(code, ["-X", "importtime"]).stderr
+    totals = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, _, module = line[len("import time:") :].split("|")
+        package = module.strip().split(".")[0]
+        totals[package] = totals.get(package, 0) + int(self_us)
+    return sorted(((us, package) for package, us in totals.items()), reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--eager-excel", action="store_true")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    code = CHILD.format(eager_excel=args.eager_excel)
+    # first run warms the bytecode cache and the OS file cache
+    run_child(code)
+    samples = [json.loads(run_child(code).stdout) for _ in range(args.runs)]
+
+    print(f"create_app, {args.runs} fresh interpreters")
+    print(
+        f"  import + create_app: {statistics.median(s['ms'] for s in samples):.0f} ms (median)"
+    )
+    print(
+        f"  RSS after startup:   {statistics.median(s['rss_mb'] for s in samples):.1f} MB (median)"
+    )
+    print(f"  excel libs loaded:   {samples[0]['excel_loaded'] or 'none'}")
+
+    print("\nimport time by package (self time summed)")
+    for self_us, package in import_profile(args.eager_excel, args.top):
+        print(f"  {self_us / 1000:8.1f} ms  {package}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""project and user name_key
+
+Revision ID: b7c3e9f15a28
+Revises: a4d2e8f61c57
+Create Date: 2026-10-17 20:41:37.502914
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7c3e9f15a28'
+down_revision = 'a4d2e8f61c57'
+branch_labels = None
+depends_on = None
+
+
+def name_keys(table_name):
+    # same normalization as app.models.name_key.normalize_name
+    table = sa.table(table_name, sa.column('id', sa.Integer), sa.column('name', sa.String))
+    ids_by_key = {}
+    for row_id, name in op.get_bind().execute(sa.select(table.c.id, table.c.name)):
+        ids_by_key.setdefault(name.strip().casefold(), []).append(row_id)
+
+    collisions = {key: ids for key, ids in ids_by_key.items() if len(ids) > 1}
+    if collisions:
+        raise RuntimeError(
+            f'{table_name} names must be unique once trimmed and case-folded; '
+            f'rename or merge these rows first (name key: ids): {collisions}'
+        )
+    return ids_by_key
+
+
+def upgrade():
+    # checked up front - MySQL cannot roll back a half-applied ALTER
+    keys = {table_name: name_keys(table_name) for table_name in ('project', 'user')}
+
+    for table_name, ids_by_key in keys.items():
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('name_key', sa.String(length=100), nullable=True))
+
+        if ids_by_key:
+            table = sa.table(table_name, sa.column('id', sa.Integer), sa.column('name_key', sa.String))
+            op.get_bind().execute(
+                table.update()
+                .where(table.c.id == sa.bindparam('row_id'))
+                .values(name_key=sa.bindparam('key')),
+                [{'row_id': ids[0], 'key': key} for key, ids in ids_by_key.items()],
+            )
+
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.alter_column('name_key',
+                   existing_type=sa.String(length=100),
+                   nullable=False)
+            batch_op.create_index(f'uq_{table_name}_name_key', ['name_key'], unique=True)
+
+
+def downgrade():
+    for table_name in ('user', 'project'):
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.drop_index(f'uq_{table_name}_name_key')
+            batch_op.drop_column('name_key')
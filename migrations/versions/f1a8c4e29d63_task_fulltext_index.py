@@ -0,0 +1,33 @@
+"""task fulltext index
+
+Revision ID: f1a8c4e29d63
+Revises: c7e5a9d3b180
+Create Date: 2026-10-17 13:58:12.664015
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1a8c4e29d63'
+down_revision = 'c7e5a9d3b180'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FULLTEXT indexes only exist on MySQL
+    if op.get_bind().dialect.name != 'mysql':
+        return
+
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.create_index('ft_task_name_description', ['name', 'description'], unique=False, mysql_prefix='FULLTEXT')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'mysql':
+        return
+
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.drop_index('ft_task_name_description')
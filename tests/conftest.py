@@ -0,0 +1,62 @@
+import os
+import tempfile
+
+# every test run gets a throwaway SQLite file; the response cache is switched
+# on per test where it is exercised
+os.environ["MYSQL_URI"] = "sqlite:///" + os.path.join(
+    tempfile.mkdtemp(), "taskify-test.db"
+)
+os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+
+import pytest  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app import create_app, db  # noqa: E402
+from app.extensions import response_cache  # noqa: E402
+from benchmarks.seed import seed_dataset  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.app_context():
+        db.create_all()
+        seed_dataset(projects=2, tasks_per_project=60, users=10)
+        yield app
+        db.session.remove()
+        db.drop_all()
+    response_cache.enabled = False
+    response_cache.backend.clear()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+class QueryCounter(object):
+    """SQL statements sent to the database while the counter is attached."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    def __len__(self):
+        return len(self.statements)
+
+
+@pytest.fixture
+def count_queries(app):
+    return lambda: QueryCounter(db.engine)
@@ -0,0 +1,62 @@
+"""Validation of the task batch endpoint."""
+
+import pytest
+
+from app import db
+from app.models import Task
+
+
+def batch(client, payload):
+    return client.post("/api/project/1/task/batch", json=payload)
+
+
+@pytest.mark.parametrize(
+    "payload, error",
+    [
+        ({"update": [{"id": 3, "status": ["x"]}]}, "Invalid status: ['x']"),
+        ({"update": [{"id": 3, "status": {"a": 1}}]}, "Invalid status: {'a': 1}"),
+        ({"update": [{"id": 3, "name": 5}]}, "name must be a string"),
+        ({"update": [{"id": 3, "name": "x" * 101}]}, "name can be at most 100"),
+        ({"update": [{"id": 3, "description": ["x"]}]}, "description must be a string"),
+        ({"update": [{"id": 3, "user_ids": [True]}]}, "user_ids must be integers"),
+        ({"update": [{"id": 3, "user_ids": ["1"]}]}, "user_ids must be integers"),
+        ({"update": [{"id": True, "name": "Renamed"}]}, "id is required"),
+        ({"delete": [True]}, "id must be an integer"),
+        (
+            {"create": [{"name": ["x"], "due_date": "2030-01-01T00:00:00"}]},
+            "name must be a string",
+        ),
+    ],
+)
+def test_invalid_items_are_rejected(client, payload, error):
+    response = batch(client, payload)
+    assert response.status_code == 400
+    (result,) = response.get_json()["results"]
+    assert result["error"].startswith(error)
+    assert result.get("id") is not True
+
+
+def test_bool_id_does_not_touch_task_one(client):
+    name = db.session.get(Task, 1).name
+    batch(client, {"update": [{"id": True, "name": "Renamed"}], "delete": [True]})
+    assert db.session.get(Task, 1).name == name
+
+
+def test_created_tasks_get_their_own_users(client):
+    response = batch(
+        client,
+        {
+            "create": [
+                {
+                    "name": f"Batch {index}",
+                    "due_date": "2030-01-01T00:00:00",
+                    "user_ids": [index + 1],
+                }
+                for index in range(5)
+            ]
+        },
+    )
+    assert response.status_code == 200
+    for index, result in enumerate(response.get_json()["results"]):
+        assert result["task"]["name"] == f"Batch {index}"
+        assert [user["user_id"] for user in result["task"]["users"]] == [index + 1]
@@ -0,0 +1,128 @@
+"""
+Conditional GETs (If-None-Match / If-Modified-Since) and how their
+validators interact with the response cache.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import update
+
+from app import db
+from app.extensions import response_cache
+from app.models import Project
+
+
+def rename_elsewhere(project_id, name):
+    # a write on another worker - the row changes, this worker's cache tags
+    # are never invalidated
+    db.session.execute(
+        update(Project)
+        .where(Project.id == project_id)
+        .values(name=name, updated_at=datetime.utcnow())
+    )
+    db.session.commit()
+
+
+def test_if_none_match_on_detail(client):
+    response = client.get("/api/project/1")
+    etag = response.headers["ETag"]
+
+    response = client.get("/api/project/1", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+    client.put("/api/project/1", json={"name": "Renamed"})
+    response = client.get("/api/project/1", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.get_json()["name"] == "Renamed"
+
+
+def test_if_modified_since_on_detail(client):
+    response = client.get("/api/project/1")
+    last_modified = response.headers["Last-Modified"]
+
+    response = client.get("/api/project/1", headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 304
+
+    client.put("/api/project/1", json={"name": "Renamed"})
+    response = client.get("/api/project/1", headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 200
+
+
+def test_listing_validators_change_with_rows_on_other_pages(client):
+    path = "/api/project/1/task/?per_page=5&sort_by=created_at&order=asc"
+    response = client.get(path)
+    etag = response.headers["ETag"]
+    last_modified = response.headers["Last-Modified"]
+    total = response.get_json()["total"]
+
+    response = client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    # the newest task lands on the last page, not this one
+    client.post(
+        "/api/project/1/task/",
+        json={"name": "Late", "due_date": "2030-01-01T00:00:00"},
+    )
+    response = client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.get_json()["total"] == total + 1
+    etag = response.headers["ETag"]
+
+    # and a delete on another page
+    pages = response.get_json()["pages"]
+    other_page = client.get(f"{path}&page={pages - 1}").get_json()["tasks"]
+    client.delete(f"/api/project/1/task/{other_page[0]['id']}")
+    response = client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.get_json()["total"] == total
+
+    response = client.get(path, headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 200
+
+
+def test_project_listing_etag_changes_with_total(client):
+    path = "/api/project/?per_page=1&sort_by=created_at&order=asc"
+    response = client.get(path)
+    etag = response.headers["ETag"]
+
+    client.post("/api/project/", json={"name": "Another"})
+    response = client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_cached_body_is_not_served_under_a_newer_etag(client):
+    response_cache.enabled = True
+
+    response = client.get("/api/project/1")
+    assert response.headers["X-Cache"] == "MISS"
+    response = client.get("/api/project/1")
+    assert response.headers["X-Cache"] == "HIT"
+
+    rename_elsewhere(1, "Renamed elsewhere")
+
+    response = client.get("/api/project/1")
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.get_json()["name"] == "Renamed elsewhere"
+
+    response = client.get(
+        "/api/project/1", headers={"If-None-Match": response.headers["ETag"]}
+    )
+    assert response.status_code == 304
+
+
+def test_cached_listing_is_not_served_under_a_newer_etag(client):
+    response_cache.enabled = True
+    path = "/api/project/?per_page=5"
+
+    client.get(path)
+    assert client.get(path).headers["X-Cache"] == "HIT"
+
+    rename_elsewhere(1, "Renamed elsewhere")
+
+    response = client.get(path)
+    assert response.headers["X-Cache"] == "MISS"
+    assert "Renamed elsewhere" in [
+        project["name"] for project in response.get_json()["projects"]
+    ]
@@ -0,0 +1,44 @@
+"""Server-sent task events."""
+
+import pytest
+
+from app.extensions import events
+
+
+@pytest.fixture
+def events_enabled():
+    events.enabled = True
+    yield events
+    events.enabled = False
+
+
+def test_stream_is_refused_without_a_shared_broker(client):
+    assert not events.enabled
+    response = client.get("/api/project/1/events")
+    assert response.status_code == 400
+    assert "EVENT_BROKER_BACKEND" in response.get_json()["error"]
+
+
+def test_stream_sends_published_events(client, events_enabled):
+    response = client.get("/api/project/1/events", buffered=False)
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+
+    chunks = response.response
+    assert next(chunks) == b"retry: 3000\n\n"
+    assert events.stats()["subscribers"] == 1
+
+    events.publish(1, "task.updated", {"id": 1})
+    assert b"task.updated" in next(chunks)
+
+    response.close()
+    assert events.stats()["subscribers"] == 0
+
+
+def test_unstarted_stream_leaves_no_subscription(app, events_enabled):
+    # the client went away before the response body was iterated
+    stream = events.stream(1)
+    assert events.stats()["subscribers"] == 0
+    stream.close()
+    del stream
+    assert events.stats()["subscribers"] == 0
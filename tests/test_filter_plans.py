@@ -0,0 +1,22 @@
+"""Every task listing filter must compile to a query the indexes serve."""
+
+import pytest
+
+from app import db
+from benchmarks.filter_plans import FILTER_CASES, full_scan, listing_statement
+from benchmarks.index_plans import explain
+from benchmarks.seed import seed_dataset
+
+
+@pytest.fixture
+def analyzed(app):
+    # enough rows for the planner to prefer the indexes, and statistics for it
+    seed_dataset(projects=20, tasks_per_project=200, users=50)
+    if db.engine.dialect.name == "sqlite":
+        db.session.execute(db.text("ANALYZE"))
+
+
+@pytest.mark.parametrize("label", list(FILTER_CASES))
+def test_filter_does_not_scan_the_task_table(analyzed, label):
+    plan = explain(listing_statement(1, FILTER_CASES[label]))
+    assert not full_scan(plan), "\n".join(plan)
@@ -0,0 +1,72 @@
+"""Excel/CSV task import."""
+
+import io
+
+from app import db
+from app.models import Project, Task, normalize_name
+
+
+def upload(client, project_id, sheet):
+    return client.post(
+        f"/api/project/{project_id}/task/upload",
+        data={"file": (io.BytesIO(sheet.encode()), "tasks.csv", "text/csv")},
+        content_type="multipart/form-data",
+    )
+
+
+def test_blank_project_cell_uses_the_upload_project(client):
+    projects = db.session.query(Project).count()
+    response = upload(
+        client,
+        2,
+        "name,due_date,project\n"
+        "Blank,2030-01-01,   \n"
+        "Empty,2030-01-01,\n"
+        "Named,2030-01-01, Project 1 \n",
+    )
+    assert response.status_code == 200, response.get_json()
+    assert response.get_json()["task_upload_summary"]["created_successfully"] == 3
+
+    assert db.session.query(Project).count() == projects
+    project_ids = dict(
+        db.session.query(Task.name, Task.project_id).filter(
+            Task.name.in_(["Blank", "Empty", "Named"])
+        )
+    )
+    assert project_ids == {"Blank": 2, "Empty": 2, "Named": 1}
+
+
+def test_imported_tasks_get_their_own_users(client):
+    sheet = "name,due_date,users\n" + "".join(
+        f"Row {row},2030-01-01,user-{row % 10 + 1}\n" for row in range(30)
+    )
+    response = upload(client, 1, sheet)
+    assert response.status_code == 200, response.get_json()
+
+    tasks = Task.query.filter(Task.name.like("Row %")).all()
+    assert len(tasks) == 30
+    for task in tasks:
+        row = int(task.name.split()[1])
+        assert [user.name for user in task.users] == [f"user-{row % 10 + 1}"]
+        assert task.created_at is not None and task.updated_at is not None
+
+
+def test_import_sees_a_rename_made_by_another_worker(client):
+    sheet = "name,due_date,project\nFirst,2030-01-01,Project 1\n"
+    assert upload(client, 2, sheet).status_code == 200
+
+    # renamed on another worker - this one's name cache is never told
+    db.session.execute(
+        db.update(Project)
+        .where(Project.id == 1)
+        .values(name="Renamed", name_key=normalize_name("Renamed"))
+    )
+    db.session.commit()
+
+    sheet = "name,due_date,project\nSecond,2030-01-01,Project 1\n"
+    response = upload(client, 2, sheet)
+    assert response.status_code == 200, response.get_json()
+
+    project_id = db.session.query(Task.project_id).filter_by(name="Second").scalar()
+    assert project_id != 1
+    assert db.session.get(Project, project_id).name == "Project 1"
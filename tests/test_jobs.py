@@ -0,0 +1,57 @@
+"""Background import/export jobs."""
+
+import os
+import time
+
+import pytest
+
+from app.extensions import jobs
+
+
+@pytest.fixture
+def jobs_enabled():
+    jobs.enabled = True
+    yield jobs
+    jobs.enabled = False
+
+
+def wait_for(job_id, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = jobs.get(job_id)
+        if job and job["status"] in ("finished", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_async_is_refused_without_a_shared_backend(client):
+    assert not jobs.enabled
+    response = client.get("/api/project/1/task/download?format=csv&async=true")
+    assert response.status_code == 400
+    assert "JOB_BACKEND" in response.get_json()["error"]
+
+
+def test_export_file_is_removed_when_the_job_is_evicted(client, jobs_enabled):
+    response = client.get("/api/project/1/task/download?format=csv&async=true")
+    assert response.status_code == 202
+    job = wait_for(response.get_json()["id"])
+    assert job["status"] == "finished"
+    path = job["result"]["path"]
+    assert os.path.exists(path)
+
+    response = client.get(f"/api/jobs/{job['id']}/result")
+    assert response.status_code == 200
+    response.close()
+
+    max_jobs = jobs.backend.max_jobs
+    jobs.backend.max_jobs = 1
+    try:
+        # the next job pushes the export out of the table
+        response = client.get("/api/project/2/task/download?format=csv&async=true")
+        wait_for(response.get_json()["id"])
+    finally:
+        jobs.backend.max_jobs = max_jobs
+
+    assert jobs.get(job["id"]) is None
+    assert not os.path.exists(path)
@@ -0,0 +1,19 @@
+"""Page and cursor pagination arguments."""
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/api/project/?cursor=&per_page={per_page}",
+        "/api/project/1/task/?cursor=&per_page={per_page}",
+        "/api/user/?cursor=&per_page={per_page}",
+        "/api/user/1/tasks?cursor=&per_page={per_page}",
+    ],
+)
+@pytest.mark.parametrize("per_page", [0, -1])
+def test_cursor_mode_rejects_non_positive_per_page(client, path, per_page):
+    response = client.get(path.format(per_page=per_page))
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "per_page must be positive"}
@@ -0,0 +1,157 @@
+"""
+SQL statements per request must not grow with the number of rows returned -
+a relationship the serializer touches but the query does not eager load shows
+up here as one extra query per row. Likewise the streamed export must not hold
+the whole file in memory.
+"""
+
+import io
+import tracemalloc
+
+import pytest
+
+from benchmarks.seed import seed_dataset
+
+LISTINGS = [
+    "/api/project/?per_page={per_page}",
+    "/api/project/?cursor=&per_page={per_page}",
+    "/api/project/1/task/?per_page={per_page}",
+    "/api/project/1/task/?cursor=&per_page={per_page}",
+    "/api/project/1/task/?per_page={per_page}&fields=id,name,project,users",
+    "/api/user/?per_page={per_page}",
+    "/api/user/?cursor=&per_page={per_page}",
+    "/api/user/1/tasks?per_page={per_page}",
+]
+
+
+def queries_for(client, count_queries, path):
+    with count_queries() as queries:
+        response = client.get(path)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return len(queries)
+
+
+@pytest.mark.parametrize("path", LISTINGS)
+def test_listing_queries_do_not_grow_with_page_size(client, count_queries, path):
+    one = queries_for(client, count_queries, path.format(per_page=1))
+    fifty = queries_for(client, count_queries, path.format(per_page=50))
+    assert one == fifty
+
+
+def test_task_detail_queries_do_not_grow_with_assignees(client, count_queries):
+    for user_id in range(3, 11):
+        client.post(f"/api/project/1/task/1/users/{user_id}")
+
+    few = queries_for(client, count_queries, "/api/project/1/task/2")
+    many = queries_for(client, count_queries, "/api/project/1/task/1")
+    assert few == many
+
+
+def test_project_and_user_detail_queries(client, count_queries):
+    assert queries_for(client, count_queries, "/api/project/1") == queries_for(
+        client, count_queries, "/api/project/2"
+    )
+    assert queries_for(client, count_queries, "/api/user/1") == queries_for(
+        client, count_queries, "/api/user/2"
+    )
+
+
+def test_export_queries_do_not_grow_with_tasks(client, count_queries):
+    # one task against the 60 seeded ones - the serializer must not look up
+    # the project or users per row
+    response = client.post("/api/project/", json={"name": "Single task"})
+    project_id = response.get_json()["project"]["id"]
+    client.post(
+        f"/api/project/{project_id}/task/",
+        json={"name": "Only", "due_date": "2030-01-01T00:00:00", "user_ids": [1, 2]},
+    )
+
+    for export_format in ("csv", "xlsx"):
+        one = queries_for(
+            client,
+            count_queries,
+            f"/api/project/{project_id}/task/download?format={export_format}",
+        )
+        sixty = queries_for(
+            client, count_queries, f"/api/project/1/task/download?format={export_format}"
+        )
+        assert one == sixty
+
+
+def test_csv_export_streams_in_bounded_memory(app, client):
+    seed_dataset(projects=1, tasks_per_project=10000, users=10)
+    app.config["EXPORT_CHUNK_SIZE"] = 100
+    # first request outside the trace, so imports and caches are not counted
+    client.get("/api/project/1/task/download?format=csv").close()
+
+    tracemalloc.start()
+    try:
+        response = client.get(
+            "/api/project/1/task/download?format=csv", buffered=False
+        )
+        size = sum(len(chunk) for chunk in response.response)
+        response.close()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # a buffered export peaks at several times the file size
+    assert size > 1024 * 1024
+    assert peak < size / 2
+
+
+@pytest.mark.parametrize("export_format", ["csv", "xlsx"])
+def test_export_file_name_is_quoted(client, export_format):
+    response = client.put("/api/project/1", json={"name": 'Projet Ω; "beta"'})
+    assert response.status_code == 200
+
+    response = client.get(f"/api/project/1/task/download?format={export_format}")
+    assert response.status_code == 200
+    assert response.headers["Content-Disposition"] == (
+        f'attachment; filename="projet-;-\\"beta\\"-tasks.{export_format}"; '
+        f"filename*=UTF-8''projet-%CF%89%3B-%22beta%22-tasks.{export_format}"
+    )
+
+
+def test_batch_create_queries_do_not_grow_with_tasks(client, count_queries):
+    def batch(size):
+        return {
+            "create": [
+                {"name": f"Batch {index}", "due_date": "2030-01-01T00:00:00"}
+                for index in range(size)
+            ]
+        }
+
+    with count_queries() as one:
+        response = client.post("/api/project/1/task/batch", json=batch(1))
+    assert response.status_code == 200
+    with count_queries() as fifty:
+        response = client.post("/api/project/1/task/batch", json=batch(50))
+    assert response.status_code == 200
+    assert len(response.get_json()["results"]) == 50
+
+    assert len(one) == len(fifty)
+
+
+def upload_csv(client, project_id, rows):
+    sheet = "name,description,status,due_date,users\n" + "".join(
+        f"Imported {row},,In Progress,2030-01-01,user-{row % 5 + 1}\n"
+        for row in range(rows)
+    )
+    return client.post(
+        f"/api/project/{project_id}/task/upload",
+        data={"file": (io.BytesIO(sheet.encode()), "tasks.csv", "text/csv")},
+        content_type="multipart/form-data",
+    )
+
+
+def test_import_queries_do_not_grow_with_rows(client, count_queries):
+    with count_queries() as one:
+        response = upload_csv(client, 1, 1)
+    assert response.status_code == 200
+    with count_queries() as fifty:
+        response = upload_csv(client, 1, 50)
+    assert response.status_code == 200
+    assert response.get_json()["task_upload_summary"]["created_successfully"] == 50
+
+    assert len(one) == len(fifty)
@@ -0,0 +1,41 @@
+"""Writes must make the cached responses they affect stale."""
+
+import io
+
+import pytest
+
+from app.extensions import response_cache
+
+
+@pytest.fixture
+def cached_client(client):
+    response_cache.enabled = True
+    return client
+
+
+def test_import_refreshes_project_stats(cached_client):
+    client = cached_client
+    response = client.post("/api/project/", json={"name": "Imported"})
+    project_id = response.get_json()["project"]["id"]
+
+    client.get(f"/api/project/{project_id}/stats")
+    response = client.get(f"/api/project/{project_id}/stats")
+    assert response.headers["X-Cache"] == "HIT"
+    assert response.get_json()["total"] == 0
+
+    sheet = (
+        "name,description,status,due_date,users\n"
+        "First,,Not Started,2030-01-01,user-1\n"
+        "Second,,Completed,2030-01-02,user-2\n"
+    )
+    response = client.post(
+        f"/api/project/{project_id}/task/upload",
+        data={"file": (io.BytesIO(sheet.encode()), "tasks.csv", "text/csv")},
+        content_type="multipart/form-data",
+    )
+    assert response.status_code == 200, response.get_json()
+    assert response.get_json()["task_upload_summary"]["created_successfully"] == 2
+
+    response = client.get(f"/api/project/{project_id}/stats")
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.get_json()["total"] == 2
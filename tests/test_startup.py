@@ -0,0 +1,72 @@
+"""
+Requests served by a fresh worker, before anything else touched the ORM.
+
+Mapper configuration is process-wide, so every case runs in a new
+interpreter against the seeded test database.
+"""
+
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def first_response(script):
+    result = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(script)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip()
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/api/project/1/task/?cursor=",
+        "/api/project/1/task/1",
+        "/api/user/1/tasks?cursor=",
+    ],
+)
+def test_first_request_is_served(app, path):
+    status = first_response(
+        f"""
+        from app import create_app
+
+        response = create_app().test_client().get({path!r})
+        print(response.status_code)
+        """
+    )
+    assert status == "200"
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/api/project/1/task/",
+        "/api/project/1/task/?cursor=",
+        "/api/project/1/task/1",
+    ],
+)
+def test_first_asgi_request_is_served(app, path):
+    # the async handlers run no query before their loader options are built
+    for module in ("starlette", "a2wsgi", "aiosqlite", "httpx"):
+        pytest.importorskip(module)
+
+    status = first_response(
+        f"""
+        from starlette.testclient import TestClient
+        from app.asgi import create_asgi_app
+
+        with TestClient(create_asgi_app()) as client:
+            print(client.get({path!r}).status_code)
+        """
+    )
+    assert status == "200"